@@ -0,0 +1,306 @@
+"""
+asyncio CalDAV repository.
+
+Speaks the handful of CalDAV requests the sync needs (calendar-query with
+time-range, calendar-multiget, conditional PUT, DELETE) directly over a
+niquests AsyncSession. HTTP/2 is negotiated where the server offers it, so
+concurrent requests share one multiplexed connection, and all calls can be
+awaited alongside other work (OCR, other calendars) in the same process.
+"""
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote, urljoin, urlsplit
+from xml.sax.saxutils import escape
+
+import niquests
+
+from src.caldav_client import (
+    TRANSIENT_STATUSES,
+    PutResult,
+    _CALDAV_NS,
+    _DAV_NS,
+    _MULTIGET_BODY,
+    _PROPFIND_BODY,
+    _parse_multistatus,
+    _retry_after,
+    _time_range,
+)
+from src.caldav_http import timeouts
+from src.interfaces.async_calendar_repository import IAsyncCalendarRepository
+from src.retry_policy import TransientError
+from src.utils.ical_times import filter_events_in_range
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+_CALENDAR_QUERY_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+    '<d:prop><d:getetag/><c:calendar-data/></d:prop>'
+    '<c:filter><c:comp-filter name="VCALENDAR"><c:comp-filter name="VEVENT">{time_range}'
+    '</c:comp-filter></c:comp-filter></c:filter></c:calendar-query>'
+)
+
+
+class AsyncCalDAVClient(IAsyncCalendarRepository):
+    """CalDAV calendar accessed with asyncio; events are returned as href -> ICS text."""
+
+    def __init__(
+        self,
+        calendar_url: str,
+        username: str,
+        password: str,
+        verify_ssl: bool = True,
+        max_connections: int = 4,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        multiget_chunk_size: int = 50,
+        http2: bool = True,
+    ):
+        """
+        Args:
+            calendar_url: URL of the CalDAV calendar collection
+            username: CalDAV username
+            password: CalDAV password
+            verify_ssl: Verify the server's TLS certificate
+            max_connections: Connections kept per host (HTTP/1.1); with HTTP/2 one is usually enough
+            connect_timeout: Seconds to wait for a connection (default 10)
+            read_timeout: Seconds to wait for a response (default 60)
+            multiget_chunk_size: Events requested per calendar-multiget REPORT
+            http2: Offer HTTP/2 during TLS negotiation
+        """
+        self.calendar_url = calendar_url.rstrip("/") + "/"
+        self.multiget_chunk_size = multiget_chunk_size
+        # Event URL -> ETag, as last seen
+        self.etags: Dict[str, str] = {}
+        self._session = niquests.AsyncSession(
+            pool_connections=4,
+            pool_maxsize=max(1, max_connections),
+            disable_http2=not http2,
+            disable_http3=True,
+            auth=(username, password),
+            verify=verify_ssl,
+            timeout=timeouts(connect_timeout, read_timeout),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+
+    async def __aenter__(self) -> "AsyncCalDAVClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self._session.close()
+
+    def _absolute(self, href: str) -> str:
+        return urljoin(self.calendar_url, href)
+
+    async def _request(self, method: str, url: str, body: str = "", headers: Optional[dict] = None):
+        response = await self._session.request(method, url, data=body.encode("utf-8") if body else None,
+                                               headers=headers)
+        metrics.incr("caldav.http_requests")
+        return response
+
+    # --- reads -----------------------------------------------------------
+
+    async def _calendar_query(self, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, str]:
+        try:
+            response = await self._request(
+                "REPORT", self.calendar_url, _CALENDAR_QUERY_BODY.format(time_range=_time_range(start, end)),
+                {"Depth": "1", "Content-Type": "application/xml; charset=utf-8"},
+            )
+        except OSError as e:
+            raise TransientError(f"REPORT {self.calendar_url} failed: {e}") from e
+        if response.status_code in TRANSIENT_STATUSES:
+            raise TransientError(f"REPORT {self.calendar_url} returned HTTP {response.status_code}",
+                                 response.status_code, _retry_after(response.headers))
+        if response.status_code != 207:
+            raise RuntimeError(f"calendar-query returned HTTP {response.status_code}")
+        return self._index(_parse_multistatus(response.text)[0])
+
+    def _index(self, results) -> Dict[str, str]:
+        events = {}
+        for href, status, props in results:
+            ics = props.get(f"{_CALDAV_NS}calendar-data")
+            if status != 200 or not ics:
+                continue
+            url = self._absolute(href)
+            events[url] = ics
+            if props.get(f"{_DAV_NS}getetag"):
+                self.etags[url] = props[f"{_DAV_NS}getetag"]
+        return events
+
+    async def get_events(self) -> Dict[str, str]:
+        """
+        Fetch all events with one calendar-query REPORT.
+        Returns:
+            Dictionary mapping event URLs to ICS text.
+        """
+        return await self._calendar_query(None, None)
+
+    async def get_events_in_range(self, start: Optional[datetime], end: Optional[datetime] = None) -> Dict[str, str]:
+        """
+        Fetch only the events overlapping [start, end) with a time-range calendar-query.
+
+        Falls back to listing everything and filtering client-side if the
+        server rejects the time-range filter.
+        Args:
+            start: Range start (timezone-aware), or None for unbounded
+            end: Range end (timezone-aware), or None for "everything after start"
+        Returns:
+            Dictionary mapping event URLs to ICS text.
+        Raises:
+            TransientError if the server was unreachable, busy or throttling (worth retrying)
+        """
+        try:
+            return await self._calendar_query(start, end)
+        except (TransientError, OSError):
+            # The server is busy or unreachable, not refusing the filter
+            raise
+        except Exception as e:
+            logger.warning(f"Server rejected the time-range query ({e}); filtering events client-side.")
+            return filter_events_in_range(await self.get_events(), start, end)
+
+    async def get_events_by_href(
+        self, hrefs: Iterable[str], chunk_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Fetch known events with concurrent calendar-multiget REPORTs, yielding each chunk as it completes.
+        Args:
+            hrefs: Event hrefs (paths or full URLs)
+            chunk_size: Hrefs per REPORT (default: the client's multiget_chunk_size)
+        Yields:
+            (href as given, ICS text) for every event that still exists
+        """
+        hrefs = list(dict.fromkeys(hrefs))
+        chunk_size = max(1, chunk_size or self.multiget_chunk_size)
+        chunks = [hrefs[i:i + chunk_size] for i in range(0, len(hrefs), chunk_size)]
+        for finished in asyncio.as_completed([self._multiget(chunk) for chunk in chunks]):
+            for item in await finished:
+                yield item
+
+    async def _multiget(self, hrefs: List[str]) -> List[Tuple[str, str]]:
+        by_path = {unquote(urlsplit(self._absolute(href)).path): href for href in hrefs}
+        body = _MULTIGET_BODY.format(hrefs="".join(f"<d:href>{escape(quote(path))}</d:href>" for path in by_path))
+        response = await self._request(
+            "REPORT", self.calendar_url, body, {"Depth": "1", "Content-Type": "application/xml; charset=utf-8"}
+        )
+        if response.status_code != 207:
+            # No multiget support: fetch this chunk one event at a time
+            logger.info(f"calendar-multiget returned HTTP {response.status_code}; fetching events one by one.")
+            fetched = await asyncio.gather(*(self._get(href) for href in hrefs))
+            return [item for item in fetched if item is not None]
+        metrics.incr("caldav.multiget_requests")
+        found = []
+        for href, status, props in _parse_multistatus(response.text)[0]:
+            original = by_path.get(unquote(urlsplit(self._absolute(href)).path))
+            ics = props.get(f"{_CALDAV_NS}calendar-data")
+            if original is None or status != 200 or not ics:
+                continue
+            if props.get(f"{_DAV_NS}getetag"):
+                self.etags[self._absolute(original)] = props[f"{_DAV_NS}getetag"]
+            found.append((original, ics))
+        return found
+
+    async def _get(self, href: str) -> Optional[Tuple[str, str]]:
+        response = await self._request("GET", self._absolute(href))
+        if response.status_code != 200:
+            return None
+        if response.headers.get("ETag"):
+            self.etags[self._absolute(href)] = response.headers["ETag"]
+        return href, response.text
+
+    # --- writes ----------------------------------------------------------
+
+    def event_url(self, uid: str) -> str:
+        """Return the resource URL an event with this UID is stored at (<calendar_url>/<uid>.ics)."""
+        return urljoin(self.calendar_url, quote(uid, safe="") + ".ics")
+
+    async def put_event(self, uid: str, ical_data: str, etag: Optional[str] = None) -> PutResult:
+        """
+        Create or update <calendar_url>/<uid>.ics with a conditional PUT.
+
+        Same semantics as CalDAVClient.put_event(): If-None-Match: * for
+        creates, If-Match for updates, and a create that finds the resource
+        already there is retried as an update with its current ETag.
+        Args:
+            uid: Unique identifier for the event (used as filename)
+            ical_data: iCalendar string
+            etag: ETag of the existing event to replace (default: the last one seen)
+        Returns:
+            PutResult (truthy on success) carrying the new ETag
+        Raises:
+            TransientError if the server was unreachable, busy or throttling (worth retrying)
+        """
+        url = self.event_url(uid)
+        if etag is None:
+            etag = self.etags.get(url)
+        result = await self._conditional_put(url, ical_data, etag)
+        if result.status == 412 and etag is None:
+            current = await self._current_etag(url)
+            if current:
+                logger.info(f"Event {url} already exists; updating it.")
+                result = await self._conditional_put(url, ical_data, current)
+        if result and result.etag:
+            self.etags[url] = result.etag
+        elif result.status == 412:
+            logger.warning(f"Event {url} changed on the server since it was listed; not overwriting it.")
+        return result
+
+    async def _conditional_put(self, url: str, ical_data: str, etag: Optional[str]) -> PutResult:
+        headers = {"Content-Type": "text/calendar; charset=utf-8"}
+        if etag:
+            headers["If-Match"] = etag
+        else:
+            headers["If-None-Match"] = "*"
+        try:
+            response = await self._request("PUT", url, ical_data, headers)
+        except OSError as e:
+            raise TransientError(f"PUT {url} failed: {e}") from e
+        if response.status_code in (200, 201, 204):
+            return PutResult(True, url, response.headers.get("ETag"), response.status_code, created=not etag)
+        if response.status_code in TRANSIENT_STATUSES:
+            raise TransientError(f"PUT {url} returned HTTP {response.status_code}", response.status_code,
+                                 _retry_after(response.headers))
+        if response.status_code != 412:
+            logger.error(f"PUT {url} returned HTTP {response.status_code}")
+        return PutResult(False, url, status=response.status_code)
+
+    async def _current_etag(self, url: str) -> Optional[str]:
+        response = await self._request("PROPFIND", url, _PROPFIND_BODY.format(props="<d:getetag/>"), {"Depth": "0"})
+        if response.status_code != 207:
+            return None
+        for _, status, props in _parse_multistatus(response.text)[0]:
+            if status == 200 and props.get(f"{_DAV_NS}getetag"):
+                return props[f"{_DAV_NS}getetag"]
+        return None
+
+    async def delete_event(self, event_url: str, etag: Optional[str] = None) -> bool:
+        """
+        Delete an event by its href; an event that is already gone counts as deleted.
+        Args:
+            event_url: Event URL or path
+            etag: Only delete if the event still has this ETag (If-Match)
+        Returns:
+            True if deletion succeeded, False otherwise
+        Raises:
+            TransientError if the server was unreachable, busy or throttling (worth retrying)
+        """
+        url = self._absolute(str(event_url))
+        headers = {"If-Match": etag} if etag else {}
+        try:
+            response = await self._request("DELETE", url, headers=headers)
+        except OSError as e:
+            raise TransientError(f"DELETE {url} failed: {e}") from e
+        if response.status_code in TRANSIENT_STATUSES:
+            raise TransientError(f"DELETE {url} returned HTTP {response.status_code}", response.status_code,
+                                 _retry_after(response.headers))
+        if response.status_code in (200, 202, 204, 404):
+            self.etags.pop(url, None)
+            return True
+        if response.status_code == 412:
+            logger.warning(f"Event {url} changed on the server since it was listed; not deleting it.")
+        else:
+            logger.error(f"DELETE {url} returned HTTP {response.status_code}")
+        return False
@@ -1,87 +1,774 @@
 
 
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote, urljoin, urlsplit
+from xml.sax.saxutils import escape
+import xml.etree.ElementTree as ET
+
 from src.ocr_processor import ParsedEvent
+from src.caldav_http import shared_session, timeouts
+from src.event_identity import deterministic_uid
 from src.interfaces.calendar_repository import ICalendarRepository
+from src.calendar_mirror import CalendarMirror
+from src.remote_calendar_state import open_calendar_state
+from src.retry_policy import RetryPolicy, TransientError
+from src.utils.ical_times import filter_events_in_range, get_event_fields
+from src.utils.ics_scanner import ScannedEvent
+from src.utils.logger import logger
+from src.utils.metrics import metrics
 import caldav
 from caldav import DAVClient
+from caldav.elements import dav
+from caldav.lib.error import AuthorizationError, RateLimitError
+
+_DAV_NS = "{DAV:}"
+_CALSERVER_NS = "{http://calendarserver.org/ns/}"
+_CALDAV_NS = "{urn:ietf:params:xml:ns:caldav}"
+
+_SYNC_COLLECTION_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<d:sync-collection xmlns:d="DAV:"><d:sync-token>{token}</d:sync-token>'
+    '<d:sync-level>1</d:sync-level><d:prop><d:getetag/></d:prop></d:sync-collection>'
+)
+_MULTIGET_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<c:calendar-multiget xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+    '<d:prop><d:getetag/><c:calendar-data/></d:prop>{hrefs}</c:calendar-multiget>'
+)
+# calendar-query asking only for the VEVENT properties the sync reads (RFC 4791
+# partial calendar-data), plus the time zones they refer to
+_LISTING_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+    '<d:prop><d:getetag/><c:calendar-data><c:comp name="VCALENDAR">'
+    '<c:comp name="VTIMEZONE"><c:allprop/><c:allcomp/></c:comp>'
+    '<c:comp name="VEVENT">'
+    '<c:prop name="UID"/><c:prop name="SUMMARY"/><c:prop name="LOCATION"/><c:prop name="DESCRIPTION"/>'
+    '<c:prop name="DTSTART"/><c:prop name="DTEND"/><c:prop name="DURATION"/>'
+    '</c:comp></c:comp></c:calendar-data></d:prop>'
+    '<c:filter><c:comp-filter name="VCALENDAR"><c:comp-filter name="VEVENT">{time_range}'
+    '</c:comp-filter></c:comp-filter></c:filter></c:calendar-query>'
+)
+_PROPFIND_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<d:propfind xmlns:d="DAV:" xmlns:cs="http://calendarserver.org/ns/"><d:prop>{props}</d:prop></d:propfind>'
+)
+
+
+# Responses that mean "try again later" rather than "this request is wrong"
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+# Every CalDAV request the sync sends is safe to repeat: listings are reads,
+# PUTs are conditional and a DELETE of a missing event counts as done.
+CALDAV_READ_POLICY = RetryPolicy(
+    "caldav_read", max_attempts=4, base_delay=1.0, max_delay=20.0, budget_seconds=60.0,
+    retry_on=(TransientError, RateLimitError, OSError),
+)
+CALDAV_WRITE_POLICY = RetryPolicy(
+    "caldav_write", max_attempts=3, base_delay=0.5, max_delay=10.0, budget_seconds=30.0,
+)
+
+
+class InvalidSyncToken(Exception):
+    """The server no longer accepts our sync token (RFC 6578 valid-sync-token)."""
+
+
+class SyncCollectionUnsupported(Exception):
+    """The server rejected the sync-collection REPORT as unsupported (RFC 3253 supported-report)."""
+
+
+def _caldav_time(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _time_range(start: Optional[datetime], end: Optional[datetime]) -> str:
+    """<c:time-range> filter element for [start, end), or "" if both are unbounded."""
+    if start is None and end is None:
+        return ""
+    attributes = "".join(
+        f' {name}="{_caldav_time(value)}"' for name, value in (("start", start), ("end", end)) if value
+    )
+    return f"<c:time-range{attributes}/>"
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds from a Retry-After header given in seconds (HTTP dates are ignored)."""
+    value = (headers or {}).get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _transient_error(method: str, href: str, error: Exception) -> TransientError:
+    """Wrap a throttling or connection error raised while sending a request."""
+    if isinstance(error, RateLimitError):
+        return TransientError(
+            f"{method} {href} was rate limited: {error.reason}", status=429, retry_after=error.retry_after_seconds
+        )
+    return TransientError(f"{method} {href} failed: {error}")
+
+
+@dataclass
+class PutResult:
+    """
+    Outcome of CalDAVClient.put_event(); truthy if the event was stored.
+    Attributes:
+        success: Whether the server stored the event.
+        href: URL the event was written to.
+        etag: New ETag reported by the server (None if it sent none).
+        status: HTTP status of the final PUT (None if no response).
+        created: True if the PUT created a new resource rather than replacing one.
+    """
+    success: bool
+    href: str
+    etag: Optional[str] = None
+    status: Optional[int] = None
+    created: bool = False
+
+    def __bool__(self) -> bool:
+        return self.success
+
+
+class EventRecord:
+    """
+    Compact listing entry for one event, as yielded by CalDAVClient.iter_events().
+
+    Holds the href, the ETag and the fields the sync reads; the ICS body is
+    not kept. Reading `data` downloads the body (e.g. for a backup) and
+    keeps it from then on.
+    Attributes:
+        url: Event URL.
+        etag: ETag at listing time (None if the server sent none).
+        fields: UID, summary, location, description and UTC start/end, or
+            None if the listing could not be read (the body is then parsed
+            on demand).
+    """
+    __slots__ = ("url", "etag", "fields", "_data", "_loader")
+
+    def __init__(self, url: str, etag: Optional[str], fields: Optional[ScannedEvent], loader: Callable[[str], str]):
+        self.url = url
+        self.etag = etag
+        self.fields = fields
+        self._data: Optional[str] = None
+        self._loader = loader
+
+    @property
+    def data(self) -> str:
+        """The full ICS body, downloaded on first access."""
+        if self._data is None:
+            self._data = self._loader(self.url)
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"EventRecord({self.url!r}, etag={self.etag!r})"
+
+
+def _parse_response(response) -> Tuple[str, int, dict]:
+    """(href, status, {property tag: text}) of one multistatus <response> element."""
+    href = (response.findtext(f"{_DAV_NS}href") or "").strip()
+    status_text = response.findtext(f"{_DAV_NS}status")
+    props = {}
+    status = 200
+    if status_text:
+        status = int(status_text.split()[1])
+    for propstat in response.findall(f"{_DAV_NS}propstat"):
+        propstat_status = propstat.findtext(f"{_DAV_NS}status") or "HTTP/1.1 200 OK"
+        if int(propstat_status.split()[1]) != 200:
+            continue
+        prop_element = propstat.find(f"{_DAV_NS}prop")
+        if prop_element is None:
+            continue
+        for prop in prop_element:
+            props[prop.tag] = (prop.text or "").strip()
+    return href, status, props
+
+
+def _parse_multistatus(raw: str) -> Tuple[List[Tuple[str, int, dict]], Optional[str]]:
+    """
+    Parse a WebDAV multistatus body.
+    Args:
+        raw: Response body
+    Returns:
+        ([(href, status, {property tag: text}), ...], top-level sync-token or None)
+    """
+    root = ET.fromstring(raw.encode("utf-8") if isinstance(raw, str) else raw)
+    results = [_parse_response(response) for response in root.findall(f"{_DAV_NS}response")]
+    return results, root.findtext(f"{_DAV_NS}sync-token")
+
+
+def _iter_multistatus(chunks: Iterable[bytes]) -> Iterator[Tuple[str, int, dict]]:
+    """
+    Parse a WebDAV multistatus body incrementally.
+
+    Each <response> is yielded as soon as its closing tag has been read and
+    is then dropped from the tree, so memory stays at one response however
+    long the body is.
+    Args:
+        chunks: The body, in pieces as they arrive
+    Yields:
+        (href, status, {property tag: text}) per response
+    Raises:
+        xml.etree.ElementTree.ParseError if the body is malformed or truncated
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if root is None:
+                root = element
+            elif event == "end" and element.tag == f"{_DAV_NS}response":
+                yield _parse_response(element)
+                root.clear()
+    parser.close()
 
 
 class CalDAVClient(ICalendarRepository):
 
-    def __init__(self, calendar_url: str, username: str, password: str, verify_ssl: bool = True):
+    def __init__(
+        self,
+        calendar_url: str,
+        username: str,
+        password: str,
+        verify_ssl: bool = True,
+        verify_etags: bool = False,
+        sync_state_filepath: Optional[str] = None,
+        pool_size: int = 4,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        multiget_chunk_size: int = 50,
+    ):
+        """
+        Args:
+            calendar_url: URL of the CalDAV calendar collection
+            username: CalDAV username
+            password: CalDAV password
+            verify_ssl: Verify the server's TLS certificate
+            verify_etags: Send If-Match with the ETag seen by get_events() when deleting,
+                so events changed on the server since they were listed are not deleted
+            sync_state_filepath: If set, keep a local copy of the calendar in this file and
+                only download events that changed since the last run (see refresh_sync_state());
+                a .sqlite/.db path keeps it in an indexed SQLite mirror, anything else in JSON
+            pool_size: Keep-alive connections to the server; match the write concurrency
+            connect_timeout: Seconds to wait for a connection (default 10)
+            read_timeout: Seconds to wait for a response (default 60)
+            multiget_chunk_size: Events requested per calendar-multiget REPORT
+        """
         self.calendar_url = calendar_url
         self.username = username
         self.password = password
         self.verify_ssl = verify_ssl
+        self.verify_etags = verify_etags
+        # Event href -> ETag, as last seen by get_events()
+        self.etags: dict[str, str] = {}
         self.client = DAVClient(
             url=calendar_url,
             username=username,
             password=password,
             ssl_verify_cert=verify_ssl
         )
+        # Share one pooled keep-alive session per server across clients and syncs
+        self.client.session.close()
+        self.client.session = shared_session(calendar_url, pool_size)
+        self.client.timeout = timeouts(connect_timeout, read_timeout)
         # Use the calendar at the specified URL
         self.calendar = caldav.Calendar(
             client=self.client,
             url=calendar_url
         )
+        self.sync_state = open_calendar_state(sync_state_filepath, calendar_url) if sync_state_filepath else None
+        self._sync_collection_supported = True
+        self.multiget_chunk_size = multiget_chunk_size
+        self._multiget_supported: Optional[bool] = None
+
+    def get_events(self) -> dict[str, EventRecord]:
+        """
+        List all events in the configured calendar.
+        Returns:
+            Dictionary mapping event URLs to EventRecord objects (see iter_events()).
+        """
+        return {record.url: record for record in self.iter_events()}
+
+    def iter_events(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[EventRecord]:
+        """
+        Stream the events overlapping [start, end) as compact records.
+
+        Sends one calendar-query REPORT asking only for the properties the
+        sync reads (RFC 4791 partial calendar-data) and parses the response
+        as it arrives, so neither the response nor the event bodies are held
+        in memory. Bodies are downloaded only when a record's `data` is read.
+        Args:
+            start: Range start (timezone-aware), or None for unbounded
+            end: Range end (timezone-aware), or None for unbounded
+        Yields:
+            EventRecord per event, in the server's order
+        Raises:
+            TransientError if the server is throttling or failing; RuntimeError
+            if it rejects the query
+        """
+        body = _LISTING_BODY.format(time_range=_time_range(start, end))
+        for href, status, props in self._stream_report(body):
+            ics = props.get(f"{_CALDAV_NS}calendar-data")
+            if status != 200 or not ics or self._is_collection(href):
+                continue
+            url = self._absolute(href)
+            etag = props.get(f"{_DAV_NS}getetag") or None
+            try:
+                fields = get_event_fields(ics)
+            except Exception as e:
+                logger.debug(f"Could not read listed event {url}: {e}")
+                fields = None
+            if etag:
+                self.etags[url] = etag
+            metrics.incr("caldav.events_listed")
+            yield EventRecord(url, etag, fields, self._load_event_data)
+
+    def _stream_report(self, body: str) -> Iterator[Tuple[str, int, dict]]:
+        """Send a Depth 1 REPORT to the calendar and parse the multistatus answer while it downloads."""
+        headers = {**self.client.headers, "Depth": "1", "Content-Type": "application/xml; charset=utf-8"}
+        session = self.client.session
+        response = session.request(
+            "REPORT", self.calendar_url, data=body.encode("utf-8"), headers=headers, auth=self.client.auth,
+            timeout=self.client.timeout, verify=self.client.ssl_verify_cert, cert=self.client.ssl_cert,
+            stream=True,
+        )
+        try:
+            if response.status_code == 401:
+                # Let the caldav library negotiate the auth scheme, then read the buffered answer
+                response.close()
+                buffered = self.client.request(self.calendar_url, "REPORT", body, headers)
+                if buffered.status != 207:
+                    raise RuntimeError(f"calendar-query returned HTTP {buffered.status}")
+                raw = buffered.raw
+                yield from _iter_multistatus([raw.encode("utf-8") if isinstance(raw, str) else raw])
+                return
+            if response.status_code in TRANSIENT_STATUSES:
+                raise TransientError(f"REPORT {self.calendar_url} returned HTTP {response.status_code}",
+                                     status=response.status_code, retry_after=_retry_after(response.headers))
+            if response.status_code != 207:
+                raise RuntimeError(f"calendar-query returned HTTP {response.status_code}")
+            counted = not (response.headers.get("Content-Length") or "").isdigit()
+            yield from _iter_multistatus(self._read_chunks(response, counted))
+        finally:
+            response.close()
+
+    def _read_chunks(self, response, count_bytes: bool) -> Iterator[bytes]:
+        """
+        Yield the decoded body of a streamed response.
+
+        With count_bytes, the bytes read off the wire (before gzip decoding, as
+        the raw stream reports them) are added to the session's counters.
+        """
+        count_received = getattr(self.client.session, "count_received", None) if count_bytes else None
+        tell = getattr(getattr(response, "raw", None), "tell", None)
+        wire = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if count_received is not None:
+                read = tell() if tell is not None else wire + len(chunk)
+                count_received(read - wire)
+                wire = read
+            yield chunk
+        if count_received is not None and tell is not None:
+            count_received(tell() - wire)
+
+    def _load_event_data(self, url: str) -> str:
+        """Download one event's ICS body (for EventRecord.data)."""
+        response = self.client.request(url, "GET")
+        if response.status != 200:
+            raise RuntimeError(f"GET {url} returned HTTP {response.status}")
+        metrics.incr("caldav.bodies_loaded_lazily")
+        return response.raw
+
+    def get_events_in_range(self, start: Optional[datetime], end: Optional[datetime] = None) -> dict:
+        """
+        Fetch only the events overlapping [start, end) with a calendar-query time-range REPORT.
+
+        Falls back to listing everything and filtering client-side if the
+        server rejects the time-range query. With a sync state file
+        configured, the local copy is refreshed incrementally instead and
+        filtered client-side.
+        Args:
+            start: Range start (timezone-aware), or None for unbounded
+            end: Range end (timezone-aware), or None for "everything after start"
+        Returns:
+            Dictionary mapping event URLs to event objects: EventRecord from
+            the server, MirroredEvent or caldav.Event from the local copy.
+        """
+        if self.sync_state is not None:
+            self.refresh_sync_state()
+            if isinstance(self.sync_state, CalendarMirror):
+                # Indexed query on pre-parsed times; no ICS body is parsed
+                events = self.sync_state.events_in_range(start, end)
+                self.etags.update({href: event.etag for href, event in events.items() if event.etag})
+                return events
+            return filter_events_in_range(self._events_from_sync_state(), start, end)
+        try:
+            return {record.url: record for record in self.iter_events(start, end)}
+        except (TransientError, RateLimitError, OSError):
+            # The server is busy or unreachable, not refusing the filter
+            raise
+        except Exception as e:
+            logger.warning(f"Server rejected the time-range query ({e}); filtering events client-side.")
+            return filter_events_in_range(self.get_events(), start, end)
+
+    def refresh_sync_state(self) -> str:
+        """
+        Bring the local copy of the calendar up to date, downloading only changed events.
+
+        First compares the collection ctag: if it is unchanged nothing is
+        listed or downloaded. Otherwise uses an RFC 6578 sync-collection
+        REPORT with the stored sync token or, if the server does not support
+        it, the per-event ETags from a Depth 1 PROPFIND.
+        Returns:
+            The method used: "ctag" (nothing changed), "sync-token" or "etag"
+        """
+        state = self.sync_state
+        ctag = self._get_ctag()
+        if ctag is not None and ctag == state.ctag and len(state):
+            logger.info("Calendar ctag unchanged; reusing the local copy.")
+            metrics.incr("caldav.bodies_reused", len(state))
+            return "ctag"
+        listing, deleted, mode = None, set(), "sync-token"
+        if self._sync_collection_supported:
+            # Transient errors propagate to the caller's retry policy
+            try:
+                try:
+                    listing, deleted, complete = self._sync_collection(state.sync_token)
+                except InvalidSyncToken:
+                    logger.info("CalDAV sync token expired; doing a full sync-collection.")
+                    state.sync_token = None
+                    listing, deleted, complete = self._sync_collection(None)
+            except SyncCollectionUnsupported as e:
+                logger.info(f"sync-collection not supported ({e}); comparing ctag/ETags instead.")
+                self._sync_collection_supported = False
+            except RuntimeError as e:
+                logger.warning(f"sync-collection failed ({e}); comparing ETags for this run.")
+        if listing is None:
+            complete = True
+            listing, mode = self._list_etags(), "etag"
+        state.ctag = ctag
+        if complete:
+            deleted |= state.hrefs() - set(listing)
+
+        to_fetch = [href for href, etag in listing.items() if etag is None or state.etag(href) != etag]
+        fetched = self._fetch_bodies(to_fetch)
+        state.apply(fetched, deleted)
+        state.save()
+        metrics.incr("caldav.bodies_fetched", len(fetched))
+        reused = len(state) - len(fetched)
+        metrics.incr("caldav.bodies_reused", reused)
+        logger.info(
+            f"Refreshed local calendar copy via {mode}: {len(fetched)} downloaded, "
+            f"{len(deleted)} removed, {reused} reused."
+        )
+        return mode
 
-    def get_events(self) -> dict[str, caldav.Event]:
+    def _absolute(self, href: str) -> str:
+        return urljoin(self.calendar_url, href)
+
+    def _is_collection(self, href: str) -> bool:
+        return self._absolute(href).rstrip("/") == self.calendar_url.rstrip("/")
+
+    def _sync_collection(self, token: Optional[str]) -> Tuple[Dict[str, Optional[str]], set, bool]:
         """
-        Fetch all events from the configured calendar using the caldav library.
+        Run a sync-collection REPORT.
         Returns:
-            Dictionary mapping event hrefs to caldav.Event objects.
+            (changed href -> ETag, deleted hrefs, True if the listing is complete)
+        Raises:
+            InvalidSyncToken if the server rejects the token;
+            SyncCollectionUnsupported if the server does not support the report;
+            TransientError if the server was unreachable, busy or throttling;
+            RuntimeError for any other failure
+        """
+        body = _SYNC_COLLECTION_BODY.format(token=token or "")
+        try:
+            response = self.client.request(self.calendar_url, "REPORT", body, {"Depth": "0", "Content-Type": "application/xml"})
+        except AuthorizationError as e:
+            # The caldav library raises on 403, which is how most servers reject a stale token
+            if token:
+                raise InvalidSyncToken(token)
+            raise SyncCollectionUnsupported("HTTP 403") from e
+        except (RateLimitError, OSError) as e:
+            raise _transient_error("REPORT", self.calendar_url, e) from e
+        if response.status != 207:
+            raw = response.raw or ""
+            if token and response.status in (403, 409) and "valid-sync-token" in raw:
+                raise InvalidSyncToken(token)
+            if response.status in TRANSIENT_STATUSES:
+                raise TransientError(f"sync-collection returned HTTP {response.status}", response.status,
+                                     _retry_after(response.headers))
+            if response.status in (403, 405, 501) or "supported-report" in raw:
+                raise SyncCollectionUnsupported(f"HTTP {response.status}")
+            raise RuntimeError(f"sync-collection returned HTTP {response.status}")
+        results, new_token = _parse_multistatus(response.raw)
+        changed, deleted = {}, set()
+        for href, status, props in results:
+            if self._is_collection(href):
+                continue
+            if status == 404:
+                deleted.add(self._absolute(href))
+            else:
+                changed[self._absolute(href)] = props.get(f"{_DAV_NS}getetag")
+        self.sync_state.sync_token = new_token
+        return changed, deleted, not token
+
+    def _get_ctag(self) -> Optional[str]:
+        """Return the collection's getctag, or None if the server does not report one."""
+        body = _PROPFIND_BODY.format(props="<cs:getctag/>")
+        response = self.client.request(self.calendar_url, "PROPFIND", body, {"Depth": "0", "Content-Type": "application/xml"})
+        if response.status != 207:
+            return None
+        results, _ = _parse_multistatus(response.raw)
+        for _, _, props in results:
+            if props.get(f"{_CALSERVER_NS}getctag"):
+                return props[f"{_CALSERVER_NS}getctag"]
+        return None
+
+    def _list_etags(self) -> Dict[str, Optional[str]]:
+        """List every event href with its ETag using a Depth 1 PROPFIND."""
+        body = _PROPFIND_BODY.format(props="<d:getetag/>")
+        response = self.client.request(self.calendar_url, "PROPFIND", body, {"Depth": "1", "Content-Type": "application/xml"})
+        if response.status != 207:
+            raise RuntimeError(f"PROPFIND returned HTTP {response.status}")
+        results, _ = _parse_multistatus(response.raw)
+        return {
+            self._absolute(href): props.get(f"{_DAV_NS}getetag")
+            for href, status, props in results
+            if status == 200 and not self._is_collection(href)
+        }
+
+    def _fetch_bodies(self, hrefs: Iterable[str]) -> Dict[str, tuple]:
+        """Download event bodies. Returns href -> (ics, etag); events gone in the meantime are skipped."""
+        return {href: (ics, etag) for href, ics, etag in self._iter_bodies(hrefs)}
+
+    def get_events_by_href(self, hrefs: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[caldav.Event]:
+        """
+        Fetch events whose hrefs are already known, yielding them as each batch arrives.
+
+        Uses calendar-multiget REPORTs of `chunk_size` hrefs each, or one GET
+        per event if the server does not advertise calendar-access (or
+        rejects the REPORT). Events that no longer exist are skipped.
+        Args:
+            hrefs: Event hrefs (paths or full URLs)
+            chunk_size: Hrefs per REPORT (default: the client's multiget_chunk_size)
+        Yields:
+            caldav.Event objects with their data and ETag
         """
+        for href, ics, etag in self._iter_bodies(hrefs, chunk_size):
+            if etag:
+                self.etags[self._absolute(href)] = etag
+            yield caldav.Event(
+                client=self.client, url=self._absolute(href), data=ics, parent=self.calendar,
+                props={dav.GetEtag.tag: etag},
+            )
+
+    def _iter_bodies(self, hrefs: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Yield (href as given, ics, etag) for each event that still exists."""
+        hrefs = list(dict.fromkeys(hrefs))
+        if not hrefs:
+            return
+        chunk_size = max(1, chunk_size or self.multiget_chunk_size)
+        for start in range(0, len(hrefs), chunk_size):
+            chunk = hrefs[start:start + chunk_size]
+            if self._supports_multiget():
+                try:
+                    yield from self._multiget(chunk)
+                    continue
+                except Exception as e:
+                    logger.info(f"calendar-multiget failed ({e}); fetching events one by one.")
+                    self._multiget_supported = False
+            for href in chunk:
+                response = self.client.request(self._absolute(href), "GET")
+                if response.status == 200:
+                    yield href, response.raw, response.headers.get("ETag")
+
+    def _supports_multiget(self) -> bool:
+        """Whether the server advertises calendar-access (which includes calendar-multiget) in OPTIONS."""
+        if self._multiget_supported is None:
+            try:
+                response = self.client.request(self.calendar_url, "OPTIONS")
+                self._multiget_supported = "calendar-access" in (response.headers.get("DAV") or "")
+            except Exception as e:
+                logger.debug(f"OPTIONS {self.calendar_url} failed: {e}")
+                self._multiget_supported = False
+        return self._multiget_supported
+
+    def _multiget(self, hrefs: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+        """Run one calendar-multiget REPORT; returns (href as given, ics, etag) for found events."""
+        by_path = {unquote(urlsplit(self._absolute(href)).path): href for href in hrefs}
+        body = _MULTIGET_BODY.format(hrefs="".join(f"<d:href>{escape(quote(path))}</d:href>" for path in by_path))
+        response = self.client.request(self.calendar_url, "REPORT", body, {"Depth": "1"})
+        if response.status != 207:
+            raise RuntimeError(f"REPORT returned HTTP {response.status}")
+        results, _ = _parse_multistatus(response.raw)
+        found = []
+        for href, status, props in results:
+            original = by_path.get(unquote(urlsplit(self._absolute(href)).path))
+            ics = props.get(_CALDAV_NS + "calendar-data")
+            if original is None or status != 200 or not ics:
+                continue
+            found.append((original, ics, props.get(f"{_DAV_NS}getetag")))
+        metrics.incr("caldav.multiget_requests")
+        return found
+
+    def _events_from_sync_state(self) -> dict[str, caldav.Event]:
+        """Build caldav.Event objects from the local copy."""
         events = {}
-        for event in self.calendar.events():
-            href = event.url
-            events[href] = event
+        for href, entry in self.sync_state.events.items():
+            events[href] = caldav.Event(
+                client=self.client, url=href, data=entry["ics"], parent=self.calendar,
+                props={dav.GetEtag.tag: entry["etag"]},
+            )
+            if entry["etag"]:
+                self.etags[href] = entry["etag"]
         return events
 
-    def delete_event(self, event_url: str) -> bool:
+    def delete_event(self, event_url: str, etag: Optional[str] = None) -> bool:
         """
         Delete an event from the configured calendar by its full URL.
+
+        Sends a single DELETE to the href (as returned by get_events()), so
+        the calendar is not listed again for every delete. An event that is
+        already gone counts as deleted.
         Args:
             event_url: Full URL to the event resource
+            etag: Only delete if the event still has this ETag (If-Match); with
+                verify_etags set, defaults to the ETag seen by get_events()
         Returns:
             True if deletion succeeded, False otherwise
+        Raises:
+            TransientError if the server was unreachable, busy or throttling (worth retrying)
         """
+        href = str(event_url)
+        if etag is None and self.verify_etags:
+            etag = self.etags.get(href)
+        headers = {"If-Match": etag} if etag else {}
         try:
-            for event in self.calendar.events():
-                if event.url == event_url:
-                    event.delete()
-                    return True
-            return False
-        except Exception:
+            response = self.client.request(href, "DELETE", "", headers)
+        except (RateLimitError, OSError) as e:
+            raise _transient_error("DELETE", href, e) from e
+        except Exception as e:
+            logger.error(f"DELETE {href} failed: {e}")
             return False
+        if response.status in TRANSIENT_STATUSES:
+            raise TransientError(f"DELETE {href} returned HTTP {response.status}", response.status,
+                                 _retry_after(response.headers))
+        if response.status in (200, 202, 204, 404):
+            if response.status == 404:
+                logger.info(f"Event {href} was already deleted.")
+            self.etags.pop(href, None)
+            if self.sync_state is not None:
+                self.sync_state.record_delete(href)
+            return True
+        if response.status == 412:
+            logger.warning(f"Event {href} changed on the server since it was listed; not deleting it.")
+        else:
+            logger.error(f"DELETE {href} returned HTTP {response.status}")
+        return False
+
+    def save_state(self):
+        """Write the local calendar copy (if any), including this run's PUTs and DELETEs."""
+        if self.sync_state is not None:
+            self.sync_state.save()
 
-    def put_event(self, uid: str, ical_data: str) -> bool:
+    def event_url(self, uid: str) -> str:
+        """Return the resource URL an event with this UID is stored at (<calendar_url>/<uid>.ics)."""
+        return urljoin(self.calendar_url.rstrip("/") + "/", quote(uid, safe="") + ".ics")
+
+    def put_event(self, uid: str, ical_data: str, etag: Optional[str] = None) -> PutResult:
         """
-        Upload or update an event to the configured calendar using the caldav library.
+        Upload or update an event with a single conditional PUT to <calendar_url>/<uid>.ics.
+
+        Without a known ETag the PUT is a create (If-None-Match: *). If the
+        resource already exists (e.g. a rerun with the same deterministic
+        UID) its current ETag is fetched and the PUT repeated as an update.
+        With an ETag the PUT is an update (If-Match) that fails instead of
+        overwriting an event changed on the server in the meantime.
         Args:
             uid: Unique identifier for the event (used as filename)
             ical_data: iCalendar string
+            etag: ETag of the existing event to replace; defaults to the one
+                seen by get_events() for this resource, if any
         Returns:
-            True if upload succeeded, False otherwise
+            PutResult (truthy on success) carrying the new ETag
+        Raises:
+            TransientError if the server was unreachable, busy or throttling (worth retrying)
         """
+        href = self.event_url(uid)
+        if etag is None:
+            etag = self.etags.get(href)
+        result = self._conditional_put(href, ical_data, etag)
+        if result.status == 412 and etag is None:
+            current = self._current_etag(href)
+            if current:
+                logger.info(f"Event {href} already exists; updating it.")
+                result = self._conditional_put(href, ical_data, current)
+        if result:
+            if result.etag:
+                self.etags[href] = result.etag
+            else:
+                self.etags.pop(href, None)
+            if self.sync_state is not None:
+                # Without an ETag the server may have altered the event; it is re-downloaded next run
+                self.sync_state.record_put(href, ical_data, result.etag)
+        elif result.status == 412:
+            logger.warning(f"Event {href} changed on the server since it was listed; not overwriting it.")
+        return result
+
+    def _conditional_put(self, href: str, ical_data: str, etag: Optional[str]) -> PutResult:
+        headers = {"Content-Type": "text/calendar; charset=utf-8"}
+        if etag:
+            headers["If-Match"] = etag
+        else:
+            headers["If-None-Match"] = "*"
         try:
-            event = self.calendar.add_event(ical_data)
-            return True
+            response = self.client.request(href, "PUT", ical_data, headers)
+        except (RateLimitError, OSError) as e:
+            # caldav raises instead of returning 429 (and 503 with Retry-After)
+            raise _transient_error("PUT", href, e) from e
         except Exception as e:
-            return False
+            logger.error(f"PUT {href} failed: {e}")
+            return PutResult(False, href)
+        if response.status in (200, 201, 204):
+            return PutResult(True, href, response.headers.get("ETag"), response.status, created=not etag)
+        if response.status in TRANSIENT_STATUSES:
+            raise TransientError(f"PUT {href} returned HTTP {response.status}", response.status,
+                                 _retry_after(response.headers))
+        if response.status != 412:
+            logger.error(f"PUT {href} returned HTTP {response.status}")
+        return PutResult(False, href, status=response.status)
+
+    def _current_etag(self, href: str) -> Optional[str]:
+        """Read a resource's current ETag with a Depth 0 PROPFIND."""
+        body = _PROPFIND_BODY.format(props="<d:getetag/>")
+        try:
+            response = self.client.request(href, "PROPFIND", body, {"Depth": "0"})
+            results, _ = _parse_multistatus(response.raw)
+        except Exception as e:
+            logger.error(f"PROPFIND {href} failed: {e}")
+            return None
+        for _, status, props in results:
+            if status == 200 and props.get(f"{_DAV_NS}getetag"):
+                return props[f"{_DAV_NS}getetag"]
+        return None
+
 
-def map_parsed_event_to_ical(event: ParsedEvent) -> tuple[str, str]:
+def map_parsed_event_to_ical(event: ParsedEvent, uid: Optional[str] = None) -> tuple[str, str]:
     """
     Convert a ParsedEvent object to an iCalendar (VCALENDAR) string and generate a UID.
     Args:
         event: ParsedEvent instance
-        timezone: 'America/New_York' (default) or 'UTC' for test compatibility
+        uid: UID to use, e.g. to update an existing event in place (default: derived from
+            the title and start/end, so reruns address the same resource)
     Returns:
         Tuple of (iCalendar string, UID)
     """
     from datetime import datetime
     from datetime import timezone as dt_timezone
     import pytz
-    import uuid
 
     def to_dt(dt_str, tz):
         dt = datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
@@ -99,7 +786,7 @@ def map_parsed_event_to_ical(event: ParsedEvent) -> tuple[str, str]:
     dtstart = to_dt(event.start_datetime, event_timezone)
     dtend = to_dt(event.end_datetime, event_timezone)
 
-    event_uid = uuid.uuid4().hex[:12]
+    event_uid = uid or deterministic_uid(event)
     now_utc = datetime.now(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     ical_lines = [
         "BEGIN:VCALENDAR",
@@ -0,0 +1,141 @@
+"""
+Shared, tuned HTTP sessions for CalDAV.
+
+Every CalDAVClient for the same server reuses one process-wide session, so
+connections (and TLS sessions) opened by one sync are still warm for the
+next when the tool runs as a long-lived watcher. The session's pool is
+sized to the write concurrency, keeps connections alive, asks for
+gzip/deflate-compressed responses (calendar REPORTs compress very well) and
+counts requests, new vs reused connections and bytes on the wire.
+"""
+import threading
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import niquests
+from niquests.adapters import HTTPAdapter
+
+from src.utils.metrics import metrics
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+_sessions: Dict[str, "CalDAVSession"] = {}
+_sessions_lock = threading.Lock()
+
+
+class CalDAVSession(niquests.Session):
+    """
+    niquests session with a sized connection pool and traffic counters.
+
+    Counters are reported into the run metrics (caldav.http_requests,
+    caldav.connections_opened, caldav.connections_reused, caldav.bytes_sent,
+    caldav.bytes_received) and also accumulated in `stats` for the whole
+    life of the session.
+    """
+
+    def __init__(self, pool_size: int = 4):
+        """
+        Args:
+            pool_size: Connections kept per host; should cover the write concurrency
+        """
+        super().__init__()
+        self.pool_size = 0
+        self.stats: Dict[str, int] = {
+            "http_requests": 0, "connections_opened": 0, "connections_reused": 0,
+            "bytes_sent": 0, "bytes_received": 0,
+        }
+        self._stats_lock = threading.Lock()
+        self.headers["Accept-Encoding"] = "gzip, deflate"
+        self.headers["Connection"] = "keep-alive"
+        self.resize(pool_size)
+
+    def resize(self, pool_size: int):
+        """Grow the connection pool to at least `pool_size` connections per host."""
+        pool_size = max(1, pool_size)
+        if pool_size <= self.pool_size:
+            return
+        previous = {id(a): a for a in (self.adapters.get("https://"), self.adapters.get("http://")) if a is not None}
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.pool_size = pool_size
+        # Release the replaced pools' connections; requests go through the new adapter from now on
+        for old in previous.values():
+            old.close()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self._count(request, response, streamed=bool(kwargs.get("stream")))
+        return response
+
+    def count_received(self, nbytes: int):
+        """Add bytes read from a streamed response that had no Content-Length."""
+        with self._stats_lock:
+            self.stats["bytes_received"] += nbytes
+        metrics.incr("caldav.bytes_received", nbytes)
+
+    def _count(self, request, response, streamed: bool = False):
+        body = request.body or b""
+        sent = len(body.encode("utf-8") if isinstance(body, str) else body)
+        # Content-Length is the size on the wire, i.e. before gzip decoding. A
+        # streamed body without one is counted by its reader (count_received)
+        # rather than buffered here.
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            received = int(length)
+        else:
+            received = 0 if streamed else len(response.content or b"")
+        conn_info = getattr(response, "conn_info", None)
+        established = getattr(conn_info, "established_latency", None)
+        # A connection taken from the pool reports no connect time
+        reused = established is not None and established == timedelta(0)
+        counts = {
+            "http_requests": 1,
+            "connections_reused" if reused else "connections_opened": 1,
+            "bytes_sent": sent,
+            "bytes_received": received,
+        }
+        with self._stats_lock:
+            for name, value in counts.items():
+                self.stats[name] += value
+        for name, value in counts.items():
+            metrics.incr(f"caldav.{name}", value)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def shared_session(url: str, pool_size: int = 4) -> CalDAVSession:
+    """
+    Return the process-wide session for a server, creating or growing it as needed.
+    Args:
+        url: Any URL on the server (the session is shared per scheme/host/port)
+        pool_size: Connections to keep per host
+    Returns:
+        CalDAVSession
+    """
+    origin = _origin(url)
+    with _sessions_lock:
+        session = _sessions.get(origin)
+        if session is None:
+            session = _sessions[origin] = CalDAVSession(pool_size)
+        else:
+            session.resize(pool_size)
+        return session
+
+
+def close_sessions():
+    """Close every shared session (e.g. at process exit)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def timeouts(connect: Optional[float] = None, read: Optional[float] = None) -> Tuple[float, float]:
+    """(connect, read) timeout pair in seconds, with defaults for missing values."""
+    return (connect or DEFAULT_CONNECT_TIMEOUT, read or DEFAULT_READ_TIMEOUT)
@@ -0,0 +1,225 @@
+"""
+Bounded, self-tuning worker pool for CalDAV writes (PUT/DELETE).
+
+Writes are independent of each other, so running a few at once hides most
+of the per-request round trip. How many a server tolerates varies a lot
+(a remote Nextcloud happily takes many, a Raspberry Pi Radicale does not),
+so the number in flight is adjusted with AIMD: it grows by about one per
+round of fast, successful writes and is halved when a write is throttled
+(HTTP 429/503) or takes much longer than the fastest write seen so far.
+It never exceeds the configured ceiling.
+
+A write that retries (see retry_policy) should take a slot per attempt via
+attempt(), so each attempt's throttling reaches the limit at once and the
+backoff between attempts does not hold a slot.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+# Statuses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+class AdaptiveLimit:
+    """Additive-increase/multiplicative-decrease concurrency limit with a blocking acquire."""
+
+    def __init__(
+        self,
+        maximum: int = 4,
+        initial: int = 2,
+        minimum: int = 1,
+        decrease_factor: float = 0.5,
+        latency_factor: float = 3.0,
+        min_latency_threshold: float = 0.5,
+    ):
+        """
+        Args:
+            maximum: Ceiling for the limit
+            initial: Starting limit
+            minimum: Floor for the limit
+            decrease_factor: Multiplier applied on congestion
+            latency_factor: A write slower than this multiple of the fastest write seen counts as congestion
+            min_latency_threshold: Writes faster than this (seconds) never count as congestion
+        """
+        if maximum < 1:
+            raise ValueError(f"Concurrency ceiling must be at least 1, got {maximum}")
+        self.maximum = maximum
+        self.minimum = max(1, min(minimum, maximum))
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.min_latency_threshold = min_latency_threshold
+        self._limit = float(max(self.minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._best_latency: Optional[float] = None
+        # Incremented on every decrease; signals from writes started before it are ignored
+        self._epoch = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of writes allowed in flight."""
+        with self._condition:
+            return self._current()
+
+    def _current(self) -> int:
+        return max(self.minimum, min(self.maximum, int(self._limit)))
+
+    def acquire(self) -> int:
+        """Block until a slot is free; returns the epoch to pass to release()."""
+        with self._condition:
+            while self._in_flight >= self._current():
+                self._condition.wait()
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self, epoch: int, latency: float, throttled: bool = False):
+        """
+        Free a slot and adjust the limit from the write's outcome.
+        Args:
+            epoch: Value returned by acquire()
+            latency: Duration of the write in seconds
+            throttled: Whether the server asked us to slow down
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if not throttled:
+                self._best_latency = latency if self._best_latency is None else min(self._best_latency, latency)
+            threshold = max(self.min_latency_threshold, (self._best_latency or latency) * self.latency_factor)
+            congested = throttled or latency > threshold
+            if congested:
+                # One decrease per round: writes already in flight saw the old limit
+                if epoch == self._epoch:
+                    self._limit = max(float(self.minimum), self._limit * self.decrease_factor)
+                    self._epoch += 1
+                    logger.info(
+                        f"CalDAV write concurrency reduced to {self._current()} "
+                        f"({'throttled' if throttled else f'{latency:.2f}s latency'})"
+                    )
+            elif self._limit < self.maximum:
+                # About +1 per limit's worth of successful writes
+                self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            self._condition.notify_all()
+
+
+@dataclass
+class WriteOutcome:
+    """
+    Result of one pooled write.
+    Attributes:
+        label: Caller-supplied description of the write.
+        result: Return value of the write (None if it raised).
+        error: Exception raised by the write, if any.
+        latency: Duration of the write in seconds.
+    """
+    label: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and bool(self.result)
+
+
+def _is_throttled(result, error) -> bool:
+    status = getattr(result, "status", None)
+    if status is None and error is not None:
+        status = getattr(error, "status", None)
+    return status in THROTTLE_STATUSES
+
+
+class CalDAVWritePool:
+    """
+    Runs CalDAV writes concurrently under an AdaptiveLimit and collects their outcomes.
+
+    Usage:
+        with CalDAVWritePool(max_concurrency=4) as pool:
+            pool.submit("create A", lambda: repo.put_event(uid, ics))
+            outcomes = pool.wait()
+    """
+
+    def __init__(self, max_concurrency: int = 4, initial_concurrency: int = 2, limit: Optional[AdaptiveLimit] = None):
+        """
+        Args:
+            max_concurrency: Ceiling for writes in flight
+            initial_concurrency: Writes in flight before any feedback
+            limit: AdaptiveLimit to use instead of a new one
+        """
+        self.limit = limit or AdaptiveLimit(maximum=max_concurrency, initial=initial_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.limit.maximum, thread_name_prefix="caldav-write")
+        self._futures: List[Future] = []
+
+    def submit(self, label: Any, write: Callable[[], Any], own_slots: bool = False) -> Future:
+        """
+        Queue a write.
+        Args:
+            label: Description returned with the outcome
+            write: Callable performing the write; a falsy return value or an exception is a failure
+            own_slots: If True, `write` runs each request through attempt() itself
+                instead of the whole write holding one slot
+        Returns:
+            Future resolving to a WriteOutcome
+        """
+        future = self._executor.submit(self._run, label, write, own_slots)
+        self._futures.append(future)
+        return future
+
+    def attempt(self, request: Callable[[], Any]) -> Any:
+        """
+        Run one request in a slot and feed its latency and throttling back to the limit.
+        Args:
+            request: Callable sending a single request (a PutResult-like return or an
+                exception carrying `status` is checked for throttling)
+        Returns:
+            Return value of request()
+        Raises:
+            Whatever request() raises
+        """
+        epoch = self.limit.acquire()
+        result, error = None, None
+        started = time.monotonic()
+        try:
+            result = request()
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            latency = time.monotonic() - started
+            throttled = _is_throttled(result, error)
+            self.limit.release(epoch, latency, throttled)
+            metrics.observe("caldav.write_latency", latency)
+            if throttled:
+                metrics.incr("caldav.writes_throttled")
+
+    def _run(self, label, write, own_slots: bool) -> WriteOutcome:
+        outcome = WriteOutcome(label)
+        started = time.monotonic()
+        try:
+            outcome.result = write() if own_slots else self.attempt(write)
+        except Exception as e:
+            outcome.error = e
+        outcome.latency = time.monotonic() - started
+        return outcome
+
+    def wait(self) -> List[WriteOutcome]:
+        """Wait for every write submitted so far and return their outcomes in submission order."""
+        futures, self._futures = self._futures, []
+        outcomes = [future.result() for future in futures]
+        metrics.observe("caldav.write_concurrency", self.limit.limit)
+        return outcomes
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "CalDAVWritePool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
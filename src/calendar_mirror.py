@@ -0,0 +1,207 @@
+"""
+SQLite mirror of the remote CalDAV calendar.
+
+Same role as RemoteCalendarState (sync token, ctag, every event's ETag and
+ICS body) but each event is parsed once, when it is downloaded or written,
+and stored with its UID, UTC start/end (indexed), summary, location,
+description and a content hash. Selecting the future events is then an
+indexed query and the reconciler reads the parsed columns instead of
+running every body through icalendar again on each run.
+
+Writes made by this tool are recorded as they succeed (write-through), so
+the next run does not download the events it just uploaded.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set
+
+from src.utils.ical_times import get_event_fields
+from src.utils.logger import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS events (
+    href TEXT PRIMARY KEY,
+    etag TEXT,
+    uid TEXT,
+    dtstart INTEGER,
+    dtend INTEGER,
+    summary TEXT,
+    location TEXT,
+    description TEXT,
+    content_hash TEXT NOT NULL,
+    ics TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_dtstart ON events (dtstart);
+CREATE INDEX IF NOT EXISTS events_dtend ON events (dtend);
+CREATE INDEX IF NOT EXISTS events_uid ON events (uid);
+"""
+
+
+def content_hash(ics: str) -> str:
+    """SHA-1 of an event's ICS text."""
+    return hashlib.sha1(ics.encode("utf-8")).hexdigest()
+
+
+def _epoch(value: Optional[datetime]) -> Optional[int]:
+    return int(value.timestamp()) if value is not None else None
+
+
+def _from_epoch(value: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+
+@dataclass
+class MirroredEvent:
+    """
+    An event read from the mirror.
+    Attributes:
+        url: Event href.
+        data: ICS text (as for caldav.Event).
+        etag: Last known ETag.
+        uid: iCalendar UID, if the event could be parsed.
+        summary: SUMMARY, or None if the event could not be parsed.
+        start: DTSTART in UTC, or None if unknown.
+        end: End in UTC (DTEND, DTSTART + DURATION or DTSTART), or None if unknown.
+        location: LOCATION ("" if absent).
+        description: DESCRIPTION ("" if absent).
+    """
+    url: str
+    data: str
+    etag: Optional[str] = None
+    uid: Optional[str] = None
+    summary: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    location: str = ""
+    description: str = ""
+
+
+class CalendarMirror:
+    """Local SQLite copy of one calendar: the drop-in, indexed counterpart of RemoteCalendarState."""
+
+    def __init__(self, filepath: str, calendar_url: str):
+        """
+        Open (or create) the mirror database.
+
+        Args:
+            filepath: Path of the SQLite file
+            calendar_url: Calendar the mirror belongs to; a file written for a
+                different calendar is emptied
+        """
+        self.filepath = filepath
+        self.calendar_url = calendar_url
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Writes are recorded from write-pool threads as they finish
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(filepath, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self.sync_token: Optional[str] = None
+        self.ctag: Optional[str] = None
+        self.load()
+
+    def load(self):
+        """Read the sync token and ctag, emptying the mirror if it belongs to another calendar."""
+        with self._lock:
+            meta = dict(self._db.execute("SELECT key, value FROM meta"))
+            if meta and meta.get("calendar_url") != self.calendar_url:
+                logger.info(f"Calendar mirror {self.filepath} is for another calendar; starting fresh.")
+                with self._db:
+                    self._db.execute("DELETE FROM events")
+                    self._db.execute("DELETE FROM meta")
+                meta = {}
+        self.sync_token = meta.get("sync_token")
+        self.ctag = meta.get("ctag")
+
+    def save(self):
+        """Persist the sync token and ctag (event rows are written as they change)."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("calendar_url", self.calendar_url), ("sync_token", self.sync_token), ("ctag", self.ctag)],
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def hrefs(self) -> Set[str]:
+        """Hrefs of every mirrored event."""
+        with self._lock:
+            return {href for (href,) in self._db.execute("SELECT href FROM events")}
+
+    def etag(self, href: str) -> Optional[str]:
+        """Return the cached ETag of an event, or None if it is not cached."""
+        with self._lock:
+            row = self._db.execute("SELECT etag FROM events WHERE href = ?", (href,)).fetchone()
+        return row[0] if row else None
+
+    def apply(self, fetched: Dict[str, tuple], deleted: Iterable[str]):
+        """
+        Record downloaded and deleted events.
+
+        Args:
+            fetched: href -> (ics, etag) for events downloaded this run
+            deleted: hrefs of events that no longer exist on the server
+        """
+        rows = [self._row(href, ics, etag) for href, (ics, etag) in fetched.items()]
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM events WHERE href = ?", [(href,) for href in deleted])
+            self._db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def record_put(self, href: str, ics: str, etag: Optional[str]):
+        """Record an event this tool has just stored on the server."""
+        self.apply({href: (ics, etag)}, ())
+
+    def record_delete(self, href: str):
+        """Record an event this tool has just deleted from the server."""
+        self.apply({}, (href,))
+
+    def events_in_range(self, start: Optional[datetime], end: Optional[datetime] = None) -> Dict[str, MirroredEvent]:
+        """
+        Select the events overlapping [start, end) with an indexed query.
+
+        Events whose times could not be determined are included, matching
+        ical_times.event_in_range().
+        Args:
+            start: Range start (timezone-aware), or None for unbounded
+            end: Range end (timezone-aware), or None for unbounded
+        Returns:
+            href -> MirroredEvent
+        """
+        query = ("SELECT href, ics, etag, uid, summary, dtstart, dtend, location, description FROM events "
+                 "WHERE (? IS NULL OR dtend IS NULL OR dtend > ?) AND (? IS NULL OR dtstart IS NULL OR dtstart < ?) "
+                 "ORDER BY href")
+        start_epoch, end_epoch = _epoch(start), _epoch(end)
+        with self._lock:
+            rows = self._db.execute(query, (start_epoch, start_epoch, end_epoch, end_epoch)).fetchall()
+        return {
+            href: MirroredEvent(href, ics, etag, uid, summary, _from_epoch(dtstart), _from_epoch(dtend),
+                                location or "", description or "")
+            for href, ics, etag, uid, summary, dtstart, dtend, location, description in rows
+        }
+
+    @staticmethod
+    def _row(href: str, ics: str, etag: Optional[str]) -> tuple:
+        """Parse an event once into its mirror row; unreadable events keep only their body."""
+        uid = summary = location = description = start = end = None
+        try:
+            fields = get_event_fields(ics)
+            if fields is not None:
+                uid, start, end = fields.uid, fields.start, fields.end
+                summary = fields.summary or ""
+                location = fields.location or ""
+                description = fields.description or ""
+        except Exception as e:
+            logger.warning(f"Could not parse mirrored event {href}: {e}")
+        return (href, etag, uid, _epoch(start), _epoch(end), summary, location, description, content_hash(ics), ics)
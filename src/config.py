@@ -14,11 +14,24 @@ class Config:
     outlook_calendar_name: str
     sync_interval_minutes: int = 15
     log_level: str = "INFO"
-    sync_state_filepath: str = "specs/002-synchronise-outlook-work/sync_state.json"
+    sync_state_filepath: Optional[str] = None
     verify_ssl: bool = True
+    caldav_write_concurrency: int = 4
+    caldav_connect_timeout_seconds: float = 10.0
+    caldav_read_timeout_seconds: float = 60.0
     pushbullet_api_key: Optional[str] = None
     use_gemini_vision: bool = False
     gemini_api_key: Optional[str] = None
+    gemini_cache_dir: Optional[str] = "cache/gemini"
+    gemini_cache_ttl_hours: float = 24.0
+    gemini_cache_max_entries: int = 64
+    gemini_latency_budget_seconds: float = 20.0
+    gemini_tiled_extraction: bool = False
+    horizon_weeks: int = 1
+    extraction_workers: Optional[int] = None
+    watch_poll_seconds: float = 5.0
+    watch_settle_seconds: float = 10.0
+    watch_min_sync_interval_seconds: float = 120.0
 
     @classmethod
     def load_from_file(cls, filepath: str = "config.json") -> 'Config':
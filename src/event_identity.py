@@ -0,0 +1,59 @@
+"""
+Stable identity for parsed events.
+
+An event is identified by its normalized title plus its UTC start and end.
+The same key drives reconciliation (matching parsed events to existing
+ones) and the deterministic UID, so rerunning a sync addresses the same
+CalDAV resource (<uid>.ics) instead of creating a duplicate.
+"""
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from src.models.calendar_data import ParsedEvent
+
+# (normalized title, UTC start, UTC end)
+EventKey = Tuple[str, str, str]
+
+KEY_TIME_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Case-fold a title and collapse its whitespace so cosmetic OCR differences still match."""
+    return re.sub(r"\s+", " ", str(title or "")).strip().casefold()
+
+
+def parsed_event_key(event: ParsedEvent) -> EventKey:
+    """
+    Compute the identity key of a parsed event.
+    Args:
+        event: ParsedEvent with local start/end times
+    Returns:
+        (normalized title, UTC start, UTC end)
+    Raises:
+        ValueError if the start or end time cannot be parsed
+    """
+    # Same timezone rule as map_parsed_event_to_ical. Local times are resolved
+    # like RFC 5545 readers (and icalendar) do: the first of a repeated hour,
+    # the offset before the gap for a skipped one, so keys match the server's.
+    tz = timezone.utc if getattr(event, "_ical_timezone", "America/New_York") == "UTC" else ZoneInfo("America/New_York")
+
+    def to_utc(value: str) -> str:
+        local = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=tz)
+        return local.astimezone(timezone.utc).strftime(KEY_TIME_FORMAT)
+
+    return normalize_title(event.title), to_utc(event.start_datetime), to_utc(event.end_datetime)
+
+
+def deterministic_uid(event: ParsedEvent) -> str:
+    """
+    Derive a UID from the event's identity key.
+    Args:
+        event: ParsedEvent
+    Returns:
+        16 hex characters, identical for every run that sees the same event
+    """
+    digest = hashlib.sha1("\x1f".join(parsed_event_key(event)).encode("utf-8")).hexdigest()
+    return digest[:16]
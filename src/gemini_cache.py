@@ -0,0 +1,146 @@
+"""
+Persistent, content-addressed cache of Gemini extraction results.
+
+Entries are keyed by (exact pixel digest of the image, prompt template
+version, model name, current date) and store the parsed JSON event list,
+so a re-capture of an unchanged calendar never goes back to the API while
+any edit on screen, down to one digit of a meeting time, is a miss.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Callable, List, Optional
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+
+class GeminiResponseCache:
+    """
+    On-disk cache with a time-to-live and size-based (least recently used) eviction.
+
+    Each entry is a small JSON file in `cache_dir`; reading an entry refreshes
+    its modification time so eviction drops the least recently used entries first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 64,
+        max_bytes: int = 5 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries (created if missing)
+            ttl_seconds: Age after which an entry is ignored and removed
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total size of all entries
+            clock: Wall clock (injectable for tests)
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_hash: str, prompt_version: str, model_name: str, current_date: str) -> str:
+        """Build the cache key for one extraction request."""
+        raw = "|".join([image_hash, prompt_version, model_name, current_date])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """
+        Look up a cached event list.
+
+        Args:
+            key: Key from make_key()
+        Returns:
+            The cached list of event dicts, or None on a miss or expired entry
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return self._miss()
+
+        if self.clock() - entry.get("created", 0) > self.ttl_seconds:
+            logger.debug(f"Gemini cache entry {key[:12]} expired")
+            self._remove(path)
+            return self._miss()
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        metrics.incr("gemini_cache.hits")
+        logger.info(f"Gemini cache hit ({key[:12]}), skipping API call")
+        return entry["events"]
+
+    def put(self, key: str, events: List[dict]):
+        """
+        Store an event list and evict old entries if the cache is over its limits.
+
+        Args:
+            key: Key from make_key()
+            events: Parsed JSON event list returned by Gemini
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"created": self.clock(), "events": events}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write Gemini cache entry {path}: {e}")
+            return
+        self._evict()
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counts for this cache instance."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _miss(self) -> None:
+        self.misses += 1
+        metrics.incr("gemini_cache.misses")
+        return None
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()  # Oldest (least recently used) first
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+            self.evictions += 1
+            metrics.incr("gemini_cache.evictions")
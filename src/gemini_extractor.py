@@ -7,50 +7,51 @@ from Outlook calendar screenshots with much higher reliability than traditional
 
 import os
 import json
+import time
+import asyncio
+import threading
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted, TooManyRequests
 from PIL import Image
 
+from src.gemini_cache import GeminiResponseCache
+from src.gemini_image_prep import PreparedImage, prepare_image_for_upload
+from src.gemini_schema import parse_event_response, repair_event, response_generation_config
+from src.gemini_tiling import find_date_headers, split_into_day_tiles
+from src.interfaces.event_extractor import IncompleteExtractionError
 from src.models.calendar_data import ParsedEvent
+from src.multi_week import merge_week_events
+from src.utils.image_hash import content_digest
+from src.utils.json_stream import IncrementalJSONArrayParser
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 
-def extract_events_with_gemini(image_path: str, api_key: str) -> List[ParsedEvent]:
+# Bump PROMPT_TEMPLATE_VERSION whenever the prompt changes so cached responses are invalidated
+GEMINI_MODEL_NAME = 'gemini-2.0-flash-exp'
+PROMPT_TEMPLATE_VERSION = "1"
+DAY_PROMPT_TEMPLATE_VERSION = "day-1"
+# Inline request data is capped at 20 MB; stay well below it by default
+DEFAULT_MAX_PAYLOAD_BYTES = 4 * 1024 * 1024
+
+
+def build_extraction_prompt(today: datetime) -> str:
     """
-    Extract calendar events from a screenshot using Gemini Vision API.
-    
+    Build the event extraction prompt for a given date.
+
     Args:
-        image_path: Path to the cropped calendar screenshot
-        api_key: Google Gemini API key
-        
+        today: Current date, used to help Gemini infer the correct year
+
     Returns:
-        List of ParsedEvent objects extracted from the image
-        
-    Raises:
-        Exception if Gemini API call fails
+        Prompt text
     """
-    # Configure Gemini
-    genai.configure(api_key=api_key)
-    
-    # Use Gemini 2.0 Flash with vision capabilities
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    # Load image
-    try:
-        img = Image.open(image_path)
-        logger.debug(f"Loaded image from {image_path} for Gemini processing")
-    except Exception as e:
-        logger.error(f"Failed to load image {image_path}: {e}")
-        raise
-    
-    # Craft a detailed prompt for event extraction
-    # Get current year to help Gemini infer the correct year
-    current_year = datetime.now().year
-    
-    prompt = f"""You are analyzing a screenshot of Microsoft Outlook calendar in Work Week view with List layout.
+    current_year = today.year
 
-IMPORTANT: Today's date is {datetime.now().strftime('%B %d, %Y')}. The current year is {current_year}.
+    return f"""You are analyzing a screenshot of Microsoft Outlook calendar in Work Week view with List layout.
+
+IMPORTANT: Today's date is {today.strftime('%B %d, %Y')}. The current year is {current_year}.
 
 Please extract ALL calendar events visible in this screenshot and return them as a JSON array.
 
@@ -86,83 +87,779 @@ Return ONLY a valid JSON array with no additional text. Format:
 
 Extract all events you can see."""
 
-    try:
-        logger.info("Sending screenshot to Gemini Vision API for event extraction...")
-        response = model.generate_content([prompt, img])
-        
-        # Extract the JSON from response
-        response_text = response.text.strip()
-        logger.debug(f"Gemini raw response: {response_text}")
-        
-        # Clean up the response (remove markdown code blocks if present)
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]  # Remove ```json
-        if response_text.startswith("```"):
-            response_text = response_text[3:]   # Remove ```
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]  # Remove trailing ```
-        response_text = response_text.strip()
-        
-        # Parse JSON
-        events_data = json.loads(response_text)
-        logger.info(f"Gemini extracted {len(events_data)} events")
-        
+
+def build_day_prompt(day: str) -> str:
+    """
+    Build the shorter prompt used for a single-day tile.
+
+    The date is known from the tile's header, so the model only has to read
+    titles and times; the date is filled in locally.
+
+    Args:
+        day: Date of the tile (YYYY-MM-DD)
+
+    Returns:
+        Prompt text
+    """
+    day_label = datetime.strptime(day, '%Y-%m-%d').strftime('%A, %B %d, %Y')
+
+    return f"""This image is one day ({day_label}) from a Microsoft Outlook calendar in List layout.
+
+Extract ALL calendar events visible in the image and return them as a JSON array.
+
+For each event, extract:
+- title: The event title/subject
+- start_time: Start time in HH:MM format (24-hour)
+- end_time: End time in HH:MM format (24-hour)
+- location: Location if visible (optional)
+- description: Any additional details visible (optional)
+
+Ignore the date header row itself. Return ONLY a valid JSON array with no additional text, or [] if there are no events."""
+
+
+def build_multi_page_prompt(today: datetime, page_ids: List[str]) -> str:
+    """
+    Build the prompt for a request carrying several page images.
+
+    Args:
+        today: Current date, used to help Gemini infer the correct year
+        page_ids: Ids of the pages in the request, in order
+
+    Returns:
+        Prompt text
+    """
+    return build_extraction_prompt(today) + f"""
+
+This request contains {len(page_ids)} screenshots, not one. Each screenshot is preceded by a line
+"Page id: <id>" (ids: {', '.join(page_ids)}). Extract the events of every screenshot into the same
+JSON array and add a "page_id" field to every event with the id of the screenshot it appears on."""
+
+
+def _pack_pages(pending: List[tuple], max_payload_bytes: int) -> List[List[tuple]]:
+    """
+    Group prepared pages into requests of at most `max_payload_bytes` of image data.
+
+    Args:
+        pending: (page key, request state) pairs in page order
+        max_payload_bytes: Byte budget per request
+
+    Returns:
+        Groups of pages, in order; a page larger than the budget gets its own group
+    """
+    groups = []
+    group, group_bytes = [], 0
+    for key, state in pending:
+        size = len(state[1].data)
+        if size > max_payload_bytes:
+            logger.warning(f"Page {key} is {size} bytes, over the {max_payload_bytes} byte request limit; sending alone")
+        if group and group_bytes + size > max_payload_bytes:
+            groups.append(group)
+            group, group_bytes = [], 0
+        group.append((key, state))
+        group_bytes += size
+    if group:
+        groups.append(group)
+    return groups
+
+
+def events_from_gemini_data(events_data: List[dict]) -> List[ParsedEvent]:
+    """
+    Convert Gemini event dicts to ParsedEvent objects, skipping malformed entries.
+
+    Args:
+        events_data: List of dicts with title, date, start_time, end_time, location, description
+
+    Returns:
+        List of ParsedEvent objects
+    """
+    parsed_events = []
+    for event_data in events_data:
+        try:
+            # Combine date and time
+            date_str = event_data['date']
+            start_time_str = event_data['start_time']
+            end_time_str = event_data['end_time']
+
+            # Create ISO format datetime strings
+            start_datetime = f"{date_str}T{start_time_str}:00"
+            end_datetime = f"{date_str}T{end_time_str}:00"
+
+            # Validate datetime format
+            datetime.fromisoformat(start_datetime)
+            datetime.fromisoformat(end_datetime)
+
+            event = ParsedEvent(
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                title=event_data['title'],
+                location=event_data.get('location'),
+                description=event_data.get('description'),
+                confidence_score=0.95  # Gemini is highly reliable
+            )
+            parsed_events.append(event)
+            logger.info(f"Calendar event detected: {event.start_datetime} - {event.end_datetime} | {event.title}")
+
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to parse event from Gemini response: {event_data}. Error: {e}")
+            continue
+
+    return parsed_events
+
+
+def _record_call_stats(prepared: PreparedImage, latency: float):
+    """Log and record upload size and response latency for one Gemini call."""
+    metrics.incr("gemini.calls")
+    metrics.observe("gemini.upload_bytes", len(prepared.data))
+    metrics.observe("gemini.latency_seconds", latency)
+    logger.info(
+        f"Gemini call: uploaded {len(prepared.data)} bytes "
+        f"({prepared.size[0]}x{prepared.size[1]}, was {prepared.original_bytes} bytes at "
+        f"{prepared.original_size[0]}x{prepared.original_size[1]}), response in {latency:.2f}s"
+    )
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Return True if an API error means we are being rate limited (HTTP 429)."""
+    return isinstance(error, (ResourceExhausted, TooManyRequests)) or getattr(error, "code", None) == 429
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Extract the server-requested delay from a rate-limit error, if any.
+
+    Looks at an explicit `retry_after` attribute, a Retry-After response
+    header and a google.rpc RetryInfo detail, in that order.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            pass
+    for detail in getattr(error, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+class GeminiSession:
+    """
+    A configured Gemini model reused across extractions.
+
+    Configures the client and builds the GenerativeModel once, and offers
+    both a synchronous extract() and an asyncio extract_batch() that runs
+    many images or crops concurrently under a semaphore. Rate-limited calls
+    are retried with exponential backoff, honouring Retry-After when the
+    server sends one.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model=None,
+        model_name: str = GEMINI_MODEL_NAME,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        cache: Optional[GeminiResponseCache] = None,
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            api_key: Google Gemini API key (not needed when `model` is given)
+            model: Model object to use instead of genai.GenerativeModel (e.g. LocalStandInModel)
+            model_name: Gemini model name
+            max_concurrency: Maximum number of requests in flight in extract_batch()
+            max_retries: Retries after a rate-limited call before giving up
+            backoff_base: First backoff delay in seconds (doubled on every retry)
+            backoff_max: Upper bound on a single backoff delay
+            cache: Default response cache for extractions
+        """
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(model_name)
+        self.model = model
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+
+    def _backoff_delay(self, error: Exception, attempt: int) -> float:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return min(self.backoff_base * (2 ** attempt), self.backoff_max)
+
+    def _begin(self, image, cache: Optional[GeminiResponseCache], bypass_cache: bool, day: Optional[str] = None):
+        """
+        Load the image and consult the cache. Returns (cached events or None, request state).
+
+        With `day` set the image is a single-day tile: the day prompt is used
+        and the day takes the place of today's date in the cache key.
+        """
+        if isinstance(image, Image.Image):
+            img = image
+        else:
+            try:
+                img = Image.open(image)
+                logger.debug(f"Loaded image from {image} for Gemini processing")
+            except Exception as e:
+                logger.error(f"Failed to load image {image}: {e}")
+                raise
+
+        today = datetime.now()
+        cache_key = None
+        if cache is not None:
+            prompt_version = DAY_PROMPT_TEMPLATE_VERSION if day else PROMPT_TEMPLATE_VERSION
+            cache_key = GeminiResponseCache.make_key(
+                content_digest(img), prompt_version, self.model_name, day or today.strftime('%Y-%m-%d')
+            )
+            if not bypass_cache:
+                cached_events = cache.get(cache_key)
+                if cached_events is not None:
+                    return events_from_gemini_data(cached_events), None
+
+        # Craft a detailed prompt for event extraction
+        prompt = build_day_prompt(day) if day else build_extraction_prompt(today)
+        # Shrink the upload: crop, grayscale, downsample and compact encoding
+        prepared = prepare_image_for_upload(img)
+        return None, (prompt, prepared, cache_key, day)
+
+    def _finish(self, response, state, latency: float, cache: Optional[GeminiResponseCache]) -> List[ParsedEvent]:
+        """Record stats, parse the response, fill the cache and convert to ParsedEvents."""
+        _, prepared, cache_key, day = state
+        _record_call_stats(prepared, latency)
+
+        response_text = ""
+        try:
+            # Extract the JSON from response
+            response_text = response.text.strip()
+            logger.debug(f"Gemini raw response: {response_text}")
+
+            # Parse JSON
+            events_data = parse_event_response(response_text, require_date=not day)
+            logger.info(f"Gemini extracted {len(events_data)} events")
+            if day:
+                # Day tiles are answered without dates; every event is on the tile's day
+                for event_data in events_data:
+                    if isinstance(event_data, dict):
+                        event_data['date'] = day
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse Gemini response as JSON: {e}")
+            logger.error(f"Response was: {response_text}")
+            raise
+
+        if cache is not None:
+            cache.put(cache_key, events_data)
+
         # Convert to ParsedEvent objects
-        parsed_events = []
-        for event_data in events_data:
+        return events_from_gemini_data(events_data)
+
+    def extract(
+        self,
+        image,
+        cache: Optional[GeminiResponseCache] = None,
+        bypass_cache: bool = False,
+    ) -> List[ParsedEvent]:
+        """
+        Extract events from one image, blocking until the response arrives.
+
+        Args:
+            image: Path to a screenshot, or a PIL image (e.g. a crop)
+            cache: Response cache to use instead of the session default
+            bypass_cache: If True, always call the API (the fresh result is still cached)
+
+        Returns:
+            List of ParsedEvent objects
+        """
+        cache = cache if cache is not None else self.cache
+        cached, state = self._begin(image, cache, bypass_cache)
+        if cached is not None:
+            return cached
+        prompt, prepared = state[:2]
+
+        logger.info("Sending screenshot to Gemini Vision API for event extraction...")
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
             try:
-                # Combine date and time
-                date_str = event_data['date']
-                start_time_str = event_data['start_time']
-                end_time_str = event_data['end_time']
-                
-                # Create ISO format datetime strings
-                start_datetime = f"{date_str}T{start_time_str}:00"
-                end_datetime = f"{date_str}T{end_time_str}:00"
-                
-                # Validate datetime format
-                datetime.fromisoformat(start_datetime)
-                datetime.fromisoformat(end_datetime)
-                
-                event = ParsedEvent(
-                    start_datetime=start_datetime,
-                    end_datetime=end_datetime,
-                    title=event_data['title'],
-                    location=event_data.get('location'),
-                    description=event_data.get('description'),
-                    confidence_score=0.95  # Gemini is highly reliable
+                response = self.model.generate_content(
+                    [prompt, prepared.as_part()], generation_config=response_generation_config(include_date=not state[3])
                 )
-                parsed_events.append(event)
-                logger.info(f"Calendar event detected: {event.start_datetime} - {event.end_datetime} | {event.title}")
-                
-            except (KeyError, ValueError) as e:
-                logger.warning(f"Failed to parse event from Gemini response: {event_data}. Error: {e}")
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == self.max_retries:
+                    logger.error(f"Gemini API call failed: {e}")
+                    raise
+                delay = self._backoff_delay(e, attempt)
+                metrics.incr("gemini.rate_limited")
+                logger.warning(f"Gemini rate limited, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+            return self._finish(response, state, time.monotonic() - started, cache)
+        raise RuntimeError("Gemini call did not return after retries.")  # Should not be reached
+
+    def _open_stream(self, contents: list, generation_config: Optional[dict] = None):
+        """Start a streaming generation, retrying if the request is rate limited."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.model.generate_content(contents, stream=True, generation_config=generation_config)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == self.max_retries:
+                    logger.error(f"Gemini API call failed: {e}")
+                    raise
+                delay = self._backoff_delay(e, attempt)
+                metrics.incr("gemini.rate_limited")
+                logger.warning(f"Gemini rate limited, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+        raise RuntimeError("Gemini call did not return after retries.")  # Should not be reached
+
+    def iter_events(
+        self,
+        image,
+        cache: Optional[GeminiResponseCache] = None,
+        bypass_cache: bool = False,
+    ) -> Iterator[ParsedEvent]:
+        """
+        Stream events from one image as Gemini generates them.
+
+        Each event is yielded as soon as its JSON object is complete, so
+        conversion and upload can start before the response has finished.
+        If the stream breaks off after some events, those events have
+        already been yielded and IncompleteExtractionError is raised; the
+        partial result is not cached.
+
+        Args:
+            image: Path to a screenshot, or a PIL image
+            cache: Response cache to use instead of the session default
+            bypass_cache: If True, always call the API
+
+        Yields:
+            ParsedEvent objects in response order
+
+        Raises:
+            Exception if the request fails before any event was completed;
+            IncompleteExtractionError if the stream breaks or is cut short
+            after that (raised once the completed events have been yielded)
+        """
+        cache = cache if cache is not None else self.cache
+        cached, state = self._begin(image, cache, bypass_cache)
+        if cached is not None:
+            yield from cached
+            return
+        prompt, prepared, cache_key, _ = state
+
+        logger.info("Streaming event extraction from Gemini Vision API...")
+        started = time.monotonic()
+        parser = IncrementalJSONArrayParser()
+        events_data = []
+        repaired = False
+        try:
+            for chunk in self._open_stream([prompt, prepared.as_part()], response_generation_config()):
+                for event_data in parser.feed(chunk.text):
+                    clean, changed = repair_event(event_data)
+                    repaired = repaired or changed
+                    if clean is None:
+                        logger.warning(f"Dropping Gemini event that does not match the schema: {event_data}")
+                        continue
+                    events_data.append(clean)
+                    yield from events_from_gemini_data([clean])
+        except Exception as e:
+            _record_call_stats(prepared, time.monotonic() - started)
+            if not events_data:
+                raise
+            metrics.incr("gemini.stream_interrupted")
+            logger.warning(f"Gemini stream ended early after {len(events_data)} event(s): {e}")
+            raise IncompleteExtractionError(f"Gemini stream ended early after {len(events_data)} event(s)") from e
+        _record_call_stats(prepared, time.monotonic() - started)
+
+        if not parser.finished:
+            metrics.incr("gemini.stream_interrupted")
+            logger.warning(f"Gemini stream was truncated after {len(events_data)} event(s)")
+            raise IncompleteExtractionError(f"Gemini stream was truncated after {len(events_data)} event(s)")
+        logger.info(f"Gemini streamed {len(events_data)} events")
+        metrics.incr("gemini.responses")
+        if repaired:
+            metrics.incr("gemini.responses_invalid")
+        if cache is not None:
+            cache.put(cache_key, events_data)
+
+    async def extract_async(
+        self,
+        image,
+        cache: Optional[GeminiResponseCache] = None,
+        bypass_cache: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        day: Optional[str] = None,
+    ) -> List[ParsedEvent]:
+        """
+        Asynchronous variant of extract().
+
+        Args:
+            image: Path to a screenshot, or a PIL image
+            cache: Response cache to use instead of the session default
+            bypass_cache: If True, always call the API
+            semaphore: Semaphore bounding concurrent requests (held only while a request is in flight)
+            day: If set, treat the image as a single-day tile for this date (YYYY-MM-DD)
+
+        Returns:
+            List of ParsedEvent objects
+        """
+        cache = cache if cache is not None else self.cache
+        cached, state = await asyncio.to_thread(self._begin, image, cache, bypass_cache, day)
+        if cached is not None:
+            return cached
+        prompt, prepared = state[:2]
+        response, latency = await self._request_async(
+            [prompt, prepared.as_part()], semaphore, response_generation_config(include_date=not day)
+        )
+        return self._finish(response, state, latency, cache)
+
+    async def _request_async(
+        self,
+        contents: list,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        generation_config: Optional[dict] = None,
+    ):
+        """Send one request, retrying rate-limited calls. Returns (response, latency in seconds)."""
+        semaphore = semaphore or asyncio.Semaphore(1)
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    response = await self._generate_async(contents, generation_config)
+                except Exception as e:
+                    error = e
+                else:
+                    return response, time.monotonic() - started
+            if not _is_rate_limited(error) or attempt == self.max_retries:
+                logger.error(f"Gemini API call failed: {error}")
+                raise error
+            # Back off outside the semaphore so other requests can proceed
+            delay = self._backoff_delay(error, attempt)
+            metrics.incr("gemini.rate_limited")
+            logger.warning(f"Gemini rate limited, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+        raise RuntimeError("Gemini call did not return after retries.")  # Should not be reached
+
+    async def _generate_async(self, contents, generation_config: Optional[dict] = None):
+        if hasattr(self.model, "generate_content_async"):
+            return await self.model.generate_content_async(contents, generation_config=generation_config)
+        return await asyncio.to_thread(self.model.generate_content, contents, generation_config=generation_config)
+
+    async def extract_batch(
+        self,
+        images: Sequence,
+        cache: Optional[GeminiResponseCache] = None,
+        bypass_cache: bool = False,
+        return_exceptions: bool = False,
+        days: Optional[Sequence[str]] = None,
+    ) -> List:
+        """
+        Extract events from many images concurrently.
+
+        At most `max_concurrency` requests are in flight at any time.
+
+        Args:
+            images: Screenshot paths and/or PIL images
+            cache: Response cache to use instead of the session default
+            bypass_cache: If True, always call the API
+            return_exceptions: If True, a failed image yields its exception instead of
+                aborting the whole batch
+            days: Optional date per image; images with a date are treated as single-day tiles
+
+        Returns:
+            One list of ParsedEvent objects (or exception) per image, in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        days = days or [None] * len(images)
+        tasks = [
+            self.extract_async(image, cache=cache, bypass_cache=bypass_cache, semaphore=semaphore, day=day)
+            for image, day in zip(images, days)
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    def extract_batch_sync(self, images: Sequence, **kwargs) -> List:
+        """Run extract_batch() to completion from synchronous code."""
+        return asyncio.run(self.extract_batch(images, **kwargs))
+
+    async def extract_pages_async(
+        self,
+        pages: Dict[str, object],
+        cache: Optional[GeminiResponseCache] = None,
+        bypass_cache: bool = False,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+    ) -> Dict[str, List[ParsedEvent]]:
+        """
+        Extract events from several page images, packing them into as few requests as possible.
+
+        Pages are sent together with one shared prompt, each preceded by a
+        short page id that the model echoes back on every event. A request
+        is closed once adding the next page would exceed `max_payload_bytes`
+        of image data; a single page over the limit is sent on its own.
+        Requests run concurrently under the session's concurrency limit.
+        Pages already in the cache are not sent, and each page's result is
+        cached on its own, so later single-image extractions hit it too.
+
+        Args:
+            pages: Page key (e.g. screenshot path) -> screenshot path or PIL image
+            cache: Response cache to use instead of the session default
+            bypass_cache: If True, always call the API
+            max_payload_bytes: Maximum encoded image bytes per request
+
+        Returns:
+            Page key -> list of ParsedEvent objects found on that page
+        """
+        cache = cache if cache is not None else self.cache
+        results: Dict[str, List[ParsedEvent]] = {}
+        pending = []  # (page key, request state) for pages not served from cache
+        for key, image in pages.items():
+            cached, state = await asyncio.to_thread(self._begin, image, cache, bypass_cache)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending.append((key, state))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        groups = _pack_pages(pending, max_payload_bytes)
+        group_results = await asyncio.gather(*[
+            self._extract_page_group(group, cache, semaphore) for group in groups
+        ])
+        for group_result in group_results:
+            results.update(group_result)
+        return {key: results[key] for key in pages}
+
+    async def _extract_page_group(self, group, cache, semaphore) -> Dict[str, List[ParsedEvent]]:
+        """Send one packed multi-page request and split the events by page."""
+        page_ids = {f"p{index + 1}": key for index, (key, _) in enumerate(group)}
+        contents = [build_multi_page_prompt(datetime.now(), list(page_ids))]
+        upload_bytes = 0
+        for page_id, (_, state) in zip(page_ids, group):
+            prepared = state[1]
+            contents += [f"Page id: {page_id}", prepared.as_part()]
+            upload_bytes += len(prepared.data)
+
+        logger.info(f"Sending {len(group)} page(s) ({upload_bytes} bytes) to Gemini in one request...")
+        response, latency = await self._request_async(
+            contents, semaphore, response_generation_config(include_page_id=True)
+        )
+        metrics.incr("gemini.calls")
+        metrics.observe("gemini.upload_bytes", upload_bytes)
+        metrics.observe("gemini.latency_seconds", latency)
+        metrics.observe("gemini.pages_per_request", len(group))
+        logger.info(f"Gemini multi-page call: {len(group)} page(s), {upload_bytes} bytes, response in {latency:.2f}s")
+
+        try:
+            events_data = parse_event_response(response.text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse Gemini multi-page response as JSON: {e}")
+            raise
+
+        per_page = {page_id: [] for page_id in page_ids}
+        for event_data in events_data:
+            page_id = event_data.pop('page_id', None) if isinstance(event_data, dict) else None
+            if page_id not in per_page and len(per_page) == 1:
+                page_id = next(iter(per_page))
+            if page_id not in per_page:
+                logger.warning(f"Dropping Gemini event with unknown page id {page_id!r}: {event_data}")
                 continue
+            per_page[page_id].append(event_data)
+
+        results = {}
+        for page_id, (key, state) in zip(page_ids, group):
+            cache_key = state[2]
+            if cache is not None:
+                cache.put(cache_key, per_page[page_id])
+            results[key] = events_from_gemini_data(per_page[page_id])
+        return results
+
+    def extract_pages(self, pages: Dict[str, object], **kwargs) -> Dict[str, List[ParsedEvent]]:
+        """Run extract_pages_async() to completion from synchronous code."""
+        return asyncio.run(self.extract_pages_async(pages, **kwargs))
+
+    def extract_tiled(
+        self,
+        image,
+        cache: Optional[GeminiResponseCache] = None,
+        bypass_cache: bool = False,
+        find_headers=find_date_headers,
+    ) -> List[ParsedEvent]:
+        """
+        Extract events by splitting the capture into per-day tiles.
+
+        The capture is cut at its date header rows and every day is sent as
+        its own concurrent request with the short day prompt. Per-day results
+        are merged in date order. If fewer than two headers are found (or
+        header detection fails) the whole image is sent as usual.
+
+        Args:
+            image: Path to a screenshot, or a PIL image
+            cache: Response cache to use instead of the session default
+            bypass_cache: If True, always call the API
+            find_headers: Header detector, called as find_headers(img, year)
+
+        Returns:
+            List of ParsedEvent objects
+        """
+        img = image if isinstance(image, Image.Image) else Image.open(image)
+        try:
+            headers = find_headers(img, datetime.now().year)
+        except Exception as e:
+            logger.warning(f"Could not detect date headers for tiling, sending the whole image: {e}")
+            headers = []
+        if len(headers) < 2:
+            return self.extract(img, cache=cache, bypass_cache=bypass_cache)
+
+        tiles = split_into_day_tiles(img, headers)
+        metrics.observe("gemini.tiles", len(tiles))
+        logger.info(f"Sending {len(tiles)} day tiles to Gemini: {', '.join(t.date for t in tiles)}")
+        per_day_events = self.extract_batch_sync(
+            [tile.image for tile in tiles], cache=cache, bypass_cache=bypass_cache,
+            days=[tile.date for tile in tiles],
+        )
+        return merge_week_events(per_day_events)
+
+
+_sessions: Dict[tuple, GeminiSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_gemini_session(api_key: str, model_name: str = GEMINI_MODEL_NAME) -> GeminiSession:
+    """
+    Return the shared session for an API key, creating it on first use.
+
+    Args:
+        api_key: Google Gemini API key
+        model_name: Gemini model name
+
+    Returns:
+        GeminiSession
+    """
+    with _sessions_lock:
+        session = _sessions.get((api_key, model_name))
+        if session is None:
+            session = GeminiSession(api_key, model_name=model_name)
+            _sessions[(api_key, model_name)] = session
+        return session
+
+
+def extract_events_with_gemini(
+    image_path: str,
+    api_key: str,
+    cache: Optional[GeminiResponseCache] = None,
+    bypass_cache: bool = False,
+    stream: bool = False,
+    tiled: bool = False,
+) -> List[ParsedEvent]:
+    """
+    Extract calendar events from a screenshot using Gemini Vision API.
+    
+    Args:
+        image_path: Path to the cropped calendar screenshot
+        api_key: Google Gemini API key
+        cache: Optional response cache; identical screenshots are served from it
+        bypass_cache: If True, always call the API (the fresh result is still cached)
+        stream: If True, parse the response incrementally; if the stream breaks off,
+            the events completed before the break are kept on the raised error
+        tiled: If True, split the capture into per-day tiles sent as concurrent requests
         
-        return parsed_events
+    Returns:
+        List of ParsedEvent objects extracted from the image
         
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse Gemini response as JSON: {e}")
-        logger.error(f"Response was: {response_text}")
-        raise
-    except Exception as e:
-        logger.error(f"Gemini API call failed: {e}")
-        raise
+    Raises:
+        Exception if Gemini API call fails;
+        IncompleteExtractionError if a stream breaks off after some events (its
+        `events` attribute holds the events completed before the break)
+    """
+    session = get_gemini_session(api_key)
+    if tiled:
+        return session.extract_tiled(image_path, cache=cache, bypass_cache=bypass_cache)
+    if stream:
+        events = []
+        try:
+            for event in session.iter_events(image_path, cache=cache, bypass_cache=bypass_cache):
+                events.append(event)
+        except IncompleteExtractionError as e:
+            e.events = events
+            raise
+        return events
+    return session.extract(image_path, cache=cache, bypass_cache=bypass_cache)
+
+
+def extract_events_from_pages_with_gemini(
+    image_paths: List[str],
+    api_key: str,
+    cache: Optional[GeminiResponseCache] = None,
+    bypass_cache: bool = False,
+    max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+) -> Dict[str, List[ParsedEvent]]:
+    """
+    Extract calendar events from several screenshots with as few Gemini requests as possible.
+
+    Args:
+        image_paths: Paths to the cropped calendar screenshots (e.g. one per week)
+        api_key: Google Gemini API key
+        cache: Optional response cache
+        bypass_cache: If True, always call the API
+        max_payload_bytes: Maximum encoded image bytes per request; larger sets are split
+
+    Returns:
+        Screenshot path -> events found on that screenshot
+    """
+    pages = {path: path for path in image_paths}
+    return get_gemini_session(api_key).extract_pages(
+        pages, cache=cache, bypass_cache=bypass_cache, max_payload_bytes=max_payload_bytes
+    )
+
+
+def iter_events_with_gemini(
+    image_path: str,
+    api_key: str,
+    cache: Optional[GeminiResponseCache] = None,
+    bypass_cache: bool = False,
+) -> Iterator[ParsedEvent]:
+    """
+    Stream calendar events from a screenshot as Gemini generates them.
+
+    Args:
+        image_path: Path to the cropped calendar screenshot
+        api_key: Google Gemini API key
+        cache: Optional response cache
+        bypass_cache: If True, always call the API
+
+    Yields:
+        ParsedEvent objects as soon as each one is complete
+    """
+    yield from get_gemini_session(api_key).iter_events(image_path, cache=cache, bypass_cache=bypass_cache)
 
 
-def extract_events_with_gemini_fallback(image_path: str, api_key: str) -> List[ParsedEvent]:
+def extract_events_with_gemini_fallback(
+    image_path: str,
+    api_key: str,
+    cache: Optional[GeminiResponseCache] = None,
+    bypass_cache: bool = False,
+) -> List[ParsedEvent]:
     """
     Extract events using Gemini with fallback to OCR if it fails.
     
     Args:
         image_path: Path to the cropped calendar screenshot
         api_key: Google Gemini API key
+        cache: Optional response cache passed to extract_events_with_gemini
+        bypass_cache: If True, always call the API
         
     Returns:
         List of ParsedEvent objects
     """
     try:
-        return extract_events_with_gemini(image_path, api_key)
+        return extract_events_with_gemini(image_path, api_key, cache=cache, bypass_cache=bypass_cache)
     except Exception as e:
         logger.warning(f"Gemini extraction failed, falling back to OCR: {e}")
         from src.ocr_processor import process_image_with_ocr
@@ -0,0 +1,169 @@
+"""
+Payload-minimizing image preparation for Gemini uploads.
+
+The full-resolution RGB screenshot is mostly empty background. Before
+uploading we crop to the region that actually holds events, cut out the
+icon column, drop colour, downsample to the smallest size that keeps the
+text legible, and pick the most compact lossless encoding.
+"""
+import io
+import os
+from dataclasses import dataclass
+from statistics import median
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+# Icon column in the cropped Outlook screenshot (same range the OCR path discards)
+ICON_COLUMN = (775, 880)
+
+
+@dataclass
+class PreparedImage:
+    """
+    An encoded image ready to send to Gemini.
+    Attributes:
+        data: Encoded image bytes.
+        mime_type: MIME type of `data`.
+        size: (width, height) of the encoded image.
+        original_size: (width, height) of the source image.
+        original_bytes: Size of the source image file, or of its raw pixels if it was not
+            read from a file (for comparison).
+    """
+    data: bytes
+    mime_type: str
+    size: Tuple[int, int]
+    original_size: Tuple[int, int]
+    original_bytes: int = 0
+
+    def as_part(self) -> dict:
+        """Return the image as an inline-data part for generate_content()."""
+        return {"mime_type": self.mime_type, "data": self.data}
+
+
+def remove_columns(img: Image.Image, column: Optional[Tuple[int, int]]) -> Image.Image:
+    """
+    Cut a vertical strip out of an image and join the remaining halves.
+    Args:
+        img: Source image
+        column: (left, right) x-range to remove, or None
+    Returns:
+        Image without the strip (unchanged if the strip lies outside the image)
+    """
+    if column is None:
+        return img
+    left, right = max(0, column[0]), min(img.width, column[1])
+    if right <= left:
+        return img
+    joined = Image.new(img.mode, (img.width - (right - left), img.height), color=255)
+    joined.paste(img.crop((0, 0, left, img.height)), (0, 0))
+    joined.paste(img.crop((right, 0, img.width, img.height)), (left, 0))
+    return joined
+
+
+def find_content_box(gray: Image.Image, background_threshold: int = 235, margin: int = 6) -> Tuple[int, int, int, int]:
+    """
+    Bounding box of everything darker than the background.
+    Args:
+        gray: Grayscale image
+        background_threshold: Pixels at or above this value count as background
+        margin: Padding kept around the content
+    Returns:
+        (left, top, right, bottom); the whole image if it holds no content
+    """
+    ink = gray.point(lambda v: 255 if v < background_threshold else 0)
+    box = ink.getbbox()
+    if box is None:
+        return (0, 0, gray.width, gray.height)
+    left, top, right, bottom = box
+    return (
+        max(0, left - margin),
+        max(0, top - margin),
+        min(gray.width, right + margin),
+        min(gray.height, bottom + margin),
+    )
+
+
+def estimate_text_height(gray: Image.Image, ink_threshold: int = 160) -> Optional[int]:
+    """
+    Estimate the typical text line height from the horizontal ink profile.
+    Args:
+        gray: Grayscale image
+        ink_threshold: Pixels darker than this count as ink
+    Returns:
+        Median height in pixels of the runs of rows containing ink, or None if there is no text
+    """
+    ink = gray.point(lambda v: 255 if v < ink_threshold else 0)
+    runs = []
+    run = 0
+    for y in range(ink.height):
+        if ink.crop((0, y, ink.width, y + 1)).getbbox():
+            run += 1
+        elif run:
+            runs.append(run)
+            run = 0
+    if run:
+        runs.append(run)
+    # Ignore 1-2px runs (rules and separators) unless that's all there is
+    text_runs = [r for r in runs if r > 2] or runs
+    return int(median(text_runs)) if text_runs else None
+
+
+def _encode_smallest(img: Image.Image) -> Tuple[bytes, str]:
+    """Encode as grayscale PNG and 16-colour palette PNG, returning the smaller."""
+    candidates = []
+    for variant in (img, img.quantize(colors=16, dither=Image.Dither.NONE)):
+        buffer = io.BytesIO()
+        variant.save(buffer, format="PNG", optimize=True)
+        candidates.append(buffer.getvalue())
+    return min(candidates, key=len), "image/png"
+
+
+def _source_bytes(img: Image.Image) -> int:
+    """Size of the file an image was opened from, or of its raw pixel data."""
+    path = getattr(img, "filename", "")
+    if path and os.path.isfile(path):
+        return os.path.getsize(path)
+    return img.width * img.height * len(img.getbands())
+
+
+def prepare_image_for_upload(
+    img: Image.Image,
+    icon_column: Optional[Tuple[int, int]] = ICON_COLUMN,
+    min_text_height: int = 14,
+    max_width: int = 1600,
+) -> PreparedImage:
+    """
+    Shrink a calendar screenshot to the smallest payload that keeps times readable.
+    Args:
+        img: Cropped calendar screenshot
+        icon_column: x-range of the icon column to drop, or None to keep it
+        min_text_height: Target height in pixels of a text line after downsampling
+        max_width: Upper bound on the output width
+    Returns:
+        PreparedImage with the encoded bytes and size information
+    """
+    original_size = img.size
+
+    gray = ImageOps.grayscale(img)
+    gray = remove_columns(gray, icon_column)
+    gray = gray.crop(find_content_box(gray))
+
+    # Downsample until a text line is about min_text_height pixels tall
+    scale = 1.0
+    text_height = estimate_text_height(gray)
+    if text_height:
+        scale = min(scale, min_text_height / text_height)
+    scale = min(scale, max_width / gray.width)
+    if scale < 1.0:
+        new_size = (max(1, round(gray.width * scale)), max(1, round(gray.height * scale)))
+        gray = gray.resize(new_size, Image.Resampling.LANCZOS)
+
+    data, mime_type = _encode_smallest(gray)
+    return PreparedImage(
+        data=data,
+        mime_type=mime_type,
+        size=gray.size,
+        original_size=original_size,
+        original_bytes=_source_bytes(img),
+    )
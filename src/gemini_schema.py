@@ -0,0 +1,243 @@
+"""
+Response schema for Gemini event extraction, and local validation/repair.
+
+Requests ask for JSON output constrained to the event schema, which removes
+most malformed responses. Whatever still comes back slightly off (markdown
+fences, a wrapping object, trailing commas, "9:00 AM" times) is repaired
+here instead of failing the run or paying for another round trip. A
+truncated array is not repaired: the events after the cut would look
+deleted, so it is reported as unusable and the caller falls back. Responses
+that needed repair are counted so the invalid-response rate shows up in the
+run metrics.
+"""
+import json
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+_TIME_PATTERN = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?(?::\d{2})?\s*([AaPp])?\.?[Mm]?\.?$")
+_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d")
+
+
+def event_schema(include_date: bool = True, include_page_id: bool = False) -> dict:
+    """
+    Build the schema for one extracted event (OpenAPI subset understood by Gemini).
+    Args:
+        include_date: Whether the model must return the event date (not needed for day tiles)
+        include_page_id: Whether the model must tag the event with its page id (multi-page requests)
+    Returns:
+        Object schema dict
+    """
+    properties = {
+        "title": {"type": "string"},
+        "start_time": {"type": "string", "description": "HH:MM, 24-hour"},
+        "end_time": {"type": "string", "description": "HH:MM, 24-hour"},
+        "location": {"type": "string", "nullable": True},
+        "description": {"type": "string", "nullable": True},
+    }
+    required = ["title", "start_time", "end_time"]
+    if include_date:
+        properties["date"] = {"type": "string", "description": "YYYY-MM-DD"}
+        required.append("date")
+    if include_page_id:
+        properties["page_id"] = {"type": "string"}
+        required.append("page_id")
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def response_generation_config(include_date: bool = True, include_page_id: bool = False) -> dict:
+    """
+    Build the generation config requesting a JSON array of events.
+    Args:
+        include_date: See event_schema()
+        include_page_id: See event_schema()
+    Returns:
+        generation_config dict for generate_content()
+    """
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": {"type": "array", "items": event_schema(include_date, include_page_id)},
+    }
+
+
+def normalize_time(value) -> Optional[str]:
+    """
+    Normalize a time to HH:MM (24-hour).
+    Args:
+        value: e.g. "09:00", "9:00", "09:00:00", "9:30 PM", "2pm", "14.30"
+    Returns:
+        "HH:MM", or None if the value is not a recognizable time
+    """
+    if not isinstance(value, str):
+        return None
+    match = _TIME_PATTERN.match(value.strip())
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == "p" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def normalize_date(value) -> Optional[str]:
+    """
+    Normalize a date to YYYY-MM-DD.
+    Args:
+        value: e.g. "2025-10-27", "2025/10/27", "2025-10-27T09:00:00"
+    Returns:
+        "YYYY-MM-DD", or None if the value is not a recognizable date
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip().split("T")[0].split(" ")[0]
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def repair_event(item, require_date: bool = True, require_page_id: bool = False) -> Tuple[Optional[dict], bool]:
+    """
+    Validate one event object against the schema, fixing minor defects.
+    Args:
+        item: Decoded event object from the response
+        require_date: Whether a valid date is required
+        require_page_id: Whether a page id is required
+    Returns:
+        (clean event dict or None if unusable, True if anything had to be changed)
+    """
+    if not isinstance(item, dict):
+        return None, True
+    title = item.get("title")
+    if not isinstance(title, str) or not title.strip():
+        return None, True
+    clean = {"title": title.strip()}
+    for field_name in ("start_time", "end_time"):
+        clean[field_name] = normalize_time(item.get(field_name))
+        if clean[field_name] is None:
+            return None, True
+    if require_date or "date" in item:
+        clean["date"] = normalize_date(item.get("date"))
+        if clean["date"] is None:
+            if require_date:
+                return None, True
+            del clean["date"]
+    if require_page_id or "page_id" in item:
+        if item.get("page_id") is None:
+            return None, True
+        clean["page_id"] = str(item["page_id"]).strip()
+    for field_name in ("location", "description"):
+        value = item.get(field_name)
+        if isinstance(value, str) and value.strip():
+            clean[field_name] = value.strip()
+        elif value not in (None, ""):
+            clean[field_name] = str(value)
+
+    changed = any(clean.get(key) != item.get(key) for key in clean) or set(item) - set(clean) - {"location", "description"}
+    return clean, bool(changed)
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+def decode_event_array(text: str) -> Tuple[list, bool]:
+    """
+    Decode a response into a list of objects, repairing the envelope if needed.
+    Args:
+        text: Raw response text
+    Returns:
+        (list of decoded items, True if the text was not a bare JSON array)
+    Raises:
+        json.JSONDecodeError if nothing usable can be recovered
+    """
+    try:
+        data = json.loads(text)
+        repaired = False
+    except json.JSONDecodeError as error:
+        data, repaired = _recover_json(text, error), True
+
+    if isinstance(data, list):
+        return data, repaired
+    if isinstance(data, dict):
+        # {"events": [...]} or a single bare event object
+        lists = [value for value in data.values() if isinstance(value, list)]
+        return (lists[0] if len(lists) == 1 else [data]), True
+    raise json.JSONDecodeError("Response is not a JSON array", text, 0)
+
+
+def _recover_json(text: str, error: json.JSONDecodeError):
+    """Try progressively stronger repairs on text that failed to decode."""
+    candidate = _strip_fences(text)
+    candidate = re.sub(r",\s*([\]}])", r"\1", candidate)  # trailing commas
+    start, end = candidate.find("["), candidate.rfind("]")
+    if start != -1 and end > start:
+        try:
+            return json.loads(candidate[start:end + 1])
+        except json.JSONDecodeError:
+            pass
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        # Including a truncated array: its completed objects are not the whole calendar
+        raise error
+
+
+def parse_event_response(text: str, require_date: bool = True, require_page_id: bool = False) -> List[dict]:
+    """
+    Parse and validate a Gemini response into clean event dicts.
+
+    Records gemini.responses for every response, gemini.responses_invalid
+    for those that did not match the schema as sent (whether repaired or
+    not) and gemini.responses_unusable for those nothing could be recovered from.
+
+    Args:
+        text: Raw response text
+        require_date: Whether every event must carry a date
+        require_page_id: Whether every event must carry a page id
+    Returns:
+        List of event dicts that satisfy the schema
+    Raises:
+        json.JSONDecodeError if the response cannot be decoded at all
+    """
+    metrics.incr("gemini.responses")
+    try:
+        items, repaired = decode_event_array(text)
+    except json.JSONDecodeError:
+        metrics.incr("gemini.responses_invalid")
+        metrics.incr("gemini.responses_unusable")
+        raise
+
+    events, dropped = [], 0
+    for item in items:
+        clean, changed = repair_event(item, require_date, require_page_id)
+        repaired = repaired or changed
+        if clean is None:
+            dropped += 1
+            logger.warning(f"Dropping Gemini event that does not match the schema: {item}")
+            continue
+        events.append(clean)
+
+    if repaired:
+        metrics.incr("gemini.responses_invalid")
+        logger.info(
+            f"Repaired Gemini response locally ({len(events)} events kept, {dropped} dropped); "
+            f"invalid response rate this run: {metrics.ratio('gemini.responses_invalid', 'gemini.responses'):.0%}"
+        )
+    return events
@@ -0,0 +1,123 @@
+"""
+Local stand-in for the Gemini GenerativeModel.
+
+Lets GeminiSession and everything built on it run offline (tests,
+benchmarks, dry runs without an API key). Responses are canned or
+computed from the request, and latency and rate limiting can be simulated.
+"""
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Iterator, List, Optional
+
+from google.api_core.exceptions import ResourceExhausted
+
+
+class StandInResponse:
+    """Minimal stand-in for a GenerateContentResponse"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LocalStandInModel:
+    """
+    Offline drop-in for genai.GenerativeModel.
+
+    Tracks the number of calls and the peak number of concurrent calls so
+    tests can check concurrency limits.
+    """
+
+    def __init__(
+        self,
+        events: Optional[List[dict]] = None,
+        responder: Optional[Callable[[list], str]] = None,
+        latency: float = 0.0,
+        rate_limit_failures: int = 0,
+        retry_after: Optional[float] = None,
+        chunk_size: int = 40,
+        fail_after_chunks: Optional[int] = None,
+    ):
+        """
+        Initialize the stand-in.
+
+        Args:
+            events: Event dicts returned (as a JSON array) for every request
+            responder: Callable computing the response text from the request contents;
+                takes precedence over `events`
+            latency: Seconds each call takes
+            rate_limit_failures: Number of initial calls that fail with HTTP 429
+            retry_after: Retry-After seconds attached to simulated rate-limit errors
+            chunk_size: Characters per chunk when streaming
+            fail_after_chunks: If set, a streamed response breaks off with an error after
+                this many chunks
+        """
+        self.events = events or []
+        self.responder = responder
+        self.latency = latency
+        self.rate_limit_failures = rate_limit_failures
+        self.retry_after = retry_after
+        self.chunk_size = chunk_size
+        self.fail_after_chunks = fail_after_chunks
+        self.calls = 0
+        self.requests: List[list] = []
+        self.generation_configs: List[Optional[dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _start(self, contents: list, generation_config: Optional[dict] = None) -> Optional[Exception]:
+        with self._lock:
+            self.calls += 1
+            self.requests.append(contents)
+            self.generation_configs.append(generation_config)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.rate_limit_failures > 0:
+                self.rate_limit_failures -= 1
+                error = ResourceExhausted("Resource has been exhausted (stand-in)")
+                error.retry_after = self.retry_after
+                return error
+        return None
+
+    def _end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _respond(self, contents: list) -> StandInResponse:
+        if self.responder is not None:
+            return StandInResponse(self.responder(contents))
+        return StandInResponse(json.dumps(self.events))
+
+    def _stream(self, text: str) -> Iterator[StandInResponse]:
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        for index, chunk in enumerate(chunks):
+            if self.fail_after_chunks is not None and index >= self.fail_after_chunks:
+                raise ConnectionError("Stream interrupted (stand-in)")
+            yield StandInResponse(chunk)
+
+    def generate_content(self, contents, stream: bool = False, **kwargs):
+        """Synchronous generate_content(); returns an iterator of chunks if stream=True"""
+        error = self._start(contents, kwargs.get("generation_config"))
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if error is not None:
+                raise error
+            response = self._respond(contents)
+            return self._stream(response.text) if stream else response
+        finally:
+            self._end()
+
+    async def generate_content_async(self, contents, **kwargs) -> StandInResponse:
+        """Asynchronous generate_content()"""
+        error = self._start(contents, kwargs.get("generation_config"))
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if error is not None:
+                raise error
+            return self._respond(contents)
+        finally:
+            self._end()
@@ -0,0 +1,135 @@
+"""
+Split a calendar capture into per-day tiles for Gemini.
+
+In the Work Week list layout each day starts with a date header row
+("Monday, October 27") followed by that day's events. Finding the header
+rows lets us cut the capture into one horizontal tile per day, which can be
+sent to Gemini as concurrent requests with a short, day-scoped prompt.
+"""
+from dataclasses import dataclass
+from typing import Callable, List, Sequence, Tuple
+
+from PIL import Image
+import pytesseract
+
+from src.ocr_processor import parse_date_row
+
+# Words left of this x belong to the narrow date column (day number, weekday)
+DATE_COLUMN_WIDTH = 60
+
+# An OCR text line: (top y, [(left x, word), ...]) in full-image coordinates
+TextLine = Tuple[int, List[Tuple[int, str]]]
+
+
+@dataclass
+class DateHeader:
+    """
+    A date header row found in a capture.
+    Attributes:
+        date: Date shown in the header (YYYY-MM-DD).
+        top: Top y coordinate of the header row.
+    """
+    date: str
+    top: int
+
+
+@dataclass
+class DayTile:
+    """
+    The part of a capture that belongs to one day.
+    Attributes:
+        date: Date of the day (YYYY-MM-DD).
+        image: Crop holding the day's header and events.
+        box: (left, top, right, bottom) of the crop in the source image.
+    """
+    date: str
+    image: Image.Image
+    box: Tuple[int, int, int, int]
+
+
+def ocr_text_lines(img: Image.Image, scale: float = 0.5) -> List[TextLine]:
+    """
+    Read text lines with Tesseract from a downsampled grayscale copy.
+
+    Header rows are large, so a half-size image is enough to read them and
+    OCR runs several times faster than on the full capture.
+
+    Args:
+        img: Calendar capture
+        scale: Downsampling factor applied before OCR
+    Returns:
+        Text lines, top to bottom, in full-image coordinates
+    """
+    small = img.convert('L')
+    if scale != 1:
+        small = small.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))), Image.LANCZOS)
+    data = pytesseract.image_to_data(small, config=r'--oem 3 --psm 6', output_type=pytesseract.Output.DICT)
+
+    lines = {}
+    for i, word in enumerate(data['text']):
+        word = word.strip()
+        if not word:
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        top = int(data['top'][i] / scale)
+        left = int(data['left'][i] / scale)
+        line = lines.setdefault(key, [top, []])
+        line[0] = min(line[0], top)
+        line[1].append((left, word))
+    return sorted((top, sorted(words)) for top, words in lines.values())
+
+
+def find_date_headers(
+    img: Image.Image,
+    year: int,
+    read_lines: Callable[[Image.Image], Sequence[TextLine]] = ocr_text_lines,
+) -> List[DateHeader]:
+    """
+    Locate the date header rows in a capture.
+
+    A line is a header if its full text, or its text without the date
+    column, parses as a date (the same rule the OCR path uses).
+
+    Args:
+        img: Calendar capture
+        year: Year to assume for the headers
+        read_lines: OCR function returning the capture's text lines
+    Returns:
+        Headers ordered top to bottom, one per date
+    """
+    headers = []
+    seen = set()
+    for top, words in sorted(read_lines(img)):
+        full_text = ' '.join(word for _, word in words).strip()
+        date = parse_date_row(full_text, year)
+        if date is None:
+            event_text = ' '.join(word for x, word in words if x >= DATE_COLUMN_WIDTH).strip()
+            date = parse_date_row(event_text, year)
+        if date is None or date in seen:
+            continue
+        seen.add(date)
+        headers.append(DateHeader(date, top))
+    return headers
+
+
+def split_into_day_tiles(img: Image.Image, headers: Sequence[DateHeader], margin: int = 4) -> List[DayTile]:
+    """
+    Cut a capture into one tile per date header.
+
+    Each tile runs from just above its header to just above the next one;
+    the first tile starts at the top of the image so nothing is dropped.
+
+    Args:
+        img: Calendar capture
+        headers: Date headers ordered top to bottom
+        margin: Pixels kept above each header
+    Returns:
+        Day tiles in header order
+    """
+    tiles = []
+    for i, header in enumerate(headers):
+        top = 0 if i == 0 else max(0, header.top - margin)
+        bottom = img.height if i == len(headers) - 1 else max(top + 1, headers[i + 1].top - margin)
+        box = (0, top, img.width, bottom)
+        tiles.append(DayTile(header.date, img.crop(box), box))
+    return tiles
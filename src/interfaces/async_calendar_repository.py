@@ -0,0 +1,134 @@
+"""
+Abstract interface for asyncio calendar repositories.
+Mirrors ICalendarRepository so async and blocking code can share services.
+"""
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, Optional, TypeVar
+
+from src.interfaces.calendar_repository import ICalendarRepository
+
+T = TypeVar("T")
+
+
+class IAsyncCalendarRepository(ABC):
+    """Interface for calendar data storage accessed with asyncio"""
+
+    @abstractmethod
+    async def get_events(self) -> Dict[str, Any]:
+        """
+        Fetch all events from the calendar.
+
+        Returns:
+            Dictionary mapping event identifiers to event objects
+        """
+        pass
+
+    @abstractmethod
+    async def get_events_in_range(self, start: Optional[datetime], end: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Fetch the events overlapping [start, end).
+
+        Args:
+            start: Range start (timezone-aware), or None for unbounded
+            end: Range end (timezone-aware), or None for "everything after start"
+
+        Returns:
+            Dictionary mapping event identifiers to event objects
+        """
+        pass
+
+    @abstractmethod
+    def get_events_by_href(self, hrefs: Iterable[str]) -> AsyncIterator[Any]:
+        """
+        Fetch events whose identifiers are already known, yielding them as they arrive.
+
+        Args:
+            hrefs: Event identifiers
+
+        Returns:
+            Async iterator of (identifier, event object) pairs
+        """
+        pass
+
+    @abstractmethod
+    async def put_event(self, uid: str, ical_data: str) -> Any:
+        """
+        Create or update an event in the calendar.
+
+        Args:
+            uid: Unique identifier for the event
+            ical_data: iCalendar formatted event data
+
+        Returns:
+            True (or a truthy result object) if successful, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def delete_event(self, event_id: str) -> bool:
+        """
+        Delete an event from the calendar.
+
+        Args:
+            event_id: Unique identifier for the event
+
+        Returns:
+            True if successful, False otherwise
+        """
+        pass
+
+    async def close(self):
+        """Release network resources."""
+
+
+class SyncCalendarRepositoryAdapter(ICalendarRepository):
+    """
+    Blocking ICalendarRepository backed by an IAsyncCalendarRepository.
+
+    The async repository runs on a private event loop in a background
+    thread, so existing blocking callers (and several threads at once, e.g.
+    a write pool) can use it unchanged while its requests share connections.
+    """
+
+    def __init__(self, repository: IAsyncCalendarRepository):
+        """
+        Args:
+            repository: Async repository to wrap
+        """
+        self.repository = repository
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="calendar-repo-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self, coroutine: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def get_events(self) -> Dict[str, Any]:
+        return self._run(self.repository.get_events())
+
+    def get_events_in_range(self, start: Optional[datetime], end: Optional[datetime] = None) -> Dict[str, Any]:
+        return self._run(self.repository.get_events_in_range(start, end))
+
+    def get_events_by_href(self, hrefs: Iterable[str]) -> Dict[str, Any]:
+        """Fetch events by identifier (collected into a dict)."""
+        async def collect():
+            return {href: event async for href, event in self.repository.get_events_by_href(hrefs)}
+        return self._run(collect())
+
+    def put_event(self, uid: str, ical_data: str):
+        return self._run(self.repository.put_event(uid, ical_data))
+
+    def delete_event(self, event_id: str) -> bool:
+        return self._run(self.repository.delete_event(event_id))
+
+    def close(self):
+        """Close the async repository and stop the background loop."""
+        if not self._loop.is_running():
+            return
+        self._run(self.repository.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -3,7 +3,8 @@ Abstract interface for calendar repositories.
 Follows the Dependency Inversion Principle.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Optional
 from src.models.calendar_data import ParsedEvent
 
 
@@ -20,6 +21,23 @@ class ICalendarRepository(ABC):
         """
         pass
     
+    def get_events_in_range(self, start: Optional[datetime], end: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Fetch the events overlapping [start, end).
+        
+        Repositories that can filter on the server override this; the
+        default fetches everything and filters client-side.
+        
+        Args:
+            start: Range start (timezone-aware), or None for unbounded
+            end: Range end (timezone-aware), or None for "everything after start"
+            
+        Returns:
+            Dictionary mapping event identifiers to event objects
+        """
+        from src.utils.ical_times import filter_events_in_range
+        return filter_events_in_range(self.get_events(), start, end)
+    
     @abstractmethod
     def put_event(self, uid: str, ical_data: str) -> bool:
         """
@@ -30,7 +48,7 @@ class ICalendarRepository(ABC):
             ical_data: iCalendar formatted event data
             
         Returns:
-            True if successful, False otherwise
+            True (or a truthy result object) if successful, False otherwise
         """
         pass
     
@@ -46,3 +64,11 @@ class ICalendarRepository(ABC):
             True if successful, False otherwise
         """
         pass
+    
+    def save_state(self):
+        """
+        Persist any local state kept for the calendar once a run's writes are done.
+        
+        Repositories that keep a local copy of the calendar override this;
+        the default does nothing.
+        """
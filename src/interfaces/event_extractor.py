@@ -2,11 +2,33 @@
 Abstract interface for event extraction services.
 Follows the Dependency Inversion Principle.
 """
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
 from src.models.calendar_data import ParsedEvent
 
 
+class IncompleteExtractionError(RuntimeError):
+    """
+    A streaming extraction stopped before the end of the response.
+
+    Raised after the events that were complete have been yielded. Those
+    events are valid, but events missing from the result may simply not have
+    arrived, so callers must not treat their absence as a deletion.
+
+    Attributes:
+        events: Events completed before the stream stopped, for callers that
+            collect the stream into a list rather than iterating it.
+    """
+
+    def __init__(self, message: str, events=None):
+        super().__init__(message)
+        self.events = list(events or [])
+
+
 class IEventExtractor(ABC):
     """Interface for extracting calendar events from various sources"""
     
@@ -22,6 +44,25 @@ class IEventExtractor(ABC):
             List of parsed calendar events
         """
         pass
+    
+    def iter_events(self, image_path: str) -> Iterator[ParsedEvent]:
+        """
+        Yield calendar events from an image as they become available.
+        
+        Extractors that can stream (e.g. Gemini) override this; the default
+        simply yields the result of extract_events().
+        
+        Args:
+            image_path: Path to the screenshot/image file
+            
+        Yields:
+            Parsed calendar events
+            
+        Raises:
+            IncompleteExtractionError if the stream stopped part-way (after
+            yielding the events that were complete)
+        """
+        yield from self.extract_events(image_path)
 
 
 class OCREventExtractor(IEventExtractor):
@@ -36,19 +77,70 @@ class OCREventExtractor(IEventExtractor):
 class GeminiEventExtractor(IEventExtractor):
     """Extract events using Gemini Vision API"""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        session=None,
+        cache=None,
+        bypass_cache: bool = False,
+        tiled: bool = False,
+    ):
         """
         Initialize the Gemini event extractor.
         
         Args:
             api_key: Google Gemini API key
+            session: GeminiSession to use (default: the shared session for api_key)
+            cache: Optional GeminiResponseCache for extractions
+            bypass_cache: If True, always call the API (fresh results are still cached)
+            tiled: If True, send one concurrent request per day tile instead of the whole capture
         """
         self.api_key = api_key
+        self._session = session
+        self.cache = cache
+        self.bypass_cache = bypass_cache
+        self.tiled = tiled
+    
+    @property
+    def session(self):
+        """The GeminiSession holding the configured model, created on first use"""
+        if self._session is None:
+            from src.gemini_extractor import get_gemini_session
+            self._session = get_gemini_session(self.api_key)
+        return self._session
     
     def extract_events(self, image_path: str) -> List[ParsedEvent]:
         """Extract events using Gemini Vision API"""
-        from src.gemini_extractor import extract_events_with_gemini
-        return extract_events_with_gemini(image_path, self.api_key)
+        if self.tiled:
+            return self.session.extract_tiled(image_path, cache=self.cache, bypass_cache=self.bypass_cache)
+        return self.session.extract(image_path, cache=self.cache, bypass_cache=self.bypass_cache)
+    
+    def iter_events(self, image_path: str) -> Iterator[ParsedEvent]:
+        """Stream events from Gemini as soon as each one is complete"""
+        if self.tiled:
+            # Tiles are answered concurrently, so there is no single stream to follow
+            yield from self.extract_events(image_path)
+            return
+        yield from self.session.iter_events(image_path, cache=self.cache, bypass_cache=self.bypass_cache)
+    
+    def extract_events_batch(self, image_paths: List[str]) -> List[List[ParsedEvent]]:
+        """Extract events from several images concurrently (bounded by the session's limit)"""
+        return self.session.extract_batch_sync(image_paths, cache=self.cache, bypass_cache=self.bypass_cache)
+    
+    def extract_events_pages(self, image_paths: List[str], max_payload_bytes: Optional[int] = None) -> Dict[str, List[ParsedEvent]]:
+        """
+        Extract events from several pages packed into as few requests as possible.
+        
+        Args:
+            image_paths: Screenshot paths, one per page
+            max_payload_bytes: Maximum image bytes per request (default: the extractor module's limit)
+            
+        Returns:
+            Screenshot path -> events found on that page
+        """
+        kwargs = {"max_payload_bytes": max_payload_bytes} if max_payload_bytes else {}
+        pages = {path: path for path in image_paths}
+        return self.session.extract_pages(pages, cache=self.cache, bypass_cache=self.bypass_cache, **kwargs)
 
 
 class FallbackEventExtractor(IEventExtractor):
@@ -74,3 +166,165 @@ class FallbackEventExtractor(IEventExtractor):
             return self.primary.extract_events(image_path)
         except Exception:
             return self.fallback.extract_events(image_path)
+    
+    def iter_events(self, image_path: str) -> Iterator[ParsedEvent]:
+        """Stream from primary; fall back only if it fails before producing any event"""
+        produced = False
+        try:
+            for event in self.primary.iter_events(image_path):
+                produced = True
+                yield event
+        except Exception:
+            if produced:
+                raise
+            yield from self.fallback.iter_events(image_path)
+
+
+def events_look_valid(events: List[ParsedEvent]) -> bool:
+    """
+    Default sanity check for a hedged extraction result.
+    
+    The result must be non-empty and every event must have a title and
+    parseable ISO start/end times with the start not after the end.
+    """
+    if not events:
+        return False
+    for event in events:
+        try:
+            start = datetime.fromisoformat(event.start_datetime)
+            end = datetime.fromisoformat(event.end_datetime)
+        except (TypeError, ValueError):
+            return False
+        if not event.title or start > end:
+            return False
+    return True
+
+
+@dataclass
+class HedgeReport:
+    """
+    Outcome of one hedged extraction.
+    
+    Attributes:
+        winner: Name of the extractor whose result was used.
+        primary_seconds: Time the primary took, or None if it had not finished when we returned.
+        fallback_seconds: Time the fallback took, or None if it had not finished when we returned.
+        primary_error: Why the primary result was rejected (error or failed validation), if it was.
+    """
+    winner: str
+    primary_seconds: Optional[float] = None
+    fallback_seconds: Optional[float] = None
+    primary_error: Optional[str] = None
+
+
+class HedgedEventExtractor(IEventExtractor):
+    """
+    Race a primary extractor (Gemini) against a fallback (OCR).
+    
+    Both start at once. The primary result is used if it arrives within
+    the latency budget and passes validation; otherwise the fallback's
+    result is used. Whichever result is no longer needed is cancelled if
+    it has not started yet, or otherwise left to finish in the background
+    and discarded (a running API call or Tesseract process cannot be
+    interrupted safely).
+    """
+    
+    def __init__(
+        self,
+        primary: IEventExtractor,
+        fallback: IEventExtractor,
+        budget_seconds: float = 20.0,
+        validator: Callable[[List[ParsedEvent]], bool] = events_look_valid,
+        primary_name: str = "gemini",
+        fallback_name: str = "ocr",
+    ):
+        """
+        Initialize the hedged extractor.
+        
+        Args:
+            primary: Preferred extractor (usually Gemini)
+            fallback: Extractor started in parallel (usually OCR)
+            budget_seconds: How long to wait for the primary before using the fallback
+            validator: Returns True if a primary result is acceptable
+            primary_name: Name of the primary, used in reports and metrics
+            fallback_name: Name of the fallback, used in reports and metrics
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.budget_seconds = budget_seconds
+        self.validator = validator
+        self.primary_name = primary_name
+        self.fallback_name = fallback_name
+        self.last_report: Optional[HedgeReport] = None
+    
+    def extract_events(self, image_path: str) -> List[ParsedEvent]:
+        """Run both extractors concurrently and return the preferred acceptable result"""
+        started = time.monotonic()
+        durations = {}
+        
+        def timed(name, extractor):
+            try:
+                return extractor.extract_events(image_path)
+            finally:
+                durations[name] = time.monotonic() - started
+        
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedged-extract")
+        primary_future = executor.submit(timed, self.primary_name, self.primary)
+        fallback_future = executor.submit(timed, self.fallback_name, self.fallback)
+        primary_error = None
+        primary_timed_out = False
+        try:
+            try:
+                events = primary_future.result(timeout=self.budget_seconds)
+                if self.validator(events):
+                    fallback_future.cancel()
+                    return self._finish(self.primary_name, events, durations, None)
+                primary_error = "result failed validation"
+            except FutureTimeoutError:
+                primary_timed_out = True
+                primary_error = f"no result within {self.budget_seconds:.1f}s budget"
+            except Exception as e:
+                primary_error = str(e) or type(e).__name__
+            
+            try:
+                events = fallback_future.result()
+            except Exception as fallback_exc:
+                # Fallback failed too: a late but valid primary result is better than nothing
+                if not primary_timed_out:
+                    raise
+                try:
+                    late = primary_future.result()
+                except Exception:
+                    raise fallback_exc
+                if not self.validator(late):
+                    raise
+                return self._finish(self.primary_name, late, durations, primary_error)
+            primary_future.cancel()
+            return self._finish(self.fallback_name, events, durations, primary_error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _finish(self, winner: str, events: List[ParsedEvent], durations: dict, primary_error: Optional[str]):
+        from src.utils.logger import logger
+        from src.utils.metrics import metrics
+        
+        report = HedgeReport(
+            winner=winner,
+            primary_seconds=durations.get(self.primary_name),
+            fallback_seconds=durations.get(self.fallback_name),
+            primary_error=primary_error,
+        )
+        self.last_report = report
+        metrics.incr(f"hedge.winner.{winner}")
+        for name, seconds in ((self.primary_name, report.primary_seconds), (self.fallback_name, report.fallback_seconds)):
+            if seconds is not None:
+                metrics.observe(f"hedge.{name}_seconds", seconds)
+        
+        def fmt(seconds):
+            return f"{seconds:.2f}s" if seconds is not None else "still running"
+        reason = f" ({self.primary_name} rejected: {primary_error})" if primary_error else ""
+        logger.info(
+            f"Hedged extraction: {winner} won{reason}; "
+            f"{self.primary_name} {fmt(report.primary_seconds)}, {self.fallback_name} {fmt(report.fallback_seconds)}"
+        )
+        return events
@@ -0,0 +1,64 @@
+"""
+Abstract interface for screen frame sources.
+Follows the Dependency Inversion Principle.
+"""
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+from PIL import Image
+
+
+class IFrameSource(ABC):
+    """Interface for grabbing small frames of the calendar region"""
+
+    @abstractmethod
+    def grab_frame(self) -> Image.Image:
+        """
+        Grab the current frame.
+
+        Returns:
+            A (downsampled) image of the watched screen region
+        """
+        pass
+
+
+class ScreenFrameSource(IFrameSource):
+    """Grab downsampled frames of the Outlook calendar region straight from the screen"""
+
+    def __init__(self, scale: int = 8):
+        """
+        Initialize the screen frame source.
+
+        Args:
+            scale: Downsampling factor applied to each dimension
+        """
+        self.scale = scale
+
+    def grab_frame(self) -> Image.Image:
+        """Capture the calendar region of the screen"""
+        from src.outlook_automation import grab_downsampled_frame
+        return grab_downsampled_frame(scale=self.scale)
+
+
+class SequenceFrameSource(IFrameSource):
+    """
+    Replay a fixed sequence of frames (for tests and offline tuning).
+    Once the sequence is exhausted the last frame is repeated.
+    """
+
+    def __init__(self, frames: Iterable[Image.Image]):
+        """
+        Initialize with the frames to replay.
+
+        Args:
+            frames: Frames returned by successive grab_frame() calls
+        """
+        self._frames = iter(frames)
+        self._last: Optional[Image.Image] = None
+
+    def grab_frame(self) -> Image.Image:
+        """Return the next frame in the sequence"""
+        self._last = next(self._frames, self._last)
+        if self._last is None:
+            raise RuntimeError("Frame sequence is empty")
+        return self._last
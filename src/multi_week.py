@@ -0,0 +1,155 @@
+"""
+Multi-week horizon capture and extraction.
+
+Capturing drives the Outlook UI, so each week is captured serially in the
+calling process. Every finished capture is handed to a process pool for
+preprocessing and OCR while the next week is being captured, and the
+per-week results are merged into a single list of events. Metrics recorded
+in the worker processes are sent back with each week's events and merged
+into the parent's run metrics.
+"""
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from src.models.calendar_data import ParsedEvent
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+
+def week_screenshot_path(base_path: str, week_index: int) -> str:
+    """
+    Build the screenshot path for a given week of the horizon.
+
+    Week 0 keeps the base path so single-week runs write the same files as before.
+
+    Args:
+        base_path: Screenshot path for the current week (must end in .png)
+        week_index: Zero-based offset from the current week
+    Returns:
+        Screenshot path for that week
+    """
+    if week_index == 0:
+        return base_path
+    return base_path.replace('.png', f'_w{week_index}.png')
+
+
+def cropped_screenshot_path(screenshot_path: str) -> str:
+    """Return the path capture_screenshot() writes the cropped image to."""
+    return screenshot_path.replace('.png', '_cropped.png')
+
+
+def merge_week_events(per_week_events: List[List[ParsedEvent]]) -> List[ParsedEvent]:
+    """
+    Merge per-week event lists into one list ordered by start time.
+
+    Events visible in more than one capture (same start, end and title) are kept once.
+
+    Args:
+        per_week_events: Parsed events for each captured week, in horizon order
+    Returns:
+        Merged list of ParsedEvent objects
+    """
+    merged = []
+    seen = set()
+    for week_events in per_week_events:
+        for event in week_events:
+            key = (event.start_datetime, event.end_datetime, event.title)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(event)
+    merged.sort(key=lambda e: e.start_datetime)
+    return merged
+
+
+def _extract_in_worker(extract_events: Callable[[str], List[ParsedEvent]], path: str) -> Tuple[List[ParsedEvent], dict]:
+    """
+    Run extraction in a worker process and return its events with the metrics it recorded.
+
+    Worker processes are reused across weeks, so the worker's registry is cleared first.
+    """
+    metrics.reset()
+    events = extract_events(path)
+    return events, metrics.export()
+
+
+def extract_events_over_horizon(
+    weeks: int,
+    capture_week: Callable[[str], bool],
+    advance_week: Callable[[], bool],
+    extract_events: Callable[[str], List[ParsedEvent]],
+    screenshot_path: str = "outlook_calendar_screenshot.png",
+    rewind_week: Optional[Callable[[], bool]] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[ParsedEvent]:
+    """
+    Capture N weeks of the Outlook calendar and extract events from all of them.
+
+    Args:
+        weeks: Number of weeks to capture, starting with the week currently shown
+        capture_week: Callable that captures a screenshot to the given path
+        advance_week: Callable that steps the Outlook view forward one week
+        extract_events: Picklable callable turning a cropped screenshot path into events
+        screenshot_path: Screenshot path for the current week
+        rewind_week: Optional callable stepping the view back one week; used to
+            restore the original view once all weeks are captured
+        max_workers: Worker processes for extraction (default: one per week, capped by the CPU count)
+        executor: Executor to use instead of a new ProcessPoolExecutor
+    Returns:
+        Merged list of ParsedEvent objects for the whole horizon
+    Raises:
+        ValueError if weeks < 1
+        RuntimeError if a capture or view change fails
+    """
+    if weeks < 1:
+        raise ValueError(f"Horizon must be at least one week, got {weeks}")
+
+    if weeks == 1:
+        # Nothing to overlap with: skip the pool start-up cost
+        if not capture_week(screenshot_path):
+            raise RuntimeError("Could not capture screenshot")
+        return extract_events(cropped_screenshot_path(screenshot_path))
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers or min(weeks, os.cpu_count() or 1))
+    # Only worker processes have their own metrics registry to send back
+    in_processes = isinstance(executor, ProcessPoolExecutor)
+
+    futures: List[Future] = []
+    steps_forward = 0
+    try:
+        for week_index in range(weeks):
+            if week_index > 0:
+                if not advance_week():
+                    raise RuntimeError(f"Could not advance Outlook to week {week_index + 1}")
+                steps_forward += 1
+            path = week_screenshot_path(screenshot_path, week_index)
+            logger.info(f"Capturing week {week_index + 1}/{weeks} to {path}...")
+            if not capture_week(path):
+                raise RuntimeError(f"Could not capture screenshot for week {week_index + 1}")
+            cropped_path = cropped_screenshot_path(path)
+            if in_processes:
+                futures.append(executor.submit(_extract_in_worker, extract_events, cropped_path))
+            else:
+                futures.append(executor.submit(extract_events, cropped_path))
+
+        per_week_events = []
+        for week_index, future in enumerate(futures):
+            week_events = future.result()
+            if in_processes:
+                week_events, worker_metrics = week_events
+                metrics.merge(worker_metrics)
+            logger.info(f"Week {week_index + 1}/{weeks}: extracted {len(week_events)} event(s)")
+            per_week_events.append(week_events)
+        return merge_week_events(per_week_events)
+    finally:
+        if rewind_week is not None:
+            for _ in range(steps_forward):
+                if not rewind_week():
+                    logger.warning("Could not restore the original Outlook calendar week")
+                    break
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
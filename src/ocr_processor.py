@@ -10,6 +10,33 @@ from src.utils.logger import logger
 from src.models.calendar_data import ParsedEvent
 
 
+# Match both "Monday, October 27" and "October 28" (with or without day of week)
+DATE_ROW_PATTERN = re.compile(r"^(?:(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+)?[A-Za-z]+\s+\d{1,2}$")
+
+
+def parse_date_row(row_text: str, year: int) -> str | None:
+    """
+    Parse an Outlook date header row into a YYYY-MM-DD string.
+    Args:
+        row_text: Row text, e.g. "Monday, October 27" or "October 28"
+        year: Year to assume, since headers do not show it
+    Returns:
+        Date string, or None if the row is not a parseable date header
+    """
+    if not DATE_ROW_PATTERN.match(row_text):
+        return None
+    try:
+        # Try parsing with day of week first: "Monday, October 27"
+        return datetime.strptime(f"{row_text} {year}", "%A, %B %d %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+    try:
+        # Fallback: parse without day of week: "October 28"
+        return datetime.strptime(f"{row_text} {year}", "%B %d %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
 def _is_location_line(line: str) -> bool:
     """
     Heuristic to determine if a line is likely a location (e.g., room, office).
@@ -321,8 +348,7 @@ def process_image_with_ocr(image_path: str):
     # - Event title: text before time or "All day event"
     # - Discard trailing text after time
 
-    # Match both "Monday, October 27" and "October 28" (with or without day of week)
-    date_row_pattern = re.compile(r"^(?:(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+)?[A-Za-z]+\s+\d{1,2}$")
+    date_row_pattern = DATE_ROW_PATTERN
     time_range_pattern = re.compile(r"(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})")
     all_day_pattern = re.compile(r"All day event", re.IGNORECASE)
     
@@ -334,20 +360,13 @@ def process_image_with_ocr(image_path: str):
         # Check for date row
         if date_row_pattern.match(row_text_full):
             logger.info(f"Date row detected: {row_text_full}")
-            # Parse date, always specify year to avoid ambiguity
-            try:
-                # Assume current year if not present
-                current_year = datetime.now().year
-                # Try parsing with day of week first: "Monday, October 27"
-                try:
-                    current_date_str = datetime.strptime(f"{row_text_full} {current_year}", "%A, %B %d %Y").strftime("%Y-%m-%d")
-                except ValueError:
-                    # Fallback: parse without day of week: "October 28"
-                    current_date_str = datetime.strptime(f"{row_text_full} {current_year}", "%B %d %Y").strftime("%Y-%m-%d")
-            except Exception as e:
+            # Parse date, assuming the current year since headers do not show it
+            parsed_date = parse_date_row(row_text_full, datetime.now().year)
+            if parsed_date is None:
                 # Fallback: ignore date row if can't parse
-                logger.warning(f"Could not parse date from row '{row_text_full}': {e}")
+                logger.warning(f"Could not parse date from row '{row_text_full}'")
                 continue
+            current_date_str = parsed_date
             continue
 
         # Only parse event rows if we have a current date
@@ -377,20 +396,12 @@ def process_image_with_ocr(image_path: str):
         # Check if filtered text is also a date row (e.g., "October 28" after filtering)
         if date_row_pattern.match(row_text):
             logger.info(f"Date row detected (after filtering): {row_text}")
-            # Parse date, always specify year to avoid ambiguity
-            try:
-                # Assume current year if not present
-                current_year = datetime.now().year
-                # Try parsing with day of week first: "Monday, October 27"
-                try:
-                    current_date_str = datetime.strptime(f"{row_text} {current_year}", "%A, %B %d %Y").strftime("%Y-%m-%d")
-                except ValueError:
-                    # Fallback: parse without day of week: "October 28"
-                    current_date_str = datetime.strptime(f"{row_text} {current_year}", "%B %d %Y").strftime("%Y-%m-%d")
-            except Exception as e:
+            parsed_date = parse_date_row(row_text, datetime.now().year)
+            if parsed_date is None:
                 # Fallback: ignore date row if can't parse
-                logger.warning(f"Could not parse date from filtered row '{row_text}': {e}")
+                logger.warning(f"Could not parse date from filtered row '{row_text}'")
                 continue
+            current_date_str = parsed_date
             continue
 
         # Check for time range or all day event
@@ -1,8 +1,81 @@
 import subprocess
-import time
 import os
 import objc
-from AppKit import NSWorkspace
+import Quartz
+from AppKit import NSScreen, NSWorkspace
+from PIL import Image
+
+from src.readiness import wait_until, wait_for_stable_frame, wait_for_calendar_ready
+
+OUTLOOK_BUNDLE_ID = "com.microsoft.Outlook"
+
+# Region of the screen holding the calendar list (matches the capture_screenshot crop)
+CALENDAR_REGION = (110, 240, 2500, 1830)
+
+
+def is_outlook_running() -> bool:
+    """Return True if Outlook is among the running applications."""
+    running_apps = NSWorkspace.sharedWorkspace().runningApplications()
+    return any(app.bundleIdentifier() == OUTLOOK_BUNDLE_ID for app in running_apps)
+
+
+def is_outlook_frontmost() -> bool:
+    """Return True if Outlook is the frontmost application."""
+    app = NSWorkspace.sharedWorkspace().frontmostApplication()
+    return app is not None and app.bundleIdentifier() == OUTLOOK_BUNDLE_ID
+
+
+def is_calendar_view_visible() -> bool:
+    """Return True if Outlook's front window is showing the calendar."""
+    script = 'tell application "System Events" to get name of front window of process "Microsoft Outlook"'
+    result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True, timeout=2)
+    return result.returncode == 0 and "calendar" in result.stdout.lower()
+
+
+def grab_downsampled_frame(region: tuple = CALENDAR_REGION, scale: int = 8) -> Image.Image:
+    """
+    Capture a small grayscale frame of a screen region, for cheap change detection.
+
+    Only the region is captured, in memory and at nominal (non-Retina)
+    resolution, so a readiness poll costs a fraction of a full-screen
+    screencapture written to disk.
+    Args:
+        region: (left, top, width, height) in screenshot pixels
+        scale: Downsampling factor applied to each dimension
+    Returns:
+        Grayscale PIL image
+    Raises:
+        RuntimeError if the screen could not be captured
+    """
+    left, top, width, height = region
+    # Screenshot pixels are backing pixels; Quartz takes the rectangle in points
+    backing = NSScreen.mainScreen().backingScaleFactor() or 1.0
+    rect = Quartz.CGRectMake(left / backing, top / backing, width / backing, height / backing)
+    image = Quartz.CGWindowListCreateImage(
+        rect, Quartz.kCGWindowListOptionOnScreenOnly, Quartz.kCGNullWindowID,
+        Quartz.kCGWindowImageNominalResolution,
+    )
+    if image is None:
+        raise RuntimeError("Could not capture the calendar region")
+    size = (Quartz.CGImageGetWidth(image), Quartz.CGImageGetHeight(image))
+    pixels = bytes(Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image)))
+    frame = Image.frombuffer("RGBA", size, pixels, "raw", "BGRA", Quartz.CGImageGetBytesPerRow(image), 1)
+    # Same frame size as reducing the full-resolution region, whatever the display's scale
+    target = (max(1, -(-width // scale)), max(1, -(-height // scale)))
+    return frame.convert('L').resize(target, Image.Resampling.BOX)
+
+
+def wait_for_outlook_calendar(timeout: float = 10.0) -> bool:
+    """
+    Wait until Outlook is frontmost with a settled calendar view.
+    Args:
+        timeout: Overall deadline in seconds
+    Returns:
+        True if Outlook is ready, False if the deadline passed first
+    """
+    return wait_for_calendar_ready(
+        is_outlook_frontmost, grab_downsampled_frame, is_calendar_view_visible, timeout=timeout
+    )
 
 
 def launch_outlook() -> bool:
@@ -15,7 +88,7 @@ def launch_outlook() -> bool:
         # Check if Outlook is already running
         running_apps = NSWorkspace.sharedWorkspace().runningApplications()
         for app in running_apps:
-            if app.bundleIdentifier() == "com.microsoft.Outlook":
+            if app.bundleIdentifier() == OUTLOOK_BUNDLE_ID:
                 print("Outlook is already running.")
                 app.activateWithOptions_(0) # Bring to front
                 return True
@@ -25,14 +98,16 @@ def launch_outlook() -> bool:
         # Using osascript to launch to ensure it's a clean launch and in foreground
         script = 'tell application "Microsoft Outlook" to activate'
         subprocess.run(['osascript', '-e', script], check=True)
-        time.sleep(5) # Give Outlook some time to launch
 
-        # Verify it's running
-        running_apps = NSWorkspace.sharedWorkspace().runningApplications()
-        for app in running_apps:
-            if app.bundleIdentifier() == "com.microsoft.Outlook":
-                print("Outlook launched successfully.")
-                return True
+        # Poll until it's running and in front instead of sleeping a fixed time
+        if wait_until(
+            lambda: is_outlook_running() and is_outlook_frontmost(),
+            timeout=15,
+            interval=0.2,
+            description="Outlook to launch",
+        ):
+            print("Outlook launched successfully.")
+            return True
         print("Failed to launch Outlook.")
         return False
     except Exception as e:
@@ -58,7 +133,7 @@ def navigate_to_calendar() -> bool:
         end tell
         '''
         subprocess.run(['osascript', '-e', script_work_week], check=True)
-        time.sleep(1)
+        wait_for_stable_frame(grab_downsampled_frame)
         # Switch to List view (CMD-0)
         script_list_view = '''
         tell application "Microsoft Outlook"
@@ -69,7 +144,7 @@ def navigate_to_calendar() -> bool:
         end tell
         '''
         subprocess.run(['osascript', '-e', script_list_view], check=True)
-        time.sleep(2) # Give UI time to update
+        wait_for_stable_frame(grab_downsampled_frame)  # Give UI time to update
         print("Navigated to Work Week and List views using CMD-2 and CMD-0.")
         return True
     except Exception as e:
@@ -86,13 +161,50 @@ def navigate_to_calendar() -> bool:
             end tell
             '''
             subprocess.run(['osascript', '-e', script], check=True)
-            time.sleep(2) # Give UI time to update
+            wait_for_stable_frame(grab_downsampled_frame)  # Give UI time to update
             print("Navigated to calendar successfully via menu.")
             return True
         except Exception as menu_e:
             print(f"Error navigating to calendar via menu: {menu_e}")
             return False
 
+def step_calendar_view(forward: bool = True) -> bool:
+    """
+    Move the Outlook calendar view one period (a week in Work Week view) forward or back.
+    Uses Outlook's next/previous period shortcut (CMD+Right / CMD+Left arrow).
+    Args:
+        forward: True to show the next week, False to show the previous one
+    Returns:
+        True if the keystroke was sent successfully, False otherwise.
+    """
+    key_code = 124 if forward else 123  # Right / Left arrow
+    script = f'''
+    tell application "Microsoft Outlook"
+        activate
+        tell application "System Events"
+            key code {key_code} using command down
+        end tell
+    end tell
+    '''
+    try:
+        subprocess.run(['osascript', '-e', script], check=True)
+        wait_for_stable_frame(grab_downsampled_frame)  # Give UI time to redraw the new week
+        return True
+    except Exception as e:
+        print(f"Error stepping calendar view {'forward' if forward else 'back'}: {e}")
+        return False
+
+
+def advance_calendar_week() -> bool:
+    """Show the next week in the Outlook calendar view."""
+    return step_calendar_view(forward=True)
+
+
+def rewind_calendar_week() -> bool:
+    """Show the previous week in the Outlook calendar view."""
+    return step_calendar_view(forward=False)
+
+
 def capture_screenshot(filepath: str) -> bool:
     """
     Capture a screenshot of the active window and save it to the specified filepath.
@@ -0,0 +1,156 @@
+"""
+Readiness probes for Outlook UI automation.
+
+Instead of sleeping for a fixed time after each UI action, we poll cheap
+signals (Outlook is frontmost, a downsampled frame has stopped changing,
+the calendar view is showing) at short intervals until they pass or an
+overall deadline expires. Probes, clock and sleep are injectable so the
+polling logic can be exercised without a Mac.
+"""
+import time
+from typing import Callable, Optional
+
+from PIL import Image, ImageChops, ImageStat
+
+from src.utils.logger import logger
+
+Probe = Callable[[], bool]
+FrameGrabber = Callable[[], Image.Image]
+
+
+def wait_until(
+    probe: Probe,
+    timeout: float,
+    interval: float = 0.1,
+    description: str = "condition",
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> bool:
+    """
+    Poll a probe until it returns True or the timeout expires.
+    Args:
+        probe: Callable returning True once the condition holds
+        timeout: Maximum seconds to wait
+        interval: Seconds to wait between polls
+        description: Human-readable name of the condition, for logging
+        clock: Monotonic clock (injectable for tests)
+        sleep: Sleep function (injectable for tests)
+    Returns:
+        True if the probe passed before the deadline, False otherwise
+    """
+    started = clock()
+    deadline = started + timeout
+    while True:
+        try:
+            if probe():
+                logger.debug(f"Ready: {description} after {clock() - started:.2f}s")
+                return True
+        except Exception as e:
+            logger.debug(f"Probe for {description} raised: {e}")
+        remaining = deadline - clock()
+        if remaining <= 0:
+            logger.warning(f"Timed out after {timeout:.1f}s waiting for {description}")
+            return False
+        sleep(min(interval, remaining))
+
+
+def frame_difference(previous: Image.Image, current: Image.Image) -> float:
+    """
+    Mean absolute per-pixel difference between two grayscale frames (0-255).
+    Frames of different sizes are treated as completely different.
+    """
+    if previous.size != current.size:
+        return 255.0
+    diff = ImageChops.difference(previous.convert('L'), current.convert('L'))
+    return ImageStat.Stat(diff).mean[0]
+
+
+class FrameStabilityProbe:
+    """
+    Probe that passes once consecutive downsampled frames stop changing.
+
+    Each call grabs one frame; the probe passes after `required_stable`
+    consecutive frames differ from their predecessor by at most `threshold`.
+    """
+
+    def __init__(self, grab_frame: FrameGrabber, threshold: float = 1.0, required_stable: int = 1):
+        """
+        Args:
+            grab_frame: Callable returning a small (downsampled) frame of the screen
+            threshold: Maximum mean pixel difference for two frames to count as equal
+            required_stable: Number of consecutive unchanged frames required
+        """
+        self.grab_frame = grab_frame
+        self.threshold = threshold
+        self.required_stable = required_stable
+        self._previous: Optional[Image.Image] = None
+        self._stable_count = 0
+
+    def __call__(self) -> bool:
+        frame = self.grab_frame()
+        previous, self._previous = self._previous, frame
+        if previous is None:
+            return False
+        if frame_difference(previous, frame) <= self.threshold:
+            self._stable_count += 1
+        else:
+            self._stable_count = 0
+        return self._stable_count >= self.required_stable
+
+
+def wait_for_stable_frame(
+    grab_frame: FrameGrabber,
+    timeout: float = 3.0,
+    interval: float = 0.1,
+    threshold: float = 1.0,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> bool:
+    """
+    Wait until the screen (as seen through grab_frame) has stopped changing.
+    Returns:
+        True once two consecutive frames match, False on timeout
+    """
+    probe = FrameStabilityProbe(grab_frame, threshold=threshold)
+    return wait_until(probe, timeout, interval, "screen to settle", clock, sleep)
+
+
+def wait_for_calendar_ready(
+    is_frontmost: Probe,
+    grab_frame: FrameGrabber,
+    anchor_visible: Probe,
+    timeout: float = 10.0,
+    interval: float = 0.2,
+    anchor_timeout: float = 1.0,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> bool:
+    """
+    Wait until Outlook is frontmost and the calendar view has settled.
+
+    The probes share one overall deadline, so an already-ready Outlook costs
+    only a couple of polls. The calendar-view anchor (e.g. the window title)
+    is advisory: it does not name the view in every Outlook version, so it
+    is only given `anchor_timeout` seconds and readiness is decided by the
+    frame having stopped changing.
+
+    Args:
+        is_frontmost: Probe for Outlook being the frontmost application
+        grab_frame: Callable returning a downsampled frame of the calendar region
+        anchor_visible: Probe for the calendar view being shown (advisory)
+        timeout: Overall deadline in seconds
+        interval: Seconds between polls
+        anchor_timeout: Seconds to wait for the anchor before going on without it
+    Returns:
+        True if Outlook is frontmost and the frame settled before the deadline, False otherwise
+    """
+    deadline = clock() + timeout
+    if not wait_until(is_frontmost, timeout, interval, "Outlook to be frontmost", clock, sleep):
+        return False
+    remaining = max(0.0, deadline - clock())
+    if not wait_until(anchor_visible, min(anchor_timeout, remaining), interval,
+                      "calendar view to be visible", clock, sleep):
+        logger.info("Calendar view not confirmed by the window title; relying on the frame settling")
+    remaining = max(0.0, deadline - clock())
+    return wait_until(FrameStabilityProbe(grab_frame), remaining, interval,
+                      "calendar to finish drawing", clock, sleep)
@@ -0,0 +1,117 @@
+"""
+Persisted local copy of the remote CalDAV calendar.
+
+Holds the last RFC 6578 sync token, the collection ctag and every event's
+ETag and ICS body, so a run only has to download the events that changed
+since the previous run. Stored as JSON at the configured
+`sync_state_filepath`, or in a CalendarMirror (SQLite) when that path ends
+in .sqlite or .db.
+"""
+import json
+import os
+from typing import Dict, Iterable, Optional, Set
+
+from src.calendar_mirror import CalendarMirror
+from src.utils.logger import logger
+
+_SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+
+class RemoteCalendarState:
+    """Event bodies, ETags and change markers for one calendar, loaded from and saved to a JSON file."""
+
+    def __init__(self, filepath: str, calendar_url: str):
+        """
+        Initialize and load the state file if it exists.
+
+        Args:
+            filepath: Path of the JSON state file
+            calendar_url: Calendar the state belongs to; a file written for a
+                different calendar is ignored
+        """
+        self.filepath = filepath
+        self.calendar_url = calendar_url
+        self.sync_token: Optional[str] = None
+        self.ctag: Optional[str] = None
+        self.events: Dict[str, dict] = {}  # href -> {"etag": str, "ics": str}
+        self.load()
+
+    def load(self):
+        """Load the state file, starting empty if it is missing, unreadable or for another calendar."""
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state file {self.filepath}: {e}")
+            return
+        if data.get("calendar_url") != self.calendar_url:
+            logger.info(f"Sync state in {self.filepath} is for another calendar; starting fresh.")
+            return
+        self.sync_token = data.get("sync_token")
+        self.ctag = data.get("ctag")
+        self.events = data.get("events", {})
+
+    def save(self):
+        """Write the state file atomically."""
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "calendar_url": self.calendar_url,
+            "sync_token": self.sync_token,
+            "ctag": self.ctag,
+            "events": self.events,
+        }
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.filepath)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def hrefs(self) -> Set[str]:
+        """Hrefs of every cached event."""
+        return set(self.events)
+
+    def etag(self, href: str) -> Optional[str]:
+        """Return the cached ETag of an event, or None if it is not cached."""
+        entry = self.events.get(href)
+        return entry["etag"] if entry else None
+
+    def apply(self, fetched: Dict[str, tuple], deleted: Iterable[str]):
+        """
+        Record downloaded and deleted events.
+
+        Args:
+            fetched: href -> (ics, etag) for events downloaded this run
+            deleted: hrefs of events that no longer exist on the server
+        """
+        for href in deleted:
+            self.events.pop(href, None)
+        for href, (ics, etag) in fetched.items():
+            self.events[href] = {"etag": etag, "ics": ics}
+
+    def record_put(self, href: str, ics: str, etag: Optional[str]):
+        """Record an event this tool has just stored on the server (written by the next save())."""
+        self.events[href] = {"etag": etag, "ics": ics}
+
+    def record_delete(self, href: str):
+        """Record an event this tool has just deleted from the server (written by the next save())."""
+        self.events.pop(href, None)
+
+
+def open_calendar_state(filepath: str, calendar_url: str):
+    """
+    Open the local copy of a calendar, picking the store from the file extension.
+    Args:
+        filepath: State file path; .sqlite/.sqlite3/.db selects the SQLite mirror, anything else JSON
+        calendar_url: Calendar the state belongs to
+    Returns:
+        CalendarMirror or RemoteCalendarState
+    """
+    if filepath.lower().endswith(_SQLITE_EXTENSIONS):
+        return CalendarMirror(filepath, calendar_url)
+    return RemoteCalendarState(filepath, calendar_url)
@@ -0,0 +1,256 @@
+"""
+Retry policies and a circuit breaker.
+
+Each operation (launching Outlook, capturing a screenshot, CalDAV reads,
+CalDAV writes) gets its own RetryPolicy: how many attempts, exponential
+backoff with full jitter between them, which errors (or results) are worth
+retrying, and an overall time budget. Deterministic failures (a rejected
+precondition, bad credentials, an unparseable response) are returned or
+raised at once instead of being retried.
+
+A CircuitBreaker shared by every call to one server fails fast once the
+server has failed several times in a row, instead of letting each pending
+write sit through its own backoff, and lets a single probe through after a
+cool-down to find out whether the server is back.
+
+Retries, backoff time and breaker trips are reported in the run metrics as
+retry.<operation>.* and circuit.<name>.*.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+R = TypeVar("R")
+
+
+class TransientError(Exception):
+    """A failure that may succeed if tried again (server busy or unreachable, request throttled)."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        """
+        Args:
+            message: What failed
+            status: HTTP status that signalled the failure, if any
+            retry_after: Seconds the server asked us to wait, if it said
+        """
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a server whose circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How one kind of operation is retried.
+
+    Attributes:
+        name: Operation name, used in logs and metrics
+        max_attempts: Attempts in total, including the first
+        base_delay: Backoff ceiling before the first retry, in seconds
+        max_delay: Largest backoff ceiling, in seconds
+        multiplier: Growth of the ceiling per retry
+        jitter: Wait a random time up to the ceiling ("full jitter") instead of the ceiling itself
+        budget_seconds: Give up once another wait would end past this many seconds from the first attempt
+        retry_on: Exception types worth retrying; anything else is raised at once
+        retry_on_result: Returns True for results that count as a retryable failure (e.g. a False return)
+    """
+    name: str
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    budget_seconds: Optional[float] = None
+    retry_on: Tuple[Type[BaseException], ...] = (TransientError, OSError)
+    retry_on_result: Optional[Callable[[Any], bool]] = None
+
+    def backoff(self, retry: int, rng: Optional[random.Random] = None) -> float:
+        """
+        Seconds to wait before the given retry.
+        Args:
+            retry: 0 for the first retry, 1 for the second, ...
+            rng: Random source for the jitter (default: the random module)
+        Returns:
+            Wait in seconds
+        """
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** retry)
+        return (rng or random).uniform(0, ceiling) if self.jitter else ceiling
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether an exception is worth another attempt under this policy."""
+        return isinstance(error, self.retry_on) and not isinstance(error, CircuitOpenError)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one server.
+
+    Closed: calls go through. After `failure_threshold` retryable failures
+    in a row it opens and calls fail with CircuitOpenError. Once
+    `reset_timeout` seconds have passed one probe call is let through
+    (half-open): its success closes the circuit, its failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: Name used in logs and metrics (e.g. "caldav")
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before letting a probe through
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """
+        Check that a call may proceed.
+        Raises:
+            CircuitOpenError if the circuit is open (or half-open with its probe already in flight)
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        metrics.incr(f"circuit.{self.name}.rejected")
+        raise CircuitOpenError(f"{self.name} circuit is open after repeated failures; not calling the server")
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"{self.name} is responding again; closing the circuit.")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_neutral(self):
+        """
+        End a call whose outcome says nothing about the server (e.g. a local error).
+
+        Leaves the failure count and state as they are; a half-open breaker may
+        let another probe through.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+                metrics.incr(f"circuit.{self.name}.opened")
+                logger.warning(
+                    f"{self.name} failed {self._failures} time(s) in a row; failing fast for {self.reset_timeout:.0f}s."
+                )
+
+
+def call_with_retry(
+    func: Callable[[], R],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+    rng: Optional[random.Random] = None,
+) -> R:
+    """
+    Call a function under a retry policy (and optionally a circuit breaker).
+    Args:
+        func: Callable to execute
+        policy: RetryPolicy for this operation
+        breaker: CircuitBreaker of the server being called, if any
+        sleep: Sleep function (injectable for tests)
+        clock: Monotonic clock (injectable for tests)
+        rng: Random source for the jitter
+    Returns:
+        Result of func(); when retry_on_result rejects every attempt, the last result
+    Raises:
+        The last exception once attempts or the time budget run out, a
+        non-retryable exception at once, or CircuitOpenError if the breaker is open
+    """
+    started = clock()
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker is not None:
+            breaker.before_call()
+        error: Optional[BaseException] = None
+        try:
+            result = func()
+        except Exception as e:
+            if not policy.is_retryable(e):
+                # Not a sign of the server's health either way (often a local error)
+                if breaker is not None:
+                    breaker.record_neutral()
+                raise
+            error = e
+            if breaker is not None:
+                breaker.record_failure()
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            if policy.retry_on_result is None or not policy.retry_on_result(result):
+                return result
+
+        wait = policy.backoff(attempt - 1, rng)
+        # Honour the server's Retry-After (caldav's RateLimitError keeps it as retry_after_seconds)
+        retry_after = getattr(error, "retry_after_seconds", None) or getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)):
+            wait = max(wait, retry_after)
+        out_of_budget = policy.budget_seconds is not None and clock() - started + wait > policy.budget_seconds
+        if attempt >= policy.max_attempts or out_of_budget:
+            metrics.incr(f"retry.{policy.name}.gave_up")
+            reason = "time budget spent" if out_of_budget and attempt < policy.max_attempts else "no attempts left"
+            logger.warning(f"{policy.name} failed after {attempt} attempt(s) ({reason}): {error or result!r}")
+            if error is not None:
+                raise error
+            return result
+
+        logger.warning(
+            f"{policy.name} attempt {attempt}/{policy.max_attempts} failed: {error or result!r}; "
+            f"retrying in {wait:.1f}s"
+        )
+        metrics.incr(f"retry.{policy.name}.retries")
+        metrics.observe(f"retry.{policy.name}.wait_seconds", wait)
+        sleep(wait)
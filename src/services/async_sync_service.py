@@ -0,0 +1,144 @@
+"""
+asyncio variants of the event deletion and creation services.
+Same behaviour as sync_service, with writes overlapped under a concurrency limit.
+"""
+from typing import Iterable, Optional
+from datetime import datetime, timezone
+import asyncio
+import logging
+import os
+
+from src.models.calendar_data import ParsedEvent
+from src.interfaces.async_calendar_repository import IAsyncCalendarRepository
+from src.caldav_client import map_parsed_event_to_ical
+from src.services.sync_service import backup_deleted_event, save_ics_file
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEventDeletionService:
+    """Responsible for deleting events from calendar, asynchronously"""
+
+    def __init__(
+        self,
+        calendar_repo: IAsyncCalendarRepository,
+        backup_dir: Optional[str] = None,
+        max_concurrency: int = 4
+    ):
+        """
+        Initialize async event deletion service.
+
+        Args:
+            calendar_repo: Async calendar repository implementation
+            backup_dir: Directory to backup deleted events (optional)
+            max_concurrency: Maximum number of deletes in flight
+        """
+        self.calendar_repo = calendar_repo
+        self.backup_dir = backup_dir
+        self.max_concurrency = max_concurrency
+        if backup_dir:
+            os.makedirs(backup_dir, exist_ok=True)
+
+    async def delete_future_events(self, dry_run: bool = False) -> int:
+        """
+        Delete all future events (events that haven't ended yet), concurrently.
+
+        Args:
+            dry_run: If True, don't actually delete, just log what would be deleted
+
+        Returns:
+            Number of events deleted
+
+        Raises:
+            RuntimeError if any delete failed (after all of them have been attempted)
+        """
+        now = datetime.now(timezone.utc)
+        existing_events = await self.calendar_repo.get_events_in_range(now)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def delete(uid) -> bool:
+            async with semaphore:
+                logger.info(f"Deleting CalDAV event: {uid}")
+                return await self.calendar_repo.delete_event(uid)
+
+        uids = []
+        for uid, event_obj in existing_events.items():
+            backup_deleted_event(self.backup_dir, uid, event_obj)
+            if dry_run:
+                logger.info(f"[DRY RUN] Would delete CalDAV event: {uid}")
+            else:
+                uids.append(uid)
+
+        results = await asyncio.gather(*(delete(uid) for uid in uids), return_exceptions=True)
+        failed = [uid for uid, ok in zip(uids, results) if ok is not True]
+        for uid, ok in zip(uids, results):
+            if uid in failed:
+                logger.error(f"Failed to delete event {uid}: {ok if isinstance(ok, Exception) else 'rejected'}")
+        if failed:
+            raise RuntimeError(f"Failed to delete {len(failed)} event(s): {', '.join(map(str, failed))}")
+        return len(uids)
+
+
+class AsyncEventCreationService:
+    """Responsible for creating events in calendar, asynchronously"""
+
+    def __init__(
+        self,
+        calendar_repo: IAsyncCalendarRepository,
+        backup_dir: Optional[str] = None,
+        max_concurrency: int = 4
+    ):
+        """
+        Initialize async event creation service.
+
+        Args:
+            calendar_repo: Async calendar repository implementation
+            backup_dir: Directory to save created event ICS files (optional)
+            max_concurrency: Maximum number of uploads in flight
+        """
+        self.calendar_repo = calendar_repo
+        self.backup_dir = backup_dir
+        self.max_concurrency = max_concurrency
+        if backup_dir:
+            os.makedirs(backup_dir, exist_ok=True)
+
+    async def create_events(self, events: Iterable[ParsedEvent], dry_run: bool = False) -> tuple[int, int]:
+        """
+        Create multiple events in the calendar, concurrently.
+
+        Args:
+            events: Parsed events to create (list or iterator)
+            dry_run: If True, don't actually create, just log what would be created
+
+        Returns:
+            Tuple of (successful_count, failed_count)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def create(event: ParsedEvent, event_uid: str, ical_data: str) -> bool:
+            async with semaphore:
+                logger.info(f"Creating CalDAV event for: {event.title} (UID: {event_uid})")
+                try:
+                    if await self.calendar_repo.put_event(event_uid, ical_data):
+                        return True
+                except Exception as e:
+                    logger.error(f"Failed to PUT event '{event.title}': {e}")
+                    return False
+                logger.error(f"Failed to PUT event '{event.title}'.")
+                return False
+
+        tasks = []
+        success_count = 0
+        for event in events:
+            ical_data, event_uid = map_parsed_event_to_ical(event)
+            save_ics_file(self.backup_dir, event_uid, ical_data)
+            if dry_run:
+                logger.info(f"[DRY RUN] Would create CalDAV event for: {event.title} (UID: {event_uid})")
+                success_count += 1
+            else:
+                # Start uploading right away; later events are mapped while it runs
+                tasks.append(asyncio.ensure_future(create(event, event_uid, ical_data)))
+
+        results = await asyncio.gather(*tasks)
+        success_count += sum(results)
+        return success_count, len(results) - sum(results)
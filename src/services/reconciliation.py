@@ -0,0 +1,426 @@
+"""
+Diff-based calendar reconciliation.
+
+Instead of deleting every future event and recreating it, each event gets a
+stable identity key (normalized title plus UTC start/end). Parsed events are
+matched against the existing future events by that key and only the
+differences are written: new events are created, matched events whose
+location or description changed are updated in place, and remote events
+with no parsed counterpart are deleted.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import os
+import re
+
+from src.models.calendar_data import ParsedEvent
+from src.interfaces.calendar_repository import ICalendarRepository
+from src.interfaces.event_extractor import IncompleteExtractionError
+from src.caldav_client import map_parsed_event_to_ical
+from src.calendar_mirror import MirroredEvent
+from src.caldav_write_pool import CalDAVWritePool
+from src.event_identity import KEY_TIME_FORMAT, EventKey, normalize_title, parsed_event_key
+from src.utils.ical_times import event_ics_data, get_event_fields
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(value) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip()
+
+
+@dataclass
+class RemoteEvent:
+    """
+    An existing calendar event as seen by the reconciler.
+    Attributes:
+        href: Event id/URL as returned by the repository.
+        event_obj: Original event object (kept for backups).
+        uid: iCalendar UID, if present.
+        key: Identity key, or None if the event could not be parsed.
+        location: Normalized LOCATION.
+        description: Normalized DESCRIPTION.
+    """
+    href: str
+    event_obj: Any
+    uid: Optional[str] = None
+    key: Optional[EventKey] = None
+    location: str = ""
+    description: str = ""
+
+    @classmethod
+    def from_event(cls, href: str, event_obj) -> "RemoteEvent":
+        """Build a RemoteEvent, leaving the key empty if the ICS data cannot be read."""
+        if isinstance(event_obj, MirroredEvent):
+            return cls._from_mirrored(href, event_obj)
+        remote = cls(str(href), event_obj)
+        try:
+            fields = get_event_fields(event_obj)
+        except Exception as e:
+            logger.warning(f"Could not parse existing event {href}: {e}")
+            return remote
+        if fields is None or fields.start is None or fields.end is None:
+            return remote
+        remote.uid = fields.uid or None
+        remote.key = (
+            normalize_title(fields.summary),
+            fields.start.strftime(KEY_TIME_FORMAT),
+            fields.end.strftime(KEY_TIME_FORMAT),
+        )
+        remote.location = _normalize_text(fields.location)
+        remote.description = _normalize_text(fields.description)
+        return remote
+
+    @classmethod
+    def _from_mirrored(cls, href: str, event: MirroredEvent) -> "RemoteEvent":
+        """Build a RemoteEvent from the mirror's parsed columns without parsing the ICS again."""
+        remote = cls(str(href), event, uid=event.uid, location=_normalize_text(event.location),
+                     description=_normalize_text(event.description))
+        if event.summary is not None and event.start is not None and event.end is not None:
+            remote.key = (
+                normalize_title(event.summary),
+                event.start.strftime(KEY_TIME_FORMAT),
+                event.end.strftime(KEY_TIME_FORMAT),
+            )
+        return remote
+
+    def differs_from(self, event: ParsedEvent) -> bool:
+        """True if the parsed event's location or description differ from this event's."""
+        return (self.location != _normalize_text(event.location)
+                or self.description != _normalize_text(event.description))
+
+
+@dataclass
+class ReconciliationPlan:
+    """
+    The writes needed to bring the calendar in line with the parsed events.
+    Attributes:
+        creates: Parsed events with no existing counterpart.
+        updates: (existing event, parsed event) pairs whose details changed.
+        deletes: Existing events with no parsed counterpart (or duplicates).
+        unchanged: Existing events that already match.
+    """
+    creates: List[ParsedEvent] = field(default_factory=list)
+    updates: List[Tuple[RemoteEvent, ParsedEvent]] = field(default_factory=list)
+    deletes: List[RemoteEvent] = field(default_factory=list)
+    unchanged: List[RemoteEvent] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """One-line summary of the plan sizes."""
+        return (f"{len(self.creates)} to create, {len(self.updates)} to update, "
+                f"{len(self.deletes)} to delete, {len(self.unchanged)} unchanged")
+
+    def describe(self) -> List[str]:
+        """Human-readable lines listing every planned write."""
+        lines = [f"Reconciliation plan: {self.summary()}"]
+        lines += [f"  + create {e.title} ({e.start_datetime} - {e.end_datetime})" for e in self.creates]
+        lines += [f"  ~ update {e.title} ({e.start_datetime} - {e.end_datetime}) [{r.href}]" for r, e in self.updates]
+        lines += [f"  - delete {r.href}" for r in self.deletes]
+        return lines
+
+
+class Reconciler:
+    """
+    Matches parsed events against a snapshot of existing events.
+
+    Parsed events can be fed one at a time (so creates can be issued while a
+    streaming extractor is still producing events); whatever existing events
+    remain unmatched at the end are the deletes.
+    """
+
+    def __init__(self, existing: Dict[str, Any], now: Optional[datetime] = None):
+        """
+        Args:
+            existing: Event id -> event object, as returned by get_events_in_range(now)
+            now: The cut-off `existing` was listed with; parsed events that
+                ended by then are ignored, like the existing ones (optional)
+        """
+        self._now_key = now.astimezone(timezone.utc).strftime(KEY_TIME_FORMAT) if now else None
+        self.plan = ReconciliationPlan()
+        self._remaining: Dict[EventKey, RemoteEvent] = {}
+        self._seen: set = set()
+        for href, event_obj in existing.items():
+            remote = RemoteEvent.from_event(href, event_obj)
+            if remote.key is None or remote.key in self._remaining:
+                # Unreadable events and duplicates of an identity are cleaned up
+                self.plan.deletes.append(remote)
+            else:
+                self._remaining[remote.key] = remote
+
+    def match(self, event: ParsedEvent) -> Tuple[str, Optional[RemoteEvent]]:
+        """
+        Classify one parsed event and record it in the plan.
+        Args:
+            event: Parsed event
+        Returns:
+            ("create", None), ("update", existing), ("unchanged", existing),
+            ("duplicate", None) for a repeat of an already seen parsed event or
+            ("past", None) for an event that has already ended
+        """
+        key = parsed_event_key(event)
+        if self._now_key is not None and key[2] <= self._now_key:
+            # Ended events are not in the listing, so they would be re-created every run
+            return "past", None
+        if key in self._seen:
+            return "duplicate", None
+        self._seen.add(key)
+        remote = self._remaining.pop(key, None)
+        if remote is None:
+            self.plan.creates.append(event)
+            return "create", None
+        if remote.differs_from(event):
+            self.plan.updates.append((remote, event))
+            return "update", remote
+        self.plan.unchanged.append(remote)
+        return "unchanged", remote
+
+    def finish(self) -> ReconciliationPlan:
+        """Move every unmatched existing event to the deletes and return the plan."""
+        self.plan.deletes.extend(self._remaining.values())
+        self._remaining = {}
+        return self.plan
+
+
+def build_plan(parsed_events: Iterable[ParsedEvent], existing: Dict[str, Any]) -> ReconciliationPlan:
+    """
+    Diff parsed events against existing events.
+    Args:
+        parsed_events: Events extracted from Outlook
+        existing: Event id -> event object of the existing future events
+    Returns:
+        ReconciliationPlan
+    """
+    reconciler = Reconciler(existing)
+    for event in parsed_events:
+        reconciler.match(event)
+    return reconciler.finish()
+
+
+@dataclass
+class ReconciliationResult:
+    """
+    Outcome of applying a plan.
+    Attributes:
+        plan: The plan that was applied.
+        created: Events created.
+        updated: Events updated.
+        deleted: Events deleted.
+        failed: Descriptions of writes that failed.
+        incomplete: The parsed events stopped part-way, so no event was deleted.
+    """
+    plan: ReconciliationPlan
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: List[str] = field(default_factory=list)
+    incomplete: bool = False
+
+    @property
+    def success(self) -> bool:
+        return not self.failed and not self.incomplete
+
+    def summary(self) -> str:
+        summary = f"{self.created} created, {self.updated} updated, {self.deleted} deleted"
+        if self.incomplete:
+            summary += " (extraction incomplete, deletes skipped)"
+        return summary
+
+
+class ReconciliationService:
+    """Brings the calendar's future events in line with the parsed events using minimal writes"""
+
+    def __init__(
+        self,
+        calendar_repo: ICalendarRepository,
+        deleted_backup_dir: Optional[str] = None,
+        created_ics_dir: Optional[str] = None,
+        call: Optional[Callable[[Callable[[], Any]], Any]] = None,
+        write_pool: Optional[CalDAVWritePool] = None,
+        read_call: Optional[Callable[[Callable[[], Any]], Any]] = None,
+    ):
+        """
+        Initialize reconciliation service.
+
+        Args:
+            calendar_repo: Calendar repository implementation
+            deleted_backup_dir: Directory to back up deleted and replaced events (optional)
+            created_ics_dir: Directory to save created/updated event ICS files (optional)
+            call: Wrapper used for every repository call, e.g. to add retries (optional)
+            write_pool: Pool to run writes concurrently in (optional; default: one at a time)
+            read_call: Wrapper used for the listing instead of `call`, e.g. a different retry policy (optional)
+        """
+        self.calendar_repo = calendar_repo
+        self.deleted_backup_dir = deleted_backup_dir
+        self.created_ics_dir = created_ics_dir
+        self._call = call or (lambda fn: fn())
+        self._read_call = read_call or self._call
+        self.write_pool = write_pool
+        for directory in (deleted_backup_dir, created_ics_dir):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    def fetch_existing(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Fetch the events that have not ended yet."""
+        now = now or datetime.now(timezone.utc)
+        return self._read_call(lambda: self.calendar_repo.get_events_in_range(now))
+
+    def reconcile(
+        self,
+        events: Iterable[ParsedEvent],
+        dry_run: bool = False,
+        now: Optional[datetime] = None,
+    ) -> ReconciliationResult:
+        """
+        Diff the parsed events against the calendar and apply the difference.
+
+        Creates and updates are written as the parsed events arrive, so a
+        streaming extractor's events are uploaded while later ones are still
+        being generated; deletes are issued once all events have been seen.
+        If the events stop part-way (IncompleteExtractionError), the creates
+        and updates for the events received are kept but nothing is deleted,
+        and the result is marked incomplete. With a write pool the writes overlap, and the result is tallied once
+        all of them have finished; the repository's local state is then saved.
+        In dry-run mode the plan is logged and nothing is written.
+
+        Args:
+            events: Parsed events (list or iterator)
+            dry_run: If True, only log the plan
+            now: Current time (default: now, UTC)
+        Returns:
+            ReconciliationResult
+        """
+        now = now or datetime.now(timezone.utc)
+        existing = self.fetch_existing(now)
+        logger.info(f"Fetched {len(existing)} future calendar events.")
+        reconciler = Reconciler(existing, now)
+        result = ReconciliationResult(reconciler.plan)
+
+        try:
+            for event in events:
+                action, remote = reconciler.match(event)
+                if dry_run:
+                    continue
+                if action == "create":
+                    self._write(result, "created", f"create {event.title}", lambda e=event: self._create(e))
+                elif action == "update":
+                    self._write(result, "updated", f"update {event.title}", lambda e=event, r=remote: self._update(r, e))
+                elif action == "duplicate":
+                    logger.debug(f"Skipping duplicate parsed event: {event.title}")
+                elif action == "past":
+                    logger.debug(f"Skipping parsed event that has already ended: {event.title}")
+        except IncompleteExtractionError as e:
+            logger.warning(f"Parsed events are incomplete ({e}); no events will be deleted this run.")
+            result.incomplete = True
+
+        plan = reconciler.finish()
+        if result.incomplete:
+            plan.deletes = []
+        if dry_run:
+            for line in plan.describe():
+                logger.info(f"[DRY RUN] {line}")
+            return result
+
+        for remote in plan.deletes:
+            self._write(result, "deleted", f"delete {remote.href}", lambda r=remote: self._delete(r))
+        if self.write_pool is not None:
+            for outcome in self.write_pool.wait():
+                counter, label = outcome.label
+                self._tally(result, counter, label, outcome.ok, outcome.error)
+        try:
+            self.calendar_repo.save_state()
+        except OSError as e:
+            logger.warning(f"Could not save the local calendar state: {e}")
+        logger.info(f"Reconciliation plan: {plan.summary()}; applied: {result.summary()}")
+        return result
+
+    # --- writes ----------------------------------------------------------
+
+    def _write(self, result: ReconciliationResult, counter: str, label: str, write: Callable[[], bool]):
+        """Run a write now, or queue it on the write pool; `counter` is the result field it counts toward."""
+        if self.write_pool is not None:
+            self.write_pool.submit((counter, label), write, own_slots=True)
+            return
+        try:
+            ok, error = bool(write()), None
+        except Exception as e:
+            ok, error = False, e
+        self._tally(result, counter, label, ok, error)
+
+    @staticmethod
+    def _tally(result: ReconciliationResult, counter: str, label: str, ok: bool, error: Optional[BaseException]):
+        if ok:
+            setattr(result, counter, getattr(result, counter) + 1)
+            return
+        if error is not None:
+            logger.error(f"Failed to {label}: {error}")
+        result.failed.append(label)
+
+    def _call_write(self, request: Callable[[], Any]) -> Any:
+        """
+        Send one write request through the retry wrapper.
+
+        With a write pool each attempt takes its own slot, so the pool sees a
+        throttled answer as soon as it arrives and retry backoff runs outside the slot.
+        """
+        if self.write_pool is None:
+            return self._call(request)
+        return self._call(lambda: self.write_pool.attempt(request))
+
+    def _create(self, event: ParsedEvent) -> bool:
+        ical_data, event_uid = map_parsed_event_to_ical(event)
+        self._save_ics_file(event_uid, ical_data)
+        logger.info(f"Creating CalDAV event for: {event.title} (UID: {event_uid})")
+        if self._call_write(lambda: self.calendar_repo.put_event(event_uid, ical_data)):
+            return True
+        logger.error(f"Failed to PUT event '{event.title}'.")
+        return False
+
+    def _update(self, remote: RemoteEvent, event: ParsedEvent) -> bool:
+        ical_data, event_uid = map_parsed_event_to_ical(event, uid=remote.uid)
+        self._save_ics_file(event_uid, ical_data)
+        self._backup_event(remote)
+        logger.info(f"Updating CalDAV event for: {event.title} (UID: {event_uid})")
+        if remote.href.rstrip("/").split("/")[-1] != f"{event_uid}.ics":
+            # The resource name does not follow the UID, so a PUT would not replace it
+            if not self._call_write(lambda: self.calendar_repo.delete_event(remote.href)):
+                logger.error(f"Failed to replace event {remote.href}.")
+                return False
+        if self._call_write(lambda: self.calendar_repo.put_event(event_uid, ical_data)):
+            return True
+        logger.error(f"Failed to PUT updated event '{event.title}'.")
+        return False
+
+    def _delete(self, remote: RemoteEvent) -> bool:
+        self._backup_event(remote)
+        logger.info(f"Deleting CalDAV event: {remote.href}")
+        if self._call_write(lambda: self.calendar_repo.delete_event(remote.href)):
+            return True
+        logger.error(f"Failed to delete event {remote.href}.")
+        return False
+
+    def _backup_event(self, remote: RemoteEvent):
+        """Backup an event about to be deleted or replaced to an ICS file"""
+        if not self.deleted_backup_dir:
+            return
+        event_filename = remote.href.rstrip("/").split("/")[-1]
+        ics_path = os.path.join(self.deleted_backup_dir, f"deleted_{event_filename}")
+        try:
+            with open(ics_path, "w", encoding="utf-8") as f:
+                f.write(event_ics_data(remote.event_obj))
+            logger.info(f"Backed up deleted event to ICS: {ics_path}")
+        except Exception as e:
+            logger.error(f"Failed to back up ICS file {ics_path}: {e}")
+
+    def _save_ics_file(self, uid: str, ical_data: str):
+        """Save ICS data to file"""
+        if not self.created_ics_dir:
+            return
+        ics_path = os.path.join(self.created_ics_dir, f"{uid}.ics")
+        try:
+            with open(ics_path, "w", encoding="utf-8") as f:
+                f.write(ical_data)
+            logger.debug(f"ICS file written: {ics_path}")
+        except Exception as e:
+            logger.error(f"Failed to write ICS file {ics_path}: {e}")
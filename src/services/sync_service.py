@@ -2,7 +2,8 @@
 Calendar sync service layer.
 Implements Single Responsibility Principle by separating concerns.
 """
-from typing import List, Optional
+from itertools import chain
+from typing import Iterable, List, Optional
 from datetime import datetime, timezone
 import logging
 import os
@@ -12,23 +13,89 @@ from src.interfaces.calendar_repository import ICalendarRepository
 from src.interfaces.notification_service import INotificationService
 from src.interfaces.event_extractor import IEventExtractor
 from src.caldav_client import map_parsed_event_to_ical
+from src.caldav_write_pool import CalDAVWritePool
+from src.services.reconciliation import ReconciliationService
+from src.utils.ical_times import event_ics_data
 
 logger = logging.getLogger(__name__)
 
 
+def backup_deleted_event(backup_dir: Optional[str], uid: str, event_obj):
+    """
+    Backup an event about to be deleted to <backup_dir>/deleted_<name>.
+    
+    Args:
+        backup_dir: Backup directory (nothing is written if None)
+        uid: Event id/URL; its last path segment names the file
+        event_obj: Event object or ICS text
+    """
+    if not backup_dir:
+        return
+    
+    # Extract filename from uid
+    uid_str = str(uid)
+    if "/" in uid_str:
+        event_filename = uid_str.rstrip("/").split("/")[-1]
+    else:
+        event_filename = uid_str
+    
+    ics_filename = f"deleted_{event_filename}"
+    ics_path = os.path.join(backup_dir, ics_filename)
+    
+    # Extract ICS string
+    ics_data = event_ics_data(event_obj)
+    
+    try:
+        with open(ics_path, "w", encoding="utf-8") as f:
+            f.write(ics_data)
+        logger.info(f"Backed up deleted event to ICS: {ics_path}")
+    except Exception as e:
+        logger.error(f"Failed to back up ICS file {ics_path}: {e}")
+
+
+def save_ics_file(backup_dir: Optional[str], uid: str, ical_data: str):
+    """
+    Save a created event's ICS data to <backup_dir>/<uid>.ics.
+    
+    Args:
+        backup_dir: Output directory (nothing is written if None)
+        uid: Event UID
+        ical_data: iCalendar text
+    """
+    if not backup_dir:
+        return
+    
+    ics_filename = f"{uid}.ics"
+    ics_path = os.path.join(backup_dir, ics_filename)
+    
+    try:
+        with open(ics_path, "w", encoding="utf-8") as f:
+            f.write(ical_data)
+        logger.debug(f"ICS file written: {ics_path}")
+    except Exception as e:
+        logger.error(f"Failed to write ICS file {ics_path}: {e}")
+
+
 class EventDeletionService:
     """Responsible for deleting events from calendar"""
     
-    def __init__(self, calendar_repo: ICalendarRepository, backup_dir: Optional[str] = None):
+    def __init__(
+        self,
+        calendar_repo: ICalendarRepository,
+        backup_dir: Optional[str] = None,
+        write_pool: Optional[CalDAVWritePool] = None
+    ):
         """
         Initialize event deletion service.
         
         Args:
             calendar_repo: Calendar repository implementation
             backup_dir: Directory to backup deleted events (optional)
+            write_pool: Pool to run deletes concurrently in (optional; default: one at a time)
         """
         self.calendar_repo = calendar_repo
         self.backup_dir = backup_dir
+        self.write_pool = write_pool
         if backup_dir:
             os.makedirs(backup_dir, exist_ok=True)
     
@@ -42,20 +109,12 @@ class EventDeletionService:
         Returns:
             Number of events deleted
         """
-        existing_events = self.calendar_repo.get_events()
+        # Only events that have not ended yet are fetched from the server
         now = datetime.now(timezone.utc)
+        existing_events = self.calendar_repo.get_events_in_range(now)
         deleted_count = 0
         
         for uid, event_obj in existing_events.items():
-            try:
-                # Check if event has ended
-                event_end = self._get_event_end_time(event_obj)
-                if event_end and event_end < now:
-                    logger.info(f"Skipping past event {uid} (ended: {event_end})")
-                    continue
-            except Exception as e:
-                logger.warning(f"Error checking event end time for {uid}: {e}. Will delete to be safe.")
-            
             # Backup event if backup directory is configured
             if self.backup_dir:
                 self._backup_event(uid, event_obj)
@@ -63,6 +122,9 @@ class EventDeletionService:
             # Delete event
             if dry_run:
                 logger.info(f"[DRY RUN] Would delete CalDAV event: {uid}")
+            elif self.write_pool is not None:
+                logger.info(f"Deleting CalDAV event: {uid}")
+                self.write_pool.submit(uid, lambda uid=uid: self.calendar_repo.delete_event(uid))
             else:
                 logger.info(f"Deleting CalDAV event: {uid}")
                 if self.calendar_repo.delete_event(uid):
@@ -72,81 +134,22 @@ class EventDeletionService:
                     logger.error(f"Failed to delete event {uid}.")
                     raise RuntimeError(f"Failed to delete event {uid}")
         
-        return deleted_count
-    
-    def _get_event_end_time(self, event_obj) -> Optional[datetime]:
-        """Extract event end time from caldav event object"""
-        from icalendar import Calendar
-        
-        # Get ICS data
-        if hasattr(event_obj, "data"):
-            ics_data = event_obj.data
-        elif hasattr(event_obj, "icalendar"):
-            ics_data = event_obj.icalendar()
-        else:
-            ics_data = str(event_obj)
-        
-        # Parse ICS to get end time
-        cal = Calendar.from_ical(ics_data)
-        for component in cal.walk():
-            if component.name == "VEVENT":
-                # Get DTEND or calculate from DTSTART + DURATION
-                dtend = component.get('dtend')
-                if dtend:
-                    event_end = dtend.dt
-                else:
-                    dtstart = component.get('dtstart')
-                    duration = component.get('duration')
-                    if dtstart and duration:
-                        event_end = dtstart.dt + duration.dt
-                    elif dtstart:
-                        event_end = dtstart.dt
-                    else:
-                        return None
-                
-                # Ensure timezone-aware for comparison
-                if hasattr(event_end, 'tzinfo'):
-                    if event_end.tzinfo is None:
-                        event_end = event_end.replace(tzinfo=timezone.utc)
-                    event_end_utc = event_end.astimezone(timezone.utc) if hasattr(event_end, 'astimezone') else event_end
+        if self.write_pool is not None and not dry_run:
+            failed = []
+            for outcome in self.write_pool.wait():
+                if outcome.ok:
+                    deleted_count += 1
                 else:
-                    # It's a date object, consider it as end of day UTC
-                    from datetime import datetime as dt
-                    event_end_utc = dt.combine(event_end, dt.max.time()).replace(tzinfo=timezone.utc)
-                
-                return event_end_utc
+                    logger.error(f"Failed to delete event {outcome.label}: {outcome.error or 'rejected'}")
+                    failed.append(outcome.label)
+            if failed:
+                raise RuntimeError(f"Failed to delete {len(failed)} event(s): {', '.join(map(str, failed))}")
         
-        return None
+        return deleted_count
     
     def _backup_event(self, uid: str, event_obj):
         """Backup event to ICS file"""
-        if not self.backup_dir:
-            return
-        
-        # Extract filename from uid
-        uid_str = str(uid)
-        if "/" in uid_str:
-            event_filename = uid_str.rstrip("/").split("/")[-1]
-        else:
-            event_filename = uid_str
-        
-        ics_filename = f"deleted_{event_filename}"
-        ics_path = os.path.join(self.backup_dir, ics_filename)
-        
-        # Extract ICS string
-        if hasattr(event_obj, "data"):
-            ics_data = event_obj.data
-        elif hasattr(event_obj, "icalendar"):
-            ics_data = event_obj.icalendar()
-        else:
-            ics_data = str(event_obj)
-        
-        try:
-            with open(ics_path, "w", encoding="utf-8") as f:
-                f.write(ics_data)
-            logger.info(f"Backed up deleted event to ICS: {ics_path}")
-        except Exception as e:
-            logger.error(f"Failed to back up ICS file {ics_path}: {e}")
+        backup_deleted_event(self.backup_dir, uid, event_obj)
 
 
 class EventCreationService:
@@ -155,7 +158,8 @@ class EventCreationService:
     def __init__(
         self,
         calendar_repo: ICalendarRepository,
-        backup_dir: Optional[str] = None
+        backup_dir: Optional[str] = None,
+        write_pool: Optional[CalDAVWritePool] = None
     ):
         """
         Initialize event creation service.
@@ -163,18 +167,24 @@ class EventCreationService:
         Args:
             calendar_repo: Calendar repository implementation
             backup_dir: Directory to save created event ICS files (optional)
+            write_pool: Pool to run uploads concurrently in (optional; default: one at a time)
         """
         self.calendar_repo = calendar_repo
         self.backup_dir = backup_dir
+        self.write_pool = write_pool
         if backup_dir:
             os.makedirs(backup_dir, exist_ok=True)
     
-    def create_events(self, events: List[ParsedEvent], dry_run: bool = False) -> tuple[int, int]:
+    def create_events(self, events: Iterable[ParsedEvent], dry_run: bool = False) -> tuple[int, int]:
         """
         Create multiple events in the calendar.
         
+        Events are uploaded one by one as the iterable produces them, so a
+        streaming extractor's events are created while later ones are still
+        being generated.
+        
         Args:
-            events: List of parsed events to create
+            events: Parsed events to create (list or iterator)
             dry_run: If True, don't actually create, just log what would be created
             
         Returns:
@@ -195,43 +205,48 @@ class EventCreationService:
             if dry_run:
                 logger.info(f"[DRY RUN] Would create CalDAV event for: {event.title} (UID: {event_uid})")
                 success_count += 1
+            elif self.write_pool is not None:
+                logger.info(f"Creating CalDAV event for: {event.title} (UID: {event_uid})")
+                self.write_pool.submit(
+                    event.title, lambda uid=event_uid, data=ical_data: self.calendar_repo.put_event(uid, data)
+                )
             else:
                 logger.info(f"Creating CalDAV event for: {event.title} (UID: {event_uid})")
-                if self.calendar_repo.put_event(event_uid, ical_data):
+                try:
+                    ok, error = self.calendar_repo.put_event(event_uid, ical_data), None
+                except Exception as e:
+                    ok, error = False, e
+                if ok:
+                    success_count += 1
+                else:
+                    logger.error(f"Failed to PUT event '{event.title}'{f': {error}' if error else '.'}")
+                    fail_count += 1
+        
+        if self.write_pool is not None and not dry_run:
+            for outcome in self.write_pool.wait():
+                if outcome.ok:
                     success_count += 1
                 else:
-                    logger.error(f"Failed to PUT event '{event.title}'.")
+                    logger.error(f"Failed to PUT event '{outcome.label}': {outcome.error or 'rejected'}")
                     fail_count += 1
         
         return success_count, fail_count
     
     def _save_ics_file(self, uid: str, ical_data: str):
         """Save ICS data to file"""
-        if not self.backup_dir:
-            return
-        
-        ics_filename = f"{uid}.ics"
-        ics_path = os.path.join(self.backup_dir, ics_filename)
-        
-        try:
-            with open(ics_path, "w", encoding="utf-8") as f:
-                f.write(ical_data)
-            logger.debug(f"ICS file written: {ics_path}")
-        except Exception as e:
-            logger.error(f"Failed to write ICS file {ics_path}: {e}")
+        save_ics_file(self.backup_dir, uid, ical_data)
 
 
 class CalendarSyncOrchestrator:
     """
     Orchestrates the calendar synchronization process.
-    Coordinates event extraction, deletion, and creation.
+    Coordinates event extraction and reconciliation with the calendar.
     """
     
     def __init__(
         self,
         event_extractor: IEventExtractor,
-        deletion_service: EventDeletionService,
-        creation_service: EventCreationService,
+        reconciliation_service: ReconciliationService,
         notification_service: INotificationService
     ):
         """
@@ -239,13 +254,11 @@ class CalendarSyncOrchestrator:
         
         Args:
             event_extractor: Service for extracting events from images
-            deletion_service: Service for deleting events
-            creation_service: Service for creating events
+            reconciliation_service: Service for applying the parsed events to the calendar
             notification_service: Service for sending notifications
         """
         self.event_extractor = event_extractor
-        self.deletion_service = deletion_service
-        self.creation_service = creation_service
+        self.reconciliation_service = reconciliation_service
         self.notification_service = notification_service
     
     def sync(self, screenshot_path: str, dry_run: bool = False) -> bool:
@@ -254,17 +267,19 @@ class CalendarSyncOrchestrator:
         
         Args:
             screenshot_path: Path to the Outlook calendar screenshot
-            dry_run: If True, don't actually make changes
+            dry_run: If True, don't actually make changes, just log the plan
             
         Returns:
             True if sync succeeded, False otherwise
         """
         try:
-            # Extract events from screenshot
+            # Extract events from screenshot (streamed where the extractor supports it)
             logger.info(f"Extracting events from screenshot: {screenshot_path}")
-            parsed_events = self.event_extractor.extract_events(screenshot_path)
+            events_iter = self.event_extractor.iter_events(screenshot_path)
+            first_event = next(events_iter, None)
             
-            if not parsed_events:
+            if first_event is None:
+                # Never wipe the calendar because an extraction came back empty
                 logger.info("No valid calendar events found.")
                 self.notification_service.send_notification(
                     "Outlook to CalDAV synced successfully, 0 events created",
@@ -272,35 +287,27 @@ class CalendarSyncOrchestrator:
                 )
                 return True
             
-            logger.info(f"Parsed {len(parsed_events)} event(s) from screenshot.")
-            
-            # Delete future events
-            logger.info("Deleting future events from calendar...")
-            self.deletion_service.delete_future_events(dry_run=dry_run)
-            
-            # Create new events
-            logger.info("Creating new events in calendar...")
-            success_count, fail_count = self.creation_service.create_events(
-                parsed_events,
+            # Create/update events as they arrive, then delete the stale ones
+            logger.info("Reconciling events with calendar...")
+            result = self.reconciliation_service.reconcile(
+                chain([first_event], events_iter),
                 dry_run=dry_run
             )
             
             # Send notification
             if dry_run:
-                logger.info(
-                    f"[DRY RUN] Completed. {success_count} events would have been created."
-                )
+                logger.info(f"[DRY RUN] Completed. Plan: {result.plan.summary()}.")
                 return True
             
-            if fail_count == 0:
+            if result.success:
                 self.notification_service.send_notification(
-                    f"Outlook to CalDAV synced successfully, {success_count} events created",
+                    f"Outlook to CalDAV synced successfully, {result.summary()}",
                     "Calendar Sync"
                 )
                 return True
             else:
                 self.notification_service.send_notification(
-                    f"Outlook to CalDAV sync partially failed: {success_count} created, {fail_count} failed",
+                    f"Outlook to CalDAV sync partially failed: {result.summary()}, {len(result.failed)} failed",
                     "Calendar Sync"
                 )
                 return False
@@ -1,46 +1,41 @@
 from src.config import Config
-from src.outlook_automation import launch_outlook, navigate_to_calendar, capture_screenshot
+from src.outlook_automation import (
+    launch_outlook,
+    navigate_to_calendar,
+    capture_screenshot,
+    advance_calendar_week,
+    rewind_calendar_week,
+    wait_for_outlook_calendar,
+)
 from src.ocr_processor import process_image_with_ocr, parse_outlook_event_from_ocr
-from src.gemini_extractor import extract_events_with_gemini, extract_events_with_gemini_fallback
-from src.caldav_client import CalDAVClient, map_parsed_event_to_ical
+from src.gemini_cache import GeminiResponseCache
+from src.interfaces.event_extractor import GeminiEventExtractor, HedgedEventExtractor, OCREventExtractor
+from src.caldav_client import CALDAV_READ_POLICY, CALDAV_WRITE_POLICY, CalDAVClient
+from src.caldav_write_pool import CalDAVWritePool
+from src.services.reconciliation import ReconciliationService
+from src.multi_week import extract_events_over_horizon
 from src.models.calendar_data import ParsedEvent
+from src.retry_policy import CircuitBreaker, RetryPolicy, call_with_retry
 from src.utils.logger import setup_logging, log_pushbullet_attempt
+from src.utils.metrics import metrics
 from src.lib.pushbullet_notify import send_pushbullet_notification
-import time
-from typing import Callable, TypeVar
-import logging
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 import urllib3
-import uuid
 import os
 
 logger = setup_logging()
 urllib3.disable_warnings()
 
-R = TypeVar("R")
-
-
-def _retry(func: Callable[[], R], retries=3, delay=5) -> R:
-    """
-    Retry a function up to 'retries' times with a delay between attempts.
-    Args:
-        func: Callable to execute
-        retries: Number of attempts
-        delay: Seconds to wait between attempts
-    Returns:
-        Result of func()
-    Raises:
-        Exception from func() if all retries fail
-    """
-    for i in range(retries):
-        try:
-            return func()
-        except Exception as e:
-            logger.warning(f"Attempt {i+1}/{retries} failed: {e}")
-            if i < retries - 1:
-                time.sleep(delay)
-            else:
-                raise  # Re-raise the exception on the last attempt
-    raise RuntimeError("Function did not return a value after retries.")  # Should not be reached
+# Outlook automation reports failure by returning False; a retry often gets past a slow UI
+LAUNCH_POLICY = RetryPolicy(
+    "launch_outlook", max_attempts=3, base_delay=1.0, max_delay=4.0,
+    retry_on=(Exception,), retry_on_result=lambda ok: not ok,
+)
+CAPTURE_POLICY = RetryPolicy(
+    "capture_screenshot", max_attempts=3, base_delay=0.5, max_delay=2.0,
+    retry_on=(Exception,), retry_on_result=lambda ok: not ok,
+)
 
 
 def resolve_conflict(outlook_event: ParsedEvent, caldav_event_ical: str) -> ParsedEvent:
@@ -58,15 +53,17 @@ def resolve_conflict(outlook_event: ParsedEvent, caldav_event_ical: str) -> Pars
 
 def sync_outlook_to_caldav(
     config_filepath: str,
-    current_date: str,
     notification_func=send_pushbullet_notification,
     dry_run: bool = False,
+    horizon_weeks: Optional[int] = None,
+    bypass_gemini_cache: bool = False,
 ) -> bool:
     """
     Orchestrate the synchronization of Outlook calendar events to CalDAV.
     Args:
         config_filepath: Path to config JSON file
-        current_date: Date string (YYYY-MM-DD) for which to sync events
+        horizon_weeks: Number of weeks to capture (overrides config.horizon_weeks)
+        bypass_gemini_cache: If True, always call Gemini instead of using cached responses
     Returns:
         True if sync is successful, False otherwise
     """
@@ -80,6 +77,7 @@ def sync_outlook_to_caldav(
             notification_sent = True
         return notification_sent
 
+    metrics.reset()
     try:
         # 1. Load configuration
         config = Config.load_from_file(config_filepath)
@@ -93,12 +91,16 @@ def sync_outlook_to_caldav(
             config.caldav_username,
             config.caldav_password,
             getattr(config, "verify_ssl", True),
+            sync_state_filepath=getattr(config, "sync_state_filepath", None),
+            pool_size=getattr(config, "caldav_write_concurrency", 4),
+            connect_timeout=getattr(config, "caldav_connect_timeout_seconds", None),
+            read_timeout=getattr(config, "caldav_read_timeout_seconds", None),
         )
         logger.info("CalDAV client initialized.")
 
         # 4. Launch Outlook and navigate to calendar
         logger.info("Launching Outlook...")
-        if not _retry(launch_outlook, retries=3, delay=5):
+        if not call_with_retry(launch_outlook, LAUNCH_POLICY):
             logger.error("Failed to launch Outlook after multiple retries.")
             send_notification_once(
                 getattr(config, "pushbullet_api_key", None),
@@ -108,7 +110,7 @@ def sync_outlook_to_caldav(
             return False
         # TEMPORARILY DISABLED: Navigation to calendar (requires accessibility permissions)
         # User should manually ensure Outlook is in calendar view (Work Week + List view) before running
-        # if not _retry(navigate_to_calendar, retries=3, delay=5):
+        # if not call_with_retry(navigate_to_calendar, LAUNCH_POLICY):
         #     logger.error("Failed to navigate to Outlook calendar after multiple retries.")
         #     send_notification_once(
         #         getattr(config, "pushbullet_api_key", None),
@@ -117,38 +119,73 @@ def sync_outlook_to_caldav(
         #     )
         #     return False
         logger.info("Outlook launched. Please ensure Outlook is in Calendar view (Work Week + List view).")
-        time.sleep(3)  # Give user a moment to manually switch to calendar view if needed
+        # Poll until the calendar is in front and has finished drawing, rather than sleeping blindly
+        if not wait_for_outlook_calendar(timeout=10):
+            logger.warning("Outlook calendar view not confirmed ready; capturing anyway.")
+
+        # 5. Capture screenshot(s) and 6. extract events from the cropped captures
+        use_gemini = getattr(config, "use_gemini_vision", False)
+        gemini_api_key = getattr(config, "gemini_api_key", None)
+        if use_gemini and gemini_api_key:
+            budget = getattr(config, "gemini_latency_budget_seconds", 20.0)
+            logger.info(
+                f"Events will be extracted with Gemini Vision API and OCR in parallel "
+                f"(Gemini preferred within {budget:.0f}s)."
+            )
+            gemini_cache = None
+            if getattr(config, "gemini_cache_dir", None):
+                gemini_cache = GeminiResponseCache(
+                    config.gemini_cache_dir,
+                    ttl_seconds=config.gemini_cache_ttl_hours * 3600,
+                    max_entries=config.gemini_cache_max_entries,
+                )
+            hedged_extractor = HedgedEventExtractor(
+                GeminiEventExtractor(
+                    gemini_api_key, cache=gemini_cache, bypass_cache=bypass_gemini_cache,
+                    tiled=getattr(config, "gemini_tiled_extraction", False),
+                ),
+                OCREventExtractor(),
+                budget_seconds=budget,
+            )
+            extract_func = hedged_extractor.extract_events
+            # Gemini calls wait on the network and share one session (and its call
+            # limit) per API key, so the weeks are extracted in threads, not processes
+            extract_in_threads = True
+        else:
+            logger.info("Events will be extracted with OCR.")
+            extract_func = process_image_with_ocr
+            extract_in_threads = False
 
-        # 5. Capture screenshot
+        weeks = horizon_weeks or getattr(config, "horizon_weeks", 1)
         screenshot_path = "outlook_calendar_screenshot.png"
-        cropped_path = "outlook_calendar_screenshot_cropped.png"
-        logger.info(f"Capturing screenshot to {screenshot_path}...")
-        if not _retry(lambda: capture_screenshot(screenshot_path), retries=3, delay=5):
-            logger.error("Failed to capture screenshot after multiple retries.")
+        logger.info(f"Capturing {weeks} week(s) starting with {screenshot_path}...")
+        max_workers = getattr(config, "extraction_workers", None)
+        extraction_executor = None
+        if extract_in_threads and weeks > 1:
+            extraction_executor = ThreadPoolExecutor(max_workers=max_workers or weeks, thread_name_prefix="extract")
+        try:
+            parsed_events = extract_events_over_horizon(
+                weeks,
+                capture_week=lambda path: call_with_retry(lambda: capture_screenshot(path), CAPTURE_POLICY),
+                advance_week=advance_calendar_week,
+                rewind_week=rewind_calendar_week,
+                extract_events=extract_func,
+                screenshot_path=screenshot_path,
+                max_workers=max_workers,
+                executor=extraction_executor,
+            )
+        except RuntimeError as e:
+            logger.error(f"Failed to capture Outlook calendar: {e}")
             send_notification_once(
                 getattr(config, "pushbullet_api_key", None),
-                "Outlook to CalDAV sync failed: Could not capture screenshot",
+                f"Outlook to CalDAV sync failed: {e}",
                 "Calendar Sync",
             )
             return False
-        logger.info(f"Screenshot captured. Raw: {screenshot_path}, Cropped: {cropped_path}")
+        finally:
+            if extraction_executor is not None:
+                extraction_executor.shutdown(wait=True, cancel_futures=True)
 
-        # 6. Process cropped screenshot with OCR or Gemini to get parsed events
-        use_gemini = getattr(config, "use_gemini_vision", False)
-        gemini_api_key = getattr(config, "gemini_api_key", None)
-        
-        if use_gemini and gemini_api_key:
-            logger.info("Processing cropped screenshot with Gemini Vision API...")
-            try:
-                parsed_events = extract_events_with_gemini(cropped_path, gemini_api_key)
-            except Exception as e:
-                logger.warning(f"Gemini extraction failed, falling back to OCR: {e}")
-                logger.info("Processing cropped screenshot with OCR...")
-                parsed_events = process_image_with_ocr(cropped_path)
-        else:
-            logger.info("Processing cropped screenshot with OCR...")
-            parsed_events = process_image_with_ocr(cropped_path)
-            
         # Log each event for manual validation
         logger.debug("Parsed events from OCR:")
         for idx, event in enumerate(parsed_events, 1):
@@ -164,180 +201,48 @@ def sync_outlook_to_caldav(
             return True  # No event to sync, consider it a success
         logger.info(f"Parsed {len(parsed_events)} event(s) from OCR output.")
 
-        # 3. Fetch and delete only future existing CalDAV events
-        logger.info("Fetching existing CalDAV events...")
-        existing_caldav_events = _retry(caldav_client.get_events, retries=3, delay=5)
-        assert existing_caldav_events is not None  # Explicit assertion for linter
-        logger.info(f"Fetched {len(existing_caldav_events)} existing CalDAV events.")
-
-        # Delete only future events before syncing new ones, unless dry_run
-        deleted_ics_dir = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "..", "ics_deleted"
+        # 3. Reconcile with the future CalDAV events: only the differences are written
+        base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+        write_concurrency = getattr(config, "caldav_write_concurrency", 4)
+        write_pool = CalDAVWritePool(max_concurrency=write_concurrency) if write_concurrency > 1 else None
+        # One breaker for the server: once it is down, pending writes fail fast instead of each backing off
+        caldav_breaker = CircuitBreaker("caldav")
+        reconciliation = ReconciliationService(
+            caldav_client,
+            deleted_backup_dir=os.path.join(base_dir, "ics_deleted"),
+            created_ics_dir=os.path.join(base_dir, "ics_create"),
+            call=lambda fn: call_with_retry(fn, CALDAV_WRITE_POLICY, caldav_breaker),
+            write_pool=write_pool,
+            read_call=lambda fn: call_with_retry(fn, CALDAV_READ_POLICY, caldav_breaker),
         )
-        os.makedirs(deleted_ics_dir, exist_ok=True)
-        
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc)
-        
-        for uid, event_obj in existing_caldav_events.items():
-            # Extract event end time to determine if it's a future event
-            try:
-                # Get the VEVENT component from the event
-                if hasattr(event_obj, 'icalendar_component'):
-                    vevent = event_obj.icalendar_component
-                elif hasattr(event_obj, 'instance') and hasattr(event_obj.instance, 'vevent'):
-                    vevent = event_obj.instance.vevent
-                else:
-                    # Parse the ICS data to get the event end time
-                    from icalendar import Calendar
-                    if hasattr(event_obj, "data"):
-                        ics_data = event_obj.data
-                    elif hasattr(event_obj, "icalendar"):
-                        ics_data = event_obj.icalendar()
-                    else:
-                        ics_data = str(event_obj)
-                    cal = Calendar.from_ical(ics_data)
-                    vevent = None
-                    for component in cal.walk():
-                        if component.name == "VEVENT":
-                            vevent = component
-                            break
-                
-                if vevent is None:
-                    logger.warning(f"Could not parse VEVENT for {uid}, skipping deletion check.")
-                    continue
-                
-                # Get DTEND or calculate from DTSTART + DURATION
-                dtend = vevent.get('dtend')
-                if dtend:
-                    event_end = dtend.dt
-                else:
-                    dtstart = vevent.get('dtstart')
-                    duration = vevent.get('duration')
-                    if dtstart and duration:
-                        event_end = dtstart.dt + duration.dt
-                    elif dtstart:
-                        # All-day event or event with no end time
-                        event_end = dtstart.dt
-                    else:
-                        logger.warning(f"Could not determine end time for {uid}, skipping deletion check.")
-                        continue
-                
-                # Ensure event_end is timezone-aware for comparison
-                if hasattr(event_end, 'tzinfo'):
-                    if event_end.tzinfo is None:
-                        # Assume local timezone if naive
-                        from datetime import datetime as dt
-                        event_end = event_end.replace(tzinfo=timezone.utc)
-                    # Convert to UTC for comparison
-                    event_end_utc = event_end.astimezone(timezone.utc) if hasattr(event_end, 'astimezone') else event_end
-                else:
-                    # It's a date object, consider it as end of day UTC
-                    from datetime import datetime as dt
-                    event_end_utc = dt.combine(event_end, dt.max.time()).replace(tzinfo=timezone.utc)
-                
-                # Skip deletion if event has already ended
-                if event_end_utc < now:
-                    logger.info(f"Skipping past event {uid} (ended: {event_end_utc})")
-                    continue
-                    
-            except Exception as e:
-                logger.warning(f"Error checking event end time for {uid}: {e}. Will delete to be safe.")
-            
-            # Ensure uid is a string for filename extraction
-            uid_str = str(uid)
-            if "/" in uid_str:
-                event_filename = uid_str.rstrip("/").split("/")[-1]
-            else:
-                event_filename = uid_str
-            ics_filename = f"deleted_{event_filename}"
-            ics_path = os.path.join(deleted_ics_dir, ics_filename)
-            # Extract ICS string from caldav.Event object
-            if hasattr(event_obj, "data"):
-                ics_data = event_obj.data
-            elif hasattr(event_obj, "icalendar"):
-                ics_data = event_obj.icalendar()
-            else:
-                ics_data = str(event_obj)
-            try:
-                with open(ics_path, "w", encoding="utf-8") as f:
-                    f.write(ics_data)
-                logger.info(f"Backed up deleted event to ICS: {ics_path}")
-            except Exception as e:
-                logger.error(f"Failed to back up ICS file {ics_path}: {e}")
-
-            if dry_run:
-                logger.info(f"[DRY RUN] Would delete CalDAV event: {uid}")
-            else:
-                logger.info(f"Deleting CalDAV event: {uid}")
-                del_success = _retry(lambda: caldav_client.delete_event(uid), retries=3, delay=5)
-                if del_success:
-                    logger.info(f"Event {uid} deleted successfully.")
-                else:
-                    logger.error(f"Failed to delete event {uid}.")
-                    logger.critical("Aborting sync due to failed event deletion.")
-                    send_notification_once(
-                        getattr(config, "pushbullet_api_key", None),
-                        f"Outlook to CalDAV sync failed: Could not delete event {uid}",
-                        "Calendar Sync",
-                    )
-                    return False
-
-        # 7. Sync all parsed events
-        ics_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ics_create")
-        os.makedirs(ics_dir, exist_ok=True)
-        all_success = True
-        for parsed_event in parsed_events:
-            # Generate ICS data and UID inside map_parsed_event_to_ical
-            ical_data, event_uid = map_parsed_event_to_ical(parsed_event)
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(
-                    f"iCalendar payload to be sent for {parsed_event.title} (UID: {event_uid}):\n{ical_data}"
-                )
-
-            # Write ICS file to disk before creating event
-            ics_filename = f"{event_uid}.ics"
-            ics_path = os.path.join(ics_dir, ics_filename)
-            try:
-                with open(ics_path, "w", encoding="utf-8") as f:
-                    f.write(ical_data)
-                logger.debug(f"ICS file written: {ics_path}")
-            except Exception as e:
-                logger.error(f"Failed to write ICS file {ics_path}: {e}")
+        logger.info("Fetching future CalDAV events and reconciling...")
+        try:
+            result = reconciliation.reconcile(parsed_events, dry_run=dry_run)
+        finally:
+            if write_pool is not None:
+                write_pool.shutdown()
 
-            if dry_run:
-                logger.info(
-                    f"[DRY RUN] Would create CalDAV event for Outlook event: {parsed_event.title} (UID: {event_uid})"
-                )
-            else:
-                logger.info(
-                    f"Creating CalDAV event for Outlook event: {parsed_event.title} (UID: {event_uid})"
-                )
-                put_success = _retry(
-                    lambda: caldav_client.put_event(event_uid, ical_data), retries=3, delay=5
-                )
-                if not put_success:
-                    logger.error(f"Failed to PUT event '{parsed_event.title}'.")
-                    all_success = False
         # Send notification after sync attempt
         if dry_run:
             logger.info(
-                f"[DRY RUN] Completed dry run. No events were deleted or created. {len(parsed_events)} events would have been created. ICS files written to {ics_dir}."
+                f"[DRY RUN] Completed dry run. No events were deleted, updated or created. "
+                f"Plan: {result.plan.summary()}."
             )
             return True
-        if all_success:
+        if result.success:
             send_notification_once(
                 getattr(config, "pushbullet_api_key", None),
-                f"Outlook to CalDAV synced successfully, {len(parsed_events)} events created",
+                f"Outlook to CalDAV synced successfully, {result.summary()}",
                 "Calendar Sync",
             )
         else:
             send_notification_once(
                 getattr(config, "pushbullet_api_key", None),
-                "Outlook to CalDAV sync failed: One or more events could not be created.",
+                f"Outlook to CalDAV sync failed: {len(result.failed)} change(s) could not be applied "
+                f"({result.summary()}).",
                 "Calendar Sync",
             )
-        return all_success
+        return result.success
 
     except FileNotFoundError as e:
         logger.error(f"Configuration or image file error: {e}")
@@ -375,3 +280,5 @@ def sync_outlook_to_caldav(
             api_key = None
         notification_func(api_key, f"Outlook to CalDAV sync failed: {e}", "Calendar Sync")
         return False
+    finally:
+        metrics.log_summary()
@@ -0,0 +1,239 @@
+"""
+Start/end time helpers for remote calendar events.
+
+Shared by the sync tool, the deletion service and the repositories so the
+"has this event ended?" rule lives in one place.
+
+Event bodies are read with the one-pass ics_scanner and only go through
+icalendar when the scanner cannot handle them. Results are cached by href
+and ETag, so an unchanged event is read once per process however many
+times the range filter, the reconciler or the mirror look at it.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from icalendar import Calendar
+
+from src.utils.ics_scanner import ScannedEvent, scan_event
+from src.utils.metrics import metrics
+
+_FIELDS_CACHE_SIZE = 100_000
+
+
+def event_ics_data(event_obj) -> str:
+    """
+    Return the ICS text of a caldav event object (or anything similar).
+    Args:
+        event_obj: caldav.Event, object with .data/.icalendar(), or an ICS string
+    Returns:
+        iCalendar text
+    """
+    if hasattr(event_obj, "data"):
+        return event_obj.data
+    if hasattr(event_obj, "icalendar"):
+        return event_obj.icalendar()
+    return str(event_obj)
+
+
+def get_vevent(event_obj):
+    """Return the first VEVENT component of an event object, or None."""
+    component = getattr(event_obj, "icalendar_component", None)
+    if component is not None and getattr(component, "name", None) == "VEVENT":
+        return component
+    for component in Calendar.from_ical(event_ics_data(event_obj)).walk():
+        if component.name == "VEVENT":
+            return component
+    return None
+
+
+def _to_utc(value, end_of_day: bool) -> datetime:
+    """Make a DTSTART/DTEND value a timezone-aware UTC datetime."""
+    if not isinstance(value, datetime) and isinstance(value, date):
+        # It's a date object, consider it as start or end of day UTC
+        bound = datetime.max.time() if end_of_day else datetime.min.time()
+        return datetime.combine(value, bound).replace(tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class _FieldsCache:
+    """Thread-safe LRU of ScannedEvent results keyed by (href, ETag)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Optional[ScannedEvent]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]):
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def put(self, key: Tuple[str, str], fields: Optional[ScannedEvent]):
+        with self._lock:
+            self._entries[key] = fields
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_fields_cache = _FieldsCache(_FIELDS_CACHE_SIZE)
+
+
+def _cache_key(event_obj) -> Optional[Tuple[str, str]]:
+    """(href, ETag) of an event object, or None if it has no ETag."""
+    url = getattr(event_obj, "url", None)
+    etag = getattr(event_obj, "etag", None)
+    if etag is None:
+        props = getattr(event_obj, "props", None)
+        etag = props.get("{DAV:}getetag") if isinstance(props, dict) else None
+    if url is None or not etag:
+        return None
+    return str(url), etag
+
+
+def _parse_fields(event_obj) -> Optional[ScannedEvent]:
+    """Read the event fields with icalendar (the fallback for input the scanner rejects)."""
+    vevent = get_vevent(event_obj)
+    if vevent is None:
+        return None
+    dtstart = vevent.get('dtstart')
+    end = None
+    # DTEND, else DTSTART + DURATION, else DTSTART (all-day event or no end time)
+    dtend = vevent.get('dtend')
+    duration = vevent.get('duration')
+    if dtend:
+        end = _to_utc(dtend.dt, end_of_day=True)
+    elif dtstart and duration:
+        end = _to_utc(dtstart.dt + duration.dt, end_of_day=True)
+    elif dtstart:
+        end = _to_utc(dtstart.dt, end_of_day=True)
+
+    def text(name):
+        value = vevent.get(name)
+        return str(value) if value is not None else None
+
+    return ScannedEvent(
+        uid=text('uid'),
+        summary=text('summary'),
+        location=text('location'),
+        description=text('description'),
+        start=_to_utc(dtstart.dt, end_of_day=False) if dtstart is not None else None,
+        end=end,
+    )
+
+
+def get_event_fields(event_obj) -> Optional[ScannedEvent]:
+    """
+    Read an event's UID, summary, location, description and UTC start/end.
+
+    Objects that already carry the parsed fields (listing records) are not
+    read again.
+    Args:
+        event_obj: caldav event object, object with .data, or an ICS string
+    Returns:
+        ScannedEvent for the first VEVENT, or None if there is none
+    Raises:
+        ValueError if the ICS data cannot be parsed
+    """
+    fields = getattr(event_obj, "fields", None)
+    if isinstance(fields, ScannedEvent):
+        return fields
+    key = _cache_key(event_obj)
+    if key is not None:
+        hit, fields = _fields_cache.get(key)
+        if hit:
+            return fields
+    ics = event_obj if isinstance(event_obj, str) else getattr(event_obj, "data", None)
+    fields = scan_event(ics) if isinstance(ics, str) else None
+    if fields is None:
+        metrics.incr("ics.full_parses")
+        fields = _parse_fields(event_obj)
+    if key is not None:
+        _fields_cache.put(key, fields)
+    return fields
+
+
+def clear_fields_cache():
+    """Forget every cached get_event_fields() result."""
+    _fields_cache.clear()
+
+
+def get_event_start_time(event_obj) -> Optional[datetime]:
+    """
+    Extract an event's start time.
+    Args:
+        event_obj: caldav event object or ICS string
+    Returns:
+        Start as an aware UTC datetime, or None if the event has no DTSTART
+    Raises:
+        ValueError if the ICS data cannot be parsed
+    """
+    fields = get_event_fields(event_obj)
+    return fields.start if fields is not None else None
+
+
+def get_event_end_time(event_obj) -> Optional[datetime]:
+    """
+    Extract an event's end time (DTEND, or DTSTART + DURATION, or DTSTART).
+    Args:
+        event_obj: caldav event object or ICS string
+    Returns:
+        End as an aware UTC datetime, or None if it cannot be determined
+    Raises:
+        ValueError if the ICS data cannot be parsed
+    """
+    fields = get_event_fields(event_obj)
+    return fields.end if fields is not None else None
+
+
+def event_in_range(event_obj, start: Optional[datetime], end: Optional[datetime] = None) -> bool:
+    """
+    Check whether an event overlaps [start, end), like a CalDAV time-range filter.
+
+    Events whose times cannot be determined are treated as in range, so
+    callers that clean up future events err on the side of including them.
+
+    Args:
+        event_obj: caldav event object or ICS string
+        start: Range start (aware), or None for unbounded
+        end: Range end (aware), or None for unbounded
+    Returns:
+        True if the event overlaps the range
+    """
+    try:
+        fields = get_event_fields(event_obj)
+    except Exception:
+        return True
+    if fields is None:
+        return True
+    event_start, event_end = fields.start, fields.end
+    if start is not None and event_end is not None and event_end <= start:
+        return False
+    if end is not None and event_start is not None and event_start >= end:
+        return False
+    return True
+
+
+def filter_events_in_range(
+    events: Dict[str, Any], start: Optional[datetime], end: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Keep only the events overlapping [start, end).
+    Args:
+        events: Event id -> event object, as returned by get_events()
+        start: Range start (aware), or None for unbounded
+        end: Range end (aware), or None for unbounded
+    Returns:
+        Filtered dict in the same order
+    """
+    return {key: event for key, event in events.items() if event_in_range(event, start, end)}
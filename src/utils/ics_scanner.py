@@ -0,0 +1,179 @@
+"""
+One-pass scanner for the few VEVENT fields the sync needs.
+
+Pulls UID, SUMMARY, LOCATION, DESCRIPTION, DTSTART and DTEND/DURATION (with
+TZID) out of raw iCalendar text using string operations, without building
+an icalendar component tree. Input the scanner cannot read with certainty
+(quoted or encoded parameters, unknown TZIDs, unusual value formats,
+repeated properties, ...) yields None so the caller can fall back to the
+full parser.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+_WANTED = frozenset(("UID", "SUMMARY", "LOCATION", "DESCRIPTION", "DTSTART", "DTEND", "DURATION"))
+_FOLD = re.compile(r"\r?\n[ \t]")
+_DURATION = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+
+@dataclass(frozen=True, slots=True)
+class ScannedEvent:
+    """
+    The fields of an event's first VEVENT that the sync reads.
+    Attributes:
+        uid: UID, or None if absent.
+        summary: SUMMARY (unescaped), or None if absent.
+        location: LOCATION (unescaped), or None if absent.
+        description: DESCRIPTION (unescaped), or None if absent.
+        start: DTSTART in UTC, or None if absent.
+        end: End in UTC (DTEND, DTSTART + DURATION or DTSTART), or None if unknown.
+    """
+    uid: Optional[str]
+    summary: Optional[str]
+    location: Optional[str]
+    description: Optional[str]
+    start: Optional[datetime]
+    end: Optional[datetime]
+
+
+class _Unreadable(Exception):
+    """Raised internally when the input needs the full parser."""
+
+
+@lru_cache(maxsize=256)
+def _zone(tzid: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tzid)
+    except (ValueError, OSError, LookupError) as e:
+        raise _Unreadable(tzid) from e
+
+
+def _unescape(value: str) -> str:
+    """Undo RFC 5545 TEXT escaping, in the same order as icalendar."""
+    if "\\" not in value:
+        return value
+    return (value.replace("\\N", "\\n").replace("\\n", "\n").replace("\\,", ",")
+            .replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _params(raw: str) -> Dict[str, str]:
+    params = {}
+    for item in raw.split(";"):
+        if item:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise _Unreadable(raw)
+            params[name.upper()] = value
+    return params
+
+
+def _date_or_datetime(params: str, value: str):
+    """Parse a DATE or DATE-TIME value: a date, a naive (floating) datetime or an aware one."""
+    try:
+        day = date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        if len(value) == 8 and value.isdigit():
+            return day
+        if len(value) not in (15, 16) or value[8] != "T" or not value[9:15].isdigit():
+            raise _Unreadable(value)
+        moment = datetime(day.year, day.month, day.day, int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    except ValueError as e:
+        raise _Unreadable(value) from e
+    if len(value) == 16:
+        if value[15] != "Z":
+            raise _Unreadable(value)
+        return moment.replace(tzinfo=timezone.utc)
+    tzid = _params(params).get("TZID") if params else None
+    return moment.replace(tzinfo=_zone(tzid)) if tzid else moment
+
+
+def _duration(value: str) -> timedelta:
+    match = _DURATION.fullmatch(value)
+    if match is None or value.endswith(("P", "T")):
+        raise _Unreadable(value)
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def _to_utc(value, end_of_day: bool) -> datetime:
+    """Same rule as ical_times._to_utc: dates span the whole UTC day, floating times are UTC."""
+    if not isinstance(value, datetime):
+        bound = datetime.max.time() if end_of_day else datetime.min.time()
+        return datetime.combine(value, bound).replace(tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _first_vevent(ics: str) -> Optional[Dict[str, Tuple[str, str]]]:
+    """Return NAME -> (parameters, value) for the wanted properties of the first VEVENT."""
+    begin = ics.find("\nBEGIN:VEVENT")
+    if begin < 0:
+        return None
+    finish = ics.find("\nEND:VEVENT", begin)
+    if finish < 0:
+        return None
+    block = ics[begin + 1:finish]
+    if "\n " in block or "\n\t" in block:
+        block = _FOLD.sub("", block)
+    props: Dict[str, Tuple[str, str]] = {}
+    depth = 0
+    for line in block.splitlines()[1:]:
+        if line.startswith("BEGIN:"):
+            depth += 1  # VALARM and other subcomponents
+            continue
+        if line.startswith("END:"):
+            depth -= 1
+            continue
+        if depth or not line:
+            continue
+        colon = line.find(":")
+        if colon < 0:
+            raise _Unreadable(line)
+        head = line[:colon]
+        name, _, params = head.partition(";")
+        name = name.upper()
+        if name not in _WANTED:
+            continue
+        if '"' in head or name in props or "ENCODING" in params.upper():
+            raise _Unreadable(line)
+        props[name] = (params, line[colon + 1:])
+    return props
+
+
+def scan_event(ics: str) -> Optional[ScannedEvent]:
+    """
+    Read the first VEVENT of an ICS text in one pass.
+    Args:
+        ics: iCalendar text
+    Returns:
+        ScannedEvent, or None if the text has to go through the full parser
+        (no VEVENT found or anything the scanner does not handle)
+    """
+    try:
+        props = _first_vevent(ics)
+        if props is None:
+            return None
+        texts = {name: _unescape(props[name][1]) if name in props else None
+                 for name in ("SUMMARY", "LOCATION", "DESCRIPTION")}
+        uid = props["UID"][1] if "UID" in props else None
+        start = end = None
+        if "DTSTART" in props:
+            dtstart = _date_or_datetime(*props["DTSTART"])
+            start = _to_utc(dtstart, end_of_day=False)
+            if "DTEND" in props:
+                end = _to_utc(_date_or_datetime(*props["DTEND"]), end_of_day=True)
+            elif "DURATION" in props:
+                end = _to_utc(dtstart + _duration(props["DURATION"][1]), end_of_day=True)
+            else:
+                end = _to_utc(dtstart, end_of_day=True)
+        elif "DTEND" in props:
+            end = _to_utc(_date_or_datetime(*props["DTEND"]), end_of_day=True)
+    except _Unreadable:
+        return None
+    return ScannedEvent(uid, texts["SUMMARY"], texts["LOCATION"], texts["DESCRIPTION"], start, end)
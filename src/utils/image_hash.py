@@ -0,0 +1,91 @@
+"""
+Cheap hashes for screenshots.
+
+Used to decide whether the calendar on screen (or a captured screenshot)
+has changed without running OCR or calling an API. The perceptual hashes
+(band_hashes, dhash) tolerate rendering noise and suit change detection;
+content_digest is exact and is what cached extraction results are keyed on.
+"""
+import hashlib
+from typing import List
+
+from PIL import Image
+
+
+def band_hashes(frame: Image.Image, bands: int = 8, levels: int = 16) -> List[str]:
+    """
+    Hash horizontal bands of a frame.
+
+    The frame is converted to grayscale and quantized to `levels` shades
+    first, so anti-aliasing noise and tiny brightness shifts do not count
+    as changes. Comparing the lists band by band shows which part of the
+    calendar changed.
+
+    Args:
+        frame: Frame to hash (ideally already downsampled)
+        bands: Number of horizontal bands
+        levels: Number of gray levels kept before hashing
+    Returns:
+        List of hex digests, one per band, top to bottom
+    """
+    gray = frame.convert('L')
+    step = 256 // levels
+    quantized = gray.point([(i // step) * step for i in range(256)])
+    width, height = quantized.size
+    hashes = []
+    for index in range(bands):
+        top = index * height // bands
+        bottom = (index + 1) * height // bands
+        band = quantized.crop((0, top, width, bottom)).tobytes()
+        hashes.append(hashlib.blake2b(band, digest_size=8).hexdigest())
+    return hashes
+
+
+def changed_bands(previous: List[str], current: List[str]) -> List[int]:
+    """Return the indices of bands whose hashes differ (all bands if the layouts differ)."""
+    if len(previous) != len(current):
+        return list(range(len(current)))
+    return [i for i, (a, b) in enumerate(zip(previous, current)) if a != b]
+
+
+def content_digest(image: Image.Image) -> str:
+    """
+    Exact digest of an image's pixels.
+
+    Unlike dhash, any changed pixel (e.g. one edited digit in a meeting
+    time) gives a different digest; only the encoding of the file is
+    ignored.
+
+    Args:
+        image: Image to hash
+    Returns:
+        Hex SHA-256 of the size and RGB pixels
+    """
+    rgb = image.convert('RGB')
+    digest = hashlib.sha256(f"{rgb.width}x{rgb.height}:".encode())
+    digest.update(rgb.tobytes())
+    return digest.hexdigest()
+
+
+def dhash(image: Image.Image, hash_size: int = 16) -> str:
+    """
+    Difference hash of an image.
+
+    Visually identical images (e.g. re-captures of an unchanged calendar)
+    produce the same hash even if their encoded bytes differ.
+
+    Args:
+        image: Image to hash
+        hash_size: Hash grid width; the hash has hash_size * hash_size bits
+    Returns:
+        Hex string
+    """
+    gray = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = gray.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+    return f"{bits:0{hash_size * hash_size // 4}x}"
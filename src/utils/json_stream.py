@@ -0,0 +1,85 @@
+"""
+Incremental parser for a streamed JSON array of objects.
+
+Feed text chunks as they arrive; every top-level object in the array is
+returned as soon as its closing brace has been seen. Anything before the
+opening bracket (markdown fences, prose) is ignored.
+"""
+import json
+from typing import List
+
+
+class IncrementalJSONArrayParser:
+    """Yield the objects of a JSON array while the array is still being received."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        self.objects_parsed = 0
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing bracket of the array has been seen."""
+        return self._finished
+
+    def feed(self, chunk: str) -> List[dict]:
+        """
+        Add a chunk of text and return the objects it completed.
+        Args:
+            chunk: Next piece of the streamed response
+        Returns:
+            List of objects completed by this chunk (possibly empty)
+        Raises:
+            json.JSONDecodeError if a completed object is not valid JSON
+        """
+        if self._finished:
+            return []
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if not self._in_array:
+                if char == "[":
+                    self._in_array = True
+                pos += 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = pos
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    completed.append(json.loads(buffer[self._object_start:pos + 1]))
+                    self._object_start = None
+            elif char == "]" and self._depth == 0:
+                self._finished = True
+                pos += 1
+                break
+            pos += 1
+
+        # Drop everything already consumed, keeping only a partial object (if any)
+        keep_from = self._object_start if self._object_start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._object_start is not None:
+            self._object_start = 0
+        self.objects_parsed += len(completed)
+        return completed
@@ -0,0 +1,87 @@
+"""
+Per-run metrics (counters and timings) reported in the run log.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+from src.utils.logger import logger
+
+
+class RunMetrics:
+    """Thread-safe registry of counters and observed values for one sync run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.observations: Dict[str, List[float]] = defaultdict(list)
+
+    def incr(self, name: str, amount: int = 1):
+        """Increase a counter."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, name: str, value: float):
+        """Record one observation (a latency, a byte count, ...)."""
+        with self._lock:
+            self.observations[name].append(value)
+
+    def count(self, name: str) -> int:
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self.counters.get(name, 0)
+
+    def total(self, name: str) -> float:
+        """Sum of the observations recorded under a name."""
+        with self._lock:
+            return sum(self.observations.get(name, []))
+
+    def ratio(self, numerator: str, denominator: str) -> float:
+        """Ratio of two counters (0.0 if the denominator is zero)."""
+        with self._lock:
+            total = self.counters.get(denominator, 0)
+            return self.counters.get(numerator, 0) / total if total else 0.0
+
+    def snapshot(self) -> dict:
+        """Return a plain dict of counters and observation summaries."""
+        with self._lock:
+            summary = dict(self.counters)
+            for name, values in self.observations.items():
+                summary[f"{name}.count"] = len(values)
+                summary[f"{name}.total"] = round(sum(values), 3)
+                summary[f"{name}.max"] = round(max(values), 3)
+            return summary
+
+    def export(self) -> dict:
+        """Return the raw counters and observations, e.g. to send back from a worker process."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "observations": {name: list(values) for name, values in self.observations.items()},
+            }
+
+    def merge(self, exported: dict):
+        """Add metrics returned by export() (typically from another process) to this registry."""
+        with self._lock:
+            for name, amount in exported.get("counters", {}).items():
+                self.counters[name] += amount
+            for name, values in exported.get("observations", {}).items():
+                self.observations[name].extend(values)
+
+    def log_summary(self):
+        """Write all metrics to the run log."""
+        summary = self.snapshot()
+        if not summary:
+            return
+        details = ", ".join(f"{name}={value}" for name, value in sorted(summary.items()))
+        logger.info(f"Run metrics: {details}")
+
+    def reset(self):
+        """Clear all metrics (called at the start of each run)."""
+        with self._lock:
+            self.counters.clear()
+            self.observations.clear()
+
+
+# Default registry for modules that report into the current run
+metrics = RunMetrics()
@@ -0,0 +1,137 @@
+"""
+Change-triggered sync.
+
+Instead of running the full capture-OCR-sync pipeline on a fixed
+schedule, watch tiny downsampled frames of the calendar region and run
+the pipeline only after the calendar has changed and then stopped
+changing (debounce), with a minimum spacing between full syncs.
+"""
+import time
+from typing import Callable, List, Optional
+
+from src.interfaces.frame_source import IFrameSource
+from src.utils.image_hash import band_hashes, changed_bands
+from src.utils.logger import logger
+
+
+class CalendarChangeWatcher:
+    """
+    Poll a frame source and trigger a sync once a change has settled.
+
+    A change is "settled" when no further change has been seen for
+    `settle_seconds`. If the settled frame matches the frame at the last
+    successful sync (e.g. a popup came and went) no sync is triggered.
+    """
+
+    def __init__(
+        self,
+        frame_source: IFrameSource,
+        on_change: Callable[[], bool],
+        poll_interval: float = 5.0,
+        settle_seconds: float = 10.0,
+        min_sync_interval: float = 120.0,
+        sync_on_start: bool = True,
+        bands: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            frame_source: Source of downsampled calendar frames
+            on_change: Callable running the full sync; returns True on success
+            poll_interval: Seconds between frame grabs
+            settle_seconds: Quiet period required after the last change
+            min_sync_interval: Minimum seconds between the starts of two syncs
+            sync_on_start: Run a sync on the first poll to establish a baseline
+            bands: Number of horizontal bands hashed per frame
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.frame_source = frame_source
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.min_sync_interval = min_sync_interval
+        self.sync_on_start = sync_on_start
+        self.bands = bands
+        self.clock = clock
+        self.sleep = sleep
+
+        self.sync_count = 0
+        self._previous_hashes: Optional[List[str]] = None
+        self._synced_hashes: Optional[List[str]] = None
+        self._last_change_at: Optional[float] = None
+        self._last_sync_at: Optional[float] = None
+
+    def poll_once(self) -> bool:
+        """
+        Grab one frame, update the change state and sync if due.
+
+        Returns:
+            True if a sync was triggered by this poll
+        """
+        now = self.clock()
+        hashes = band_hashes(self.frame_source.grab_frame(), bands=self.bands)
+
+        if self._previous_hashes is None:
+            self._previous_hashes = hashes
+            if self.sync_on_start:
+                return self._sync(hashes, now)
+            self._synced_hashes = hashes
+            return False
+
+        changed = changed_bands(self._previous_hashes, hashes)
+        self._previous_hashes = hashes
+        if changed:
+            logger.debug(f"Calendar frame changed in band(s) {changed}")
+            self._last_change_at = now
+            return False
+
+        if self._last_change_at is None:
+            return False
+        if now - self._last_change_at < self.settle_seconds:
+            return False
+        if hashes == self._synced_hashes:
+            logger.debug("Calendar returned to its last synced state; no sync needed")
+            self._last_change_at = None
+            return False
+        if self._last_sync_at is not None and now - self._last_sync_at < self.min_sync_interval:
+            return False
+        logger.info(f"Calendar change settled for {now - self._last_change_at:.0f}s; starting sync")
+        return self._sync(hashes, now)
+
+    def _sync(self, hashes: List[str], now: float) -> bool:
+        self._last_sync_at = now
+        self.sync_count += 1
+        try:
+            success = self.on_change()
+        except Exception as e:
+            logger.error(f"Triggered sync raised: {e}", exc_info=True)
+            success = False
+        if success:
+            self._synced_hashes = hashes
+            self._last_change_at = None
+        else:
+            # Keep the change pending so it is retried after min_sync_interval
+            if self._last_change_at is None:
+                self._last_change_at = now
+        return True
+
+    def run(self, max_polls: Optional[int] = None, should_stop: Callable[[], bool] = lambda: False):
+        """
+        Poll until stopped.
+
+        Args:
+            max_polls: Stop after this many polls (None = run forever)
+            should_stop: Callable checked before each poll; return True to stop
+        """
+        polls = 0
+        while not should_stop() and (max_polls is None or polls < max_polls):
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"Frame poll failed: {e}")
+            polls += 1
+            self.sleep(self.poll_interval)
@@ -1,13 +1,42 @@
 import argparse
 import sys
 import os
-from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
 from src.sync_tool import sync_outlook_to_caldav
 from src.utils.logger import setup_logging
 
+def run_watcher(args):
+    """Run the change-triggered sync loop until interrupted."""
+    from src.config import Config
+    from src.interfaces.frame_source import ScreenFrameSource
+    from src.watcher import CalendarChangeWatcher
+
+    logger = setup_logging()
+    config = Config.load_from_file(args.config)
+    watcher = CalendarChangeWatcher(
+        ScreenFrameSource(),
+        on_change=lambda: sync_outlook_to_caldav(
+            args.config,
+            dry_run=args.dry_run,
+            horizon_weeks=args.weeks,
+            bypass_gemini_cache=args.no_gemini_cache,
+        ),
+        poll_interval=config.watch_poll_seconds,
+        settle_seconds=config.watch_settle_seconds,
+        min_sync_interval=config.watch_min_sync_interval_seconds,
+    )
+    logger.info(
+        f"Watching the Outlook calendar for changes every {config.watch_poll_seconds}s "
+        f"(settle {config.watch_settle_seconds}s, min interval {config.watch_min_sync_interval_seconds}s)."
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info(f"Watcher stopped after {watcher.sync_count} sync(s).")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Synchronize Outlook calendar events to CalDAV.")
     parser.add_argument(
@@ -17,10 +46,20 @@ def main():
         help="Path to the configuration file (default: config.json)"
     )
     parser.add_argument(
-        "--date",
-        type=str,
-        default=datetime.now().strftime("%Y-%m-%d"),
-        help="Date for which to sync events (YYYY-MM-DD, default: today)"
+        "--weeks",
+        type=int,
+        default=None,
+        help="Number of weeks to capture, starting with the week shown in Outlook (default: config horizon_weeks)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and sync whenever the Outlook calendar on screen changes."
+    )
+    parser.add_argument(
+        "--no-gemini-cache",
+        action="store_true",
+        help="Always call the Gemini API instead of reusing cached results for identical screenshots."
     )
     parser.add_argument(
         "--dry-run",
@@ -33,7 +72,16 @@ def main():
     logger = setup_logging()
     logger.info("Starting Outlook to CalDAV synchronization.")
 
-    success = sync_outlook_to_caldav(args.config, args.date, dry_run=args.dry_run)
+    if args.watch:
+        run_watcher(args)
+        return
+
+    success = sync_outlook_to_caldav(
+        args.config,
+        dry_run=args.dry_run,
+        horizon_weeks=args.weeks,
+        bypass_gemini_cache=args.no_gemini_cache,
+    )
 
     if success:
         logger.info("Synchronization completed successfully.")
@@ -0,0 +1,441 @@
+"""
+In-memory CalDAV server for tests.
+
+Serves a single calendar collection over real HTTP on localhost, so the
+caldav library and CalDAVClient can be exercised end to end without a
+network service. Every request is recorded so tests can assert on the
+number and kind of round trips; latency and failures can be injected to
+see how the client behaves against a slow or flaky server.
+"""
+import gzip
+import hashlib
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+from xml.sax.saxutils import escape
+
+from icalendar import Calendar
+
+DAV = "DAV:"
+CALDAV = "urn:ietf:params:xml:ns:caldav"
+CALSERVER = "http://calendarserver.org/ns/"
+
+
+def make_ics(uid: str, start: str, end: str, summary: str = "Event") -> str:
+    """Build a minimal VCALENDAR with one UTC event (start/end as YYYYMMDDTHHMMSSZ)."""
+    return (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//stub//EN\r\n"
+        f"BEGIN:VEVENT\r\nUID:{uid}\r\nDTSTAMP:20250101T000000Z\r\n"
+        f"DTSTART:{start}\r\nDTEND:{end}\r\nSUMMARY:{summary}\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+
+class CalDAVStubServer:
+    """A single-calendar CalDAV server backed by a dict of href -> ICS text."""
+
+    def __init__(self, calendar_path: str = "/calendars/user/calendar/"):
+        self.calendar_path = calendar_path
+        self.resources = {}  # href -> {"ics": str, "etag": str}
+        self.requests = []  # (method, path, headers)
+        self.ctag = 0
+        # Answer calendar-query time-range filters with 403, like servers that do not support them
+        self.reject_time_range = False
+        # Set to False to behave like a server without RFC 6578 sync-collection
+        self.supports_sync_collection = True
+        self.changes = []  # (revision, href) for every store/remove
+        # If set, every request is answered with this status (e.g. 429 to simulate throttling)
+        self.status_override = None
+        # Gzip multistatus bodies for clients that send Accept-Encoding: gzip
+        self.compress = True
+        # Send multistatus bodies with Transfer-Encoding: chunked instead of a Content-Length
+        self.chunked = False
+        # Set to False to behave like a server without calendar-access (no calendar-multiget)
+        self.supports_multiget = True
+        self.bodies_served = 0  # event bodies returned by GET or calendar-multiget
+        self.partial_bodies_served = 0  # trimmed bodies returned for partial calendar-data queries
+        # Seconds to wait before answering every request (simulated round-trip time)
+        self.latency = 0.0
+        self.failures = {}  # method -> statuses to answer its next requests with (see fail())
+        self.bytes_received = 0  # request bodies
+        self.bytes_sent = 0  # response bodies, as sent (compressed when gzip applies)
+        self.max_in_flight = 0  # most requests being handled at the same time
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    # --- lifecycle -------------------------------------------------------
+
+    def start(self) -> "CalDAVStubServer":
+        stub = self
+
+        class Handler(_Handler):
+            server_stub = stub
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{self.calendar_path}"
+
+    # --- data helpers ----------------------------------------------------
+
+    def add_event(self, name: str, ics: str) -> str:
+        """Store an event under <calendar>/<name>.ics and return its href."""
+        href = f"{self.calendar_path}{name}.ics"
+        self._store(href, ics)
+        return href
+
+    def _store(self, href: str, ics: str):
+        with self._lock:
+            self.ctag += 1
+            etag = '"' + hashlib.md5(f"{ics}{self.ctag}".encode()).hexdigest() + '"'
+            self.resources[href] = {"ics": ics, "etag": etag}
+            self.changes.append((self.ctag, href))
+
+    def _remove(self, href: str):
+        with self._lock:
+            self.ctag += 1
+            del self.resources[href]
+            self.changes.append((self.ctag, href))
+
+    @property
+    def sync_token(self) -> str:
+        return f"http://stub.invalid/sync/{self.ctag}"
+
+    def etag(self, href: str) -> str:
+        return self.resources[href]["etag"]
+
+    def count(self, method: str = None) -> int:
+        """Number of requests received, optionally only those with the given method."""
+        return sum(1 for m, _, _ in self.requests if method is None or m == method)
+
+    def fail(self, method: str, status: int, times: int = 1):
+        """Answer the next `times` requests with the given method with `status` instead of serving them."""
+        with self._lock:
+            self.failures.setdefault(method, []).extend([status] * times)
+
+    def reset_log(self):
+        self.requests.clear()
+        self.bodies_served = 0
+        self.partial_bodies_served = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.max_in_flight = 0
+
+
+def _multistatus(responses, sync_token: str = None) -> bytes:
+    """Render (href, {tag: xml fragment}) pairs as a 207 multistatus body."""
+    parts = [f'<?xml version="1.0" encoding="utf-8"?>\n<d:multistatus xmlns:d="{DAV}" '
+             f'xmlns:c="{CALDAV}" xmlns:cs="{CALSERVER}">']
+    for href, props in responses:
+        parts.append(f"<d:response><d:href>{escape(href)}</d:href>")
+        if props is None:
+            parts.append("<d:status>HTTP/1.1 404 Not Found</d:status>")
+        else:
+            parts.append("<d:propstat><d:prop>" + "".join(props.values()) +
+                         "</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat>")
+        parts.append("</d:response>")
+    if sync_token:
+        parts.append(f"<d:sync-token>{escape(sync_token)}</d:sync-token>")
+    parts.append("</d:multistatus>")
+    return "".join(parts).encode("utf-8")
+
+
+def _parse_utc(value: str) -> datetime:
+    return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value) -> datetime:
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _bounds(resource: dict):
+    """UTC (start, end) of the first VEVENT in a stored resource, parsed once and kept with it."""
+    if "bounds" not in resource:
+        resource["bounds"] = None
+        for component in Calendar.from_ical(resource["ics"]).walk("VEVENT"):
+            event_start = _as_utc(component["DTSTART"].dt)
+            event_end = _as_utc(component["DTEND"].dt) if "DTEND" in component else event_start + timedelta(seconds=1)
+            resource["bounds"] = (event_start, event_end)
+            break
+    return resource["bounds"]
+
+
+def _overlaps(resource: dict, start, end) -> bool:
+    """RFC 4791 time-range test for the first VEVENT in a stored resource."""
+    bounds = _bounds(resource)
+    if bounds is None:
+        return False
+    event_start, event_end = bounds
+    return (end is None or event_start < end) and (start is None or event_end > start)
+
+
+def _requested_props(root) -> set:
+    prop = root.find(f"{{{DAV}}}prop")
+    if prop is None:
+        return set()
+    return {child.tag for child in prop}
+
+
+def _partial_rules(comp, rules=None) -> dict:
+    """Component name -> property names to keep (None: keep it whole) from a <c:comp> tree."""
+    rules = {} if rules is None else rules
+    if comp.find(f"{{{CALDAV}}}allprop") is not None:
+        rules[comp.get("name")] = None
+    else:
+        rules[comp.get("name")] = {prop.get("name") for prop in comp.findall(f"{{{CALDAV}}}prop")}
+    for child in comp.findall(f"{{{CALDAV}}}comp"):
+        _partial_rules(child, rules)
+    return rules
+
+
+def _partial_ics(ics: str, rules: dict) -> str:
+    """RFC 4791 partial calendar-data: keep only the requested components and properties."""
+    out, stack, keep_line = [], [], False
+    for line in ics.splitlines():
+        if line[:1] in (" ", "\t"):
+            if keep_line:
+                out.append(line)
+            continue
+        name = line.split(":", 1)[0].split(";", 1)[0].upper()
+        parent = stack[-1] if stack else "keep"
+        if name == "BEGIN":
+            component = line.split(":", 1)[1].upper()
+            if parent == "drop":
+                state = "drop"
+            elif parent is None:
+                state = None
+            else:
+                state = rules.get(component, "drop")
+            stack.append(state)
+            keep_line = state != "drop"
+        elif name == "END":
+            keep_line = stack.pop() != "drop"
+        else:
+            keep_line = parent is None or (parent != "drop" and name in parent)
+        if keep_line:
+            out.append(line)
+    return "\r\n".join(out) + "\r\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_stub: CalDAVStubServer = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- plumbing --------------------------------------------------------
+
+    def _path(self) -> str:
+        return unquote(urlparse(self.path).path)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        with self.server_stub._lock:
+            self.server_stub.bytes_received += length
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes = b"", headers=None, content_type="application/xml; charset=utf-8"):
+        headers = dict(headers or {})
+        if (status == 207 and self.server_stub.compress
+                and "gzip" in (self.headers.get("Accept-Encoding") or "")):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        chunked = status == 207 and self.server_stub.chunked
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if body:
+            self.send_header("Content-Type", content_type)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        with self.server_stub._lock:
+            self.server_stub.bytes_sent += len(body)
+            self.server_stub._in_flight -= 1
+        if chunked:
+            for start in range(0, len(body), 1024):
+                piece = body[start:start + 1024]
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        elif body:
+            self.wfile.write(body)
+
+    def _record(self):
+        stub = self.server_stub
+        stub.requests.append((self.command, self._path(), dict(self.headers)))
+        with stub._lock:
+            stub._in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+        if stub.latency:
+            time.sleep(stub.latency)
+        with stub._lock:
+            queued = stub.failures.get(self.command)
+            status = queued.pop(0) if queued else stub.status_override
+        if status:
+            self._body()
+            self._send(status)
+            return True
+        return False
+
+    def _event_props(self, href, wanted, partial=None):
+        resource = self.server_stub.resources[href]
+        props = {}
+        if f"{{{DAV}}}getetag" in wanted or not wanted:
+            props["etag"] = f"<d:getetag>{escape(resource['etag'])}</d:getetag>"
+        if f"{{{CALDAV}}}calendar-data" in wanted and partial:
+            props["data"] = f"<c:calendar-data>{escape(_partial_ics(resource['ics'], partial))}</c:calendar-data>"
+            self.server_stub.partial_bodies_served += 1
+        elif f"{{{CALDAV}}}calendar-data" in wanted:
+            props["data"] = f"<c:calendar-data>{escape(resource['ics'])}</c:calendar-data>"
+            self.server_stub.bodies_served += 1
+        if f"{{{DAV}}}resourcetype" in wanted:
+            props["type"] = "<d:resourcetype/>"
+        return props
+
+    # --- methods ---------------------------------------------------------
+
+    def do_OPTIONS(self):
+        if self._record():
+            return
+        self._send(200, headers={
+            "DAV": "1, 2, 3, calendar-access" if self.server_stub.supports_multiget else "1, 2, 3",
+            "Allow": "OPTIONS, GET, PUT, DELETE, PROPFIND, REPORT",
+        })
+
+    def do_PROPFIND(self):
+        if self._record():
+            return
+        stub = self.server_stub
+        body = self._body()
+        wanted = _requested_props(ET.fromstring(body)) if body else set()
+        path = self._path()
+        if path.rstrip("/") != stub.calendar_path.rstrip("/"):
+            if path in stub.resources:
+                self._send(207, _multistatus([(path, self._event_props(path, wanted))]))
+            else:
+                self._send(404)
+            return
+        props = {
+            "type": "<d:resourcetype><d:collection/><c:calendar/></d:resourcetype>",
+            "name": "<d:displayname>Stub calendar</d:displayname>",
+            "ctag": f"<cs:getctag>{stub.ctag}</cs:getctag>",
+            "token": f"<d:sync-token>{escape(stub.sync_token)}</d:sync-token>",
+            "comps": '<c:supported-calendar-component-set><c:comp name="VEVENT"/></c:supported-calendar-component-set>',
+        }
+        responses = [(stub.calendar_path, props)]
+        if self.headers.get("Depth") == "1":
+            responses += [(href, self._event_props(href, wanted or {f"{{{DAV}}}getetag"}))
+                          for href in sorted(stub.resources)]
+        self._send(207, _multistatus(responses))
+
+    def do_REPORT(self):
+        if self._record():
+            return
+        stub = self.server_stub
+        root = ET.fromstring(self._body())
+        wanted = _requested_props(root)
+        if root.tag == f"{{{CALDAV}}}calendar-query":
+            hrefs = sorted(stub.resources)
+            time_range = root.find(f".//{{{CALDAV}}}time-range")
+            if time_range is not None:
+                if stub.reject_time_range:
+                    # RFC 4791 precondition for filters the server cannot handle
+                    self._send(403, f'<?xml version="1.0"?><d:error xmlns:d="{DAV}" xmlns:c="{CALDAV}">'
+                                    f'<c:supported-filter/></d:error>'.encode())
+                    return
+                start = _parse_utc(time_range.get("start")) if time_range.get("start") else None
+                end = _parse_utc(time_range.get("end")) if time_range.get("end") else None
+                hrefs = [href for href in hrefs if _overlaps(stub.resources[href], start, end)]
+            comp = root.find(f"{{{DAV}}}prop/{{{CALDAV}}}calendar-data/{{{CALDAV}}}comp")
+            partial = _partial_rules(comp) if comp is not None else None
+            self._send(207, _multistatus([(href, self._event_props(href, wanted, partial)) for href in hrefs]))
+            return
+        if root.tag == f"{{{CALDAV}}}calendar-multiget" and stub.supports_multiget:
+            hrefs = [unquote(element.text.strip()) for element in root.findall(f"{{{DAV}}}href")]
+            self._send(207, _multistatus([(href, self._event_props(href, wanted) if href in stub.resources else None)
+                                          for href in hrefs]))
+            return
+        if root.tag == f"{{{DAV}}}sync-collection" and stub.supports_sync_collection:
+            self._sync_collection(root, wanted)
+            return
+        self._send(501)
+
+    def _sync_collection(self, root, wanted):
+        stub = self.server_stub
+        token = (root.findtext(f"{{{DAV}}}sync-token") or "").strip()
+        if token:
+            prefix = "http://stub.invalid/sync/"
+            revision = int(token[len(prefix):]) if token.startswith(prefix) and token[len(prefix):].isdigit() else -1
+            if not 0 <= revision <= stub.ctag:
+                self._send(403, f'<?xml version="1.0"?><d:error xmlns:d="{DAV}"><d:valid-sync-token/></d:error>'.encode())
+                return
+            hrefs = sorted({href for rev, href in stub.changes if rev > revision})
+        else:
+            hrefs = sorted(stub.resources)
+        responses = [(href, self._event_props(href, wanted) if href in stub.resources else None) for href in hrefs]
+        self._send(207, _multistatus(responses, stub.sync_token))
+
+    def do_GET(self):
+        if self._record():
+            return
+        resource = self.server_stub.resources.get(self._path())
+        if resource is None:
+            self._send(404)
+            return
+        self.server_stub.bodies_served += 1
+        self._send(200, resource["ics"].encode("utf-8"), {"ETag": resource["etag"]}, "text/calendar; charset=utf-8")
+
+    def do_PUT(self):
+        if self._record():
+            return
+        stub = self.server_stub
+        path = self._path()
+        body = self._body().decode("utf-8")
+        existing = stub.resources.get(path)
+        if self.headers.get("If-None-Match") == "*" and existing is not None:
+            self._send(412)
+            return
+        if_match = self.headers.get("If-Match")
+        if if_match and (existing is None or existing["etag"] != if_match):
+            self._send(412)
+            return
+        stub._store(path, body)
+        self._send(204 if existing else 201, headers={"ETag": stub.etag(path)})
+
+    def do_DELETE(self):
+        if self._record():
+            return
+        stub = self.server_stub
+        path = self._path()
+        existing = stub.resources.get(path)
+        if existing is None:
+            self._send(404)
+            return
+        if_match = self.headers.get("If-Match")
+        if if_match and existing["etag"] != if_match:
+            self._send(412)
+            return
+        stub._remove(path)
+        self._send(204)
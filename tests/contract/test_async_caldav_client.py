@@ -0,0 +1,129 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from src.async_caldav_client import AsyncCalDAVClient
+from src.interfaces.async_calendar_repository import SyncCalendarRepositoryAdapter
+from src.models.calendar_data import ParsedEvent
+from src.retry_policy import TransientError
+from src.services.async_sync_service import AsyncEventCreationService, AsyncEventDeletionService
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(12):
+        stub.add_event(f"event{i:02d}", make_ics(f"event{i:02d}", "20300101T100000Z", "20300101T110000Z", f"Event {i}"))
+    stub.add_event("past", make_ics("past", "20000101T100000Z", "20000101T110000Z", "Past"))
+    stub.reset_log()
+    yield stub
+    stub.stop()
+
+
+def _run(server, work):
+    async def main():
+        async with AsyncCalDAVClient(server.url, "testuser", "testpass") as client:
+            return await work(client)
+    return asyncio.run(main())
+
+
+def test_range_query_returns_only_future_events(server):
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    events = _run(server, lambda client: client.get_events_in_range(now))
+
+    assert len(events) == 12
+    assert all("BEGIN:VCALENDAR" in ics for ics in events.values())
+    assert server.count("REPORT") == 1
+
+
+def test_range_query_falls_back_to_client_side_filter(server):
+    server.reject_time_range = True
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    events = _run(server, lambda client: client.get_events_in_range(now))
+
+    assert len(events) == 12
+
+
+def test_throttled_range_query_is_not_retried_as_a_full_listing(server):
+    server.fail("REPORT", 503)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    with pytest.raises(TransientError):
+        _run(server, lambda client: client.get_events_in_range(now))
+
+    assert server.count("REPORT") == 1
+
+
+def test_multiget_chunks_run_concurrently(server):
+    hrefs = sorted(server.resources)
+
+    async def work(client):
+        return [item async for item in client.get_events_by_href(hrefs, chunk_size=5)]
+
+    events = _run(server, work)
+
+    assert len(events) == 13
+    assert server.count("REPORT") == 3 and server.count("GET") == 0
+
+
+def test_conditional_put_creates_then_updates(server):
+    ics = make_ics("new-event", "20300201T100000Z", "20300201T110000Z", "New")
+
+    async def work(client):
+        created = await client.put_event("new-event", ics)
+        updated = await client.put_event("new-event", ics.replace("SUMMARY:New", "SUMMARY:Renamed"))
+        return created, updated
+
+    created, updated = _run(server, work)
+
+    assert created and created.created
+    assert updated and not updated.created
+    assert "SUMMARY:Renamed" in server.resources[server.calendar_path + "new-event.ics"]["ics"]
+    put_headers = [h for m, _, h in server.requests if m == "PUT"]
+    assert put_headers[0]["If-None-Match"] == "*"
+    assert put_headers[1]["If-Match"] == created.etag
+
+
+def test_delete_event(server):
+    href = server.calendar_path + "event00.ics"
+
+    assert _run(server, lambda client: client.delete_event(href))
+    assert href not in server.resources
+
+
+def test_async_services_delete_and_create(server):
+    events = [
+        ParsedEvent(start_datetime=f"2030-03-{i + 1:02d}T09:00:00", end_datetime=f"2030-03-{i + 1:02d}T17:00:00",
+                    title=f"Shift {i}")
+        for i in range(6)
+    ]
+
+    async def work(client):
+        deleted = await AsyncEventDeletionService(client, max_concurrency=3).delete_future_events()
+        created = await AsyncEventCreationService(client, max_concurrency=3).create_events(events)
+        return deleted, created
+
+    deleted, created = _run(server, work)
+
+    assert deleted == 12
+    assert created == (6, 0)
+    assert len(server.resources) == 7
+
+
+def test_sync_adapter_serves_blocking_callers(server):
+    adapter = SyncCalendarRepositoryAdapter(AsyncCalDAVClient(server.url, "testuser", "testpass"))
+    try:
+        events = adapter.get_events()
+        by_href = adapter.get_events_by_href(list(events)[:4])
+    finally:
+        adapter.close()
+
+    assert len(events) == 13
+    assert len(by_href) == 4
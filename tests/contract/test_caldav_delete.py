@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from src.caldav_client import CalDAVClient
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(20):
+        stub.add_event(f"event{i:02d}", make_ics(f"event{i:02d}", "20300101T100000Z", "20300101T110000Z", f"Event {i}"))
+    yield stub
+    stub.stop()
+
+
+def test_delete_uses_one_request_per_event(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    events = client.get_events()
+    assert len(events) == 20
+    server.reset_log()
+
+    for href in events:
+        assert client.delete_event(href) is True
+
+    # One DELETE per event and no re-listing of the calendar
+    assert server.count() == 20
+    assert server.count("DELETE") == 20
+    assert server.resources == {}
+
+
+def test_get_events_records_etags(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    events = client.get_events()
+    href = next(iter(events))
+    assert client.etags[str(href)] == server.etag(server.calendar_path + "event00.ics")
+
+
+def test_delete_with_etag_refuses_changed_event(server):
+    client = CalDAVClient(server.url, "testuser", "testpass", verify_etags=True)
+    events = client.get_events()
+    href = server.calendar_path + "event00.ics"
+    url = next(str(h) for h in events if str(h).endswith(href))
+    # Someone edits the event after we listed it
+    server.add_event("event00", make_ics("event00", "20300101T120000Z", "20300101T130000Z", "Moved"))
+    server.reset_log()
+
+    assert client.delete_event(url) is False
+    assert href in server.resources
+    assert server.requests[0][2]["If-Match"] == client.etags[url]
+
+    # An explicit, current ETag is accepted
+    assert client.delete_event(url, etag=server.etag(href)) is True
+    assert href not in server.resources
+
+
+def test_delete_missing_event_counts_as_deleted(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    url = server.url + "does-not-exist.ics"
+    assert client.delete_event(url) is True
+    assert server.count("DELETE") == 1
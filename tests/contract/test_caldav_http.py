@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from src.caldav_client import CalDAVClient
+from src.caldav_http import close_sessions, shared_session
+from src.utils.metrics import metrics
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(30):
+        stub.add_event(f"event{i:02d}", make_ics(f"event{i:02d}", "20300101T100000Z", "20300101T110000Z", f"Event {i}"))
+    metrics.reset()
+    yield stub
+    close_sessions()
+    stub.stop()
+
+
+def test_clients_for_the_same_server_share_one_session(server):
+    first = CalDAVClient(server.url, "testuser", "testpass", pool_size=2)
+    second = CalDAVClient(server.url, "testuser", "testpass", pool_size=6)
+
+    assert first.client.session is second.client.session
+    assert first.client.session.pool_size == 6
+    assert first.client.timeout == (10.0, 60.0)
+
+
+def test_growing_the_pool_closes_the_old_adapter(server, monkeypatch):
+    session = shared_session(server.url, pool_size=2)
+    old_adapter = session.adapters["http://"]
+    closed = []
+    monkeypatch.setattr(old_adapter, "close", lambda: closed.append(old_adapter))
+
+    shared_session(server.url, pool_size=6)
+
+    assert closed == [old_adapter]
+    assert session.adapters["http://"] is session.adapters["https://"] is not old_adapter
+
+
+def test_connections_are_reused_across_syncs(server):
+    CalDAVClient(server.url, "testuser", "testpass").get_events()
+    session = shared_session(server.url)
+    opened = session.stats["connections_opened"]
+
+    # A later sync in the same process builds a new client but keeps the warm connection
+    CalDAVClient(server.url, "testuser", "testpass").get_events()
+
+    assert session.stats["connections_opened"] == opened
+    assert session.stats["connections_reused"] >= 1
+    assert metrics.count("caldav.connections_reused") >= 1
+    assert metrics.count("caldav.http_requests") == session.stats["http_requests"]
+
+
+def test_report_responses_are_compressed(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    events = list(client.get_events_by_href(f"{server.calendar_path}event{i:02d}.ics" for i in range(30)))
+    session = client.client.session
+
+    assert len(events) == 30
+    report_headers = next(h for m, _, h in server.requests if m == "REPORT")
+    assert "gzip" in report_headers["Accept-Encoding"]
+    # The listing decodes to far more than went over the wire
+    decoded = sum(len(e.data) for e in events)
+    assert 0 < session.stats["bytes_received"] < decoded
+    assert session.stats["bytes_sent"] > 0
+
+
+def test_chunked_compressed_listing_counts_wire_bytes(server):
+    server.chunked = True
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    session = client.client.session
+    server.reset_log()
+    before = session.stats["bytes_received"]
+
+    events = client.get_events()
+
+    assert len(events) == 30
+    report = next(h for m, _, h in server.requests if m == "REPORT")
+    assert "gzip" in report["Accept-Encoding"]
+    # Counted as compressed on the wire, not as the larger decoded body
+    assert session.stats["bytes_received"] - before == server.bytes_sent
+
+
+def test_custom_timeouts(server):
+    client = CalDAVClient(server.url, "testuser", "testpass", connect_timeout=2, read_timeout=5)
+    assert client.client.timeout == (2, 5)
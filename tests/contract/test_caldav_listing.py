@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from datetime import datetime, timezone
+
+import pytest
+from src.caldav_client import CalDAVClient, EventRecord, _iter_multistatus, _parse_multistatus
+from src.retry_policy import TransientError
+from src.services.reconciliation import ReconciliationService
+from tests.caldav_stub import CalDAVStubServer, _multistatus, make_ics
+
+NOW = datetime(2030, 1, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(1, 10):
+        stub.add_event(f"event{i}", make_ics(f"event{i}", f"2030010{i}T100000Z", f"2030010{i}T110000Z", f"Event {i}"))
+    yield stub
+    stub.stop()
+
+
+def test_listing_yields_compact_records_without_bodies(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    server.reset_log()
+
+    records = list(client.iter_events(NOW))
+
+    assert [r.fields.uid for r in records] == ["event5", "event6", "event7", "event8", "event9"]
+    assert records[0].fields.end == datetime(2030, 1, 5, 11, tzinfo=timezone.utc)
+    assert not hasattr(records[0], "__dict__")
+    assert server.count() == 1 and server.bodies_served == 0 and server.partial_bodies_served == 5
+    assert client.etags[records[0].url] == records[0].etag
+
+
+def test_body_is_downloaded_once_on_first_access(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    record = next(client.iter_events(NOW))
+    server.reset_log()
+
+    assert "SUMMARY:Event 5" in record.data and "DTSTAMP" in record.data
+    record.data
+    assert server.count() == 1 and server.count("GET") == 1
+
+
+def test_only_deleted_events_are_downloaded_for_backup(server, tmp_path):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    service = ReconciliationService(client, deleted_backup_dir=str(tmp_path))
+    server.reset_log()
+
+    result = service.reconcile([], now=NOW)
+
+    assert result.deleted == 5
+    assert server.count("GET") == 5 and server.count("REPORT") == 1
+    assert "SUMMARY:Event 5" in (tmp_path / "deleted_event5.ics").read_text()
+
+
+def test_throttled_listing_raises_a_transient_error(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    server.fail("REPORT", 503)
+
+    with pytest.raises(TransientError):
+        client.get_events_in_range(NOW)
+
+
+def test_multistatus_is_parsed_as_it_arrives():
+    body = _multistatus([(f"/cal/event{i}.ics", {"etag": f'<d:getetag>"{i}"</d:getetag>'}) for i in range(50)])
+    consumed = []
+
+    def chunks():
+        for start in range(0, len(body), 100):
+            consumed.append(start)
+            yield body[start:start + 100]
+
+    stream = _iter_multistatus(chunks())
+    first = next(stream)
+
+    assert len(consumed) < len(body) // 100 / 10
+    assert [first, *stream] == _parse_multistatus(body)[0]
+
+
+def test_records_are_accepted_by_the_range_filter(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    server.reject_time_range = True
+
+    events = client.get_events_in_range(NOW)
+
+    assert sorted(r.fields.uid for r in events.values()) == ["event5", "event6", "event7", "event8", "event9"]
+    assert all(isinstance(r, EventRecord) for r in events.values())
+    assert server.bodies_served == 0
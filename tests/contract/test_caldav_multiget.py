@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from src.caldav_client import CalDAVClient
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(25):
+        stub.add_event(f"event{i:02d}", make_ics(f"event{i:02d}", "20300101T100000Z", "20300101T110000Z", f"Event {i}"))
+    stub.reset_log()
+    yield stub
+    stub.stop()
+
+
+def _hrefs(server):
+    return sorted(server.resources)
+
+
+def test_multiget_fetches_bodies_in_chunks(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+
+    events = list(client.get_events_by_href(_hrefs(server), chunk_size=10))
+
+    assert len(events) == 25
+    assert server.count("REPORT") == 3 and server.count("GET") == 0
+    assert server.count("OPTIONS") == 1
+    first = events[0]
+    assert "SUMMARY:Event 0" in first.data
+    assert client.etags[str(first.url)] == server.etag(server.calendar_path + "event00.ics")
+
+
+def test_results_are_streamed_per_chunk(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+
+    events = client.get_events_by_href(_hrefs(server), chunk_size=10)
+    next(events)
+
+    assert server.count("REPORT") == 1
+
+
+def test_missing_events_are_skipped(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    hrefs = _hrefs(server)[:3] + [server.calendar_path + "gone.ics"]
+
+    events = list(client.get_events_by_href(hrefs))
+
+    assert len(events) == 3
+
+
+def test_falls_back_to_get_without_calendar_access(server):
+    server.supports_multiget = False
+    client = CalDAVClient(server.url, "testuser", "testpass")
+
+    events = list(client.get_events_by_href(_hrefs(server)[:5]))
+
+    assert len(events) == 5
+    assert server.count("GET") == 5 and server.count("REPORT") == 0
+
+
+def test_falls_back_to_get_when_report_is_rejected(server):
+    server.supports_multiget = False
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    client._multiget_supported = True  # advertised, but the REPORT fails
+
+    events = list(client.get_events_by_href(_hrefs(server)[:5], chunk_size=2))
+
+    assert len(events) == 5
+    assert server.count("REPORT") == 1 and server.count("GET") == 5
+
+
+def test_sync_state_delta_uses_multiget(server, tmp_path):
+    client = CalDAVClient(server.url, "testuser", "testpass", sync_state_filepath=str(tmp_path / "state.json"))
+
+    client.refresh_sync_state()
+
+    assert len(client.sync_state.events) == 25
+    assert server.count("GET") == 0
+    assert server.bodies_served == 25
@@ -3,47 +3,106 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 import pytest
-from unittest.mock import Mock, patch
-from src.caldav_client import CalDAVClient
+from src.caldav_client import CALDAV_WRITE_POLICY, CalDAVClient, map_parsed_event_to_ical
+from src.models.calendar_data import ParsedEvent
+from src.retry_policy import TransientError, call_with_retry
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+# Example iCalendar data (minimal for contract test)
+ICAL_DATA = make_ics("test_uid", "20250922T110000Z", "20250922T120000Z", "Test Event")
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    yield stub
+    stub.stop()
 
-# Mock CalDAV server URL for testing
-MOCK_CALDAV_URL = "http://localhost:8000/calendars/user/calendar/"
 
 @pytest.fixture
-def caldav_client():
-    return CalDAVClient(MOCK_CALDAV_URL, "testuser", "testpass")
-
-def test_put_caldav_event_contract(caldav_client):
-    """Test that CalDAVClient.put_event sends the correct data to the calendar"""
-    
-    # Example iCalendar data (minimal for contract test)
-    ical_data = """
-BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//Example Corp//Calendar Sync//EN
-BEGIN:VEVENT
-UID:test_uid
-DTSTAMP:20250922T100000Z
-DTSTART:20250922T110000Z
-DTEND:20250922T120000Z
-SUMMARY:Test Event
-END:VEVENT
-END:VCALENDAR
-"""
-
-    # Mock the calendar.add_event method
-    with patch.object(caldav_client.calendar, 'add_event') as mock_add_event:
-        # Configure the mock to succeed
-        mock_add_event.return_value = Mock()
-        
-        result = caldav_client.put_event("test_uid", ical_data)
-        
-        # Verify the result
-        assert result is True
-        # Verify add_event was called once with the ical data
-        mock_add_event.assert_called_once_with(ical_data)
-        # Verify the ical data contains expected fields
-        args = mock_add_event.call_args[0][0]
-        assert "BEGIN:VEVENT" in args
-        assert "SUMMARY:Test Event" in args
-        assert "UID:test_uid" in args
+def caldav_client(server):
+    return CalDAVClient(server.url, "testuser", "testpass")
+
+
+def test_put_caldav_event_contract(server, caldav_client):
+    """Test that CalDAVClient.put_event creates <calendar>/<uid>.ics with one conditional PUT"""
+    result = caldav_client.put_event("test_uid", ICAL_DATA)
+
+    href = server.calendar_path + "test_uid.ics"
+    assert result
+    assert result.created is True
+    assert result.etag == server.etag(href)
+    assert server.count() == 1
+    method, path, headers = server.requests[0]
+    assert (method, path) == ("PUT", href)
+    assert headers["If-None-Match"] == "*"
+    stored = server.resources[href]["ics"]
+    assert "SUMMARY:Test Event" in stored
+    assert "UID:test_uid" in stored
+
+
+def test_put_with_known_etag_is_conditional_update(server, caldav_client):
+    first = caldav_client.put_event("test_uid", ICAL_DATA)
+    server.reset_log()
+
+    result = caldav_client.put_event("test_uid", ICAL_DATA.replace("Test Event", "Renamed"))
+
+    assert result and result.created is False
+    assert server.requests[0][2]["If-Match"] == first.etag
+    assert "SUMMARY:Renamed" in server.resources[server.calendar_path + "test_uid.ics"]["ics"]
+
+
+def test_put_refuses_to_overwrite_concurrent_change(server, caldav_client):
+    caldav_client.put_event("test_uid", ICAL_DATA)
+    # Someone edits the event after we wrote it
+    server.add_event("test_uid", ICAL_DATA.replace("Test Event", "Edited elsewhere"))
+
+    result = caldav_client.put_event("test_uid", ICAL_DATA)
+
+    assert not result
+    assert result.status == 412
+    assert "Edited elsewhere" in server.resources[server.calendar_path + "test_uid.ics"]["ics"]
+
+
+def test_rerun_with_deterministic_uid_updates_instead_of_duplicating(server):
+    event = ParsedEvent("2025-10-27T09:00:00", "2025-10-27T10:00:00", "Standup")
+    ical_data, uid = map_parsed_event_to_ical(event)
+    assert map_parsed_event_to_ical(ParsedEvent("2025-10-27T09:00:00", "2025-10-27T10:00:00", " standup "))[1] == uid
+
+    assert CalDAVClient(server.url, "testuser", "testpass").put_event(uid, ical_data)
+    # A fresh client (next run) knows no ETags: the create is refused and turned into an update
+    result = CalDAVClient(server.url, "testuser", "testpass").put_event(uid, ical_data)
+
+    assert result
+    assert list(server.resources) == [f"{server.calendar_path}{uid}.ics"]
+
+
+def test_rate_limited_put_raises_transient_error(server, caldav_client):
+    server.status_override = 429
+
+    with pytest.raises(TransientError) as excinfo:
+        caldav_client.put_event("test_uid", ICAL_DATA)
+
+    assert excinfo.value.status == 429
+
+
+def test_server_error_is_retried_by_write_policy(server, caldav_client):
+    server.fail("PUT", 503)
+
+    result = call_with_retry(lambda: caldav_client.put_event("test_uid", ICAL_DATA), CALDAV_WRITE_POLICY,
+                             sleep=lambda seconds: None)
+
+    assert result and result.created
+    assert server.count("PUT") == 2
+
+
+def test_rejected_precondition_is_not_retried(server, caldav_client):
+    caldav_client.put_event("test_uid", ICAL_DATA)
+    server.add_event("test_uid", ICAL_DATA.replace("Test Event", "Edited elsewhere"))
+    server.reset_log()
+
+    result = call_with_retry(lambda: caldav_client.put_event("test_uid", ICAL_DATA), CALDAV_WRITE_POLICY,
+                             sleep=lambda seconds: None)
+
+    assert not result and result.status == 412
+    assert server.count("PUT") == 1
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from datetime import datetime, timezone
+import pytest
+from src.caldav_client import CalDAVClient
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+NOW = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    # Lots of history and a few upcoming events
+    for i in range(50):
+        stub.add_event(f"past{i:02d}", make_ics(f"past{i:02d}", f"2029{1 + i % 12:02d}01T100000Z", f"2029{1 + i % 12:02d}01T110000Z"))
+    stub.add_event("ongoing", make_ics("ongoing", "20300101T110000Z", "20300101T130000Z"))
+    stub.add_event("later", make_ics("later", "20300102T090000Z", "20300102T100000Z"))
+    stub.add_event("next-month", make_ics("next-month", "20300201T090000Z", "20300201T100000Z"))
+    yield stub
+    stub.stop()
+
+
+def _names(events):
+    return sorted(str(href).rsplit("/", 1)[-1] for href in events)
+
+
+def test_range_query_returns_only_future_events(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    server.reset_log()
+    events = client.get_events_in_range(NOW)
+    assert _names(events) == ["later.ics", "next-month.ics", "ongoing.ics"]
+    assert server.count() == 1 and server.count("REPORT") == 1
+    assert all(str(href) in client.etags for href in events)
+
+
+def test_range_query_with_end(server):
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    events = client.get_events_in_range(NOW, datetime(2030, 1, 15, tzinfo=timezone.utc))
+    assert _names(events) == ["later.ics", "ongoing.ics"]
+
+
+def test_falls_back_to_client_side_filter(server):
+    server.reject_time_range = True
+    client = CalDAVClient(server.url, "testuser", "testpass")
+    events = client.get_events_in_range(NOW)
+    assert _names(events) == ["later.ics", "next-month.ics", "ongoing.ics"]
+    assert server.count("REPORT") == 2
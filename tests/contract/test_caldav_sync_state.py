@@ -0,0 +1,111 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import json
+from datetime import datetime, timezone
+import pytest
+from src.caldav_client import CalDAVClient
+from src.models.calendar_data import ParsedEvent
+from src.retry_policy import TransientError
+from src.services.reconciliation import ReconciliationService
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(10):
+        stub.add_event(f"event{i}", make_ics(f"event{i}", f"2030010{i}T100000Z", f"2030010{i}T110000Z", f"Event {i}"))
+    yield stub
+    stub.stop()
+
+
+def _client(server, tmp_path):
+    return CalDAVClient(server.url, "testuser", "testpass", sync_state_filepath=str(tmp_path / "state.json"))
+
+
+def test_second_run_downloads_only_changes(server, tmp_path):
+    first = _client(server, tmp_path)
+    assert first.refresh_sync_state() == "sync-token"
+    assert server.bodies_served == 10
+
+    server.add_event("event3", make_ics("event3", "20300103T120000Z", "20300103T130000Z", "Moved"))
+    server.add_event("new", make_ics("new", "20300110T100000Z", "20300110T110000Z", "New"))
+    server._remove(server.calendar_path + "event5.ics")
+    server.reset_log()
+
+    # A later run loads the persisted token and cache
+    second = _client(server, tmp_path)
+    assert second.refresh_sync_state() == "sync-token"
+    assert server.bodies_served == 2
+    events = second.get_events_in_range(NOW)
+    names = sorted(href.rsplit("/", 1)[-1] for href in events)
+    assert "event5.ics" not in names and "new.ics" in names and len(names) == 10
+    moved = next(e for h, e in events.items() if h.endswith("event3.ics"))
+    assert "Moved" in moved.data
+
+
+def test_state_is_persisted_to_file(server, tmp_path):
+    _client(server, tmp_path).refresh_sync_state()
+    with open(tmp_path / "state.json") as f:
+        state = json.load(f)
+    assert state["calendar_url"] == server.url
+    assert state["sync_token"] == server.sync_token
+    assert len(state["events"]) == 10
+
+
+def test_expired_token_triggers_full_resync(server, tmp_path):
+    client = _client(server, tmp_path)
+    client.refresh_sync_state()
+    client.sync_state.sync_token = "http://stub.invalid/sync/999"
+    server._remove(server.calendar_path + "event0.ics")
+    server.reset_log()
+    assert client.refresh_sync_state() == "sync-token"
+    assert server.count("REPORT") == 2
+    # Bodies with unchanged ETags are still reused
+    assert server.bodies_served == 0
+    assert len(client.sync_state.events) == 9
+
+
+def test_ctag_and_etag_fallback_without_sync_collection(server, tmp_path):
+    server.supports_sync_collection = False
+    client = _client(server, tmp_path)
+    assert client.refresh_sync_state() == "etag"
+    assert server.bodies_served == 10
+    server.reset_log()
+
+    assert client.refresh_sync_state() == "ctag"
+    assert server.bodies_served == 0 and server.count("PROPFIND") == 1
+
+    server.add_event("event1", make_ics("event1", "20300101T150000Z", "20300101T160000Z", "Changed"))
+    server.reset_log()
+    assert client.refresh_sync_state() == "etag"
+    assert server.bodies_served == 1
+
+
+def test_transient_sync_collection_error_is_retried_not_disabled(server, tmp_path):
+    client = _client(server, tmp_path)
+    server.fail("REPORT", 503)
+
+    with pytest.raises(TransientError):
+        client.refresh_sync_state()
+
+    assert client.refresh_sync_state() == "sync-token"
+    assert server.count("PROPFIND") == 2  # ctag only, no ETag listing
+
+
+def test_writes_are_saved_at_the_end_of_a_run(server, tmp_path):
+    client = _client(server, tmp_path)
+    client.refresh_sync_state()
+    event = ParsedEvent(start_datetime="2030-01-20T09:00:00", end_datetime="2030-01-20T10:00:00", title="New")
+
+    result = ReconciliationService(client).reconcile([event], now=NOW)
+
+    assert result.created == 1 and result.deleted == 10
+    with open(tmp_path / "state.json", encoding="utf-8") as f:
+        saved = json.load(f)["events"]
+    assert len(saved) == 1
+    assert "SUMMARY:New" in next(iter(saved.values()))["ics"]
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+from src.caldav_client import CalDAVClient
+from src.calendar_mirror import CalendarMirror, MirroredEvent
+from src.services.reconciliation import RemoteEvent
+from tests.caldav_stub import CalDAVStubServer, make_ics
+
+NOW = datetime(2030, 1, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    for i in range(1, 10):
+        stub.add_event(f"event{i}", make_ics(f"event{i}", f"2030010{i}T100000Z", f"2030010{i}T110000Z", f"Event {i}"))
+    yield stub
+    stub.stop()
+
+
+def _client(server, tmp_path):
+    return CalDAVClient(server.url, "testuser", "testpass", sync_state_filepath=str(tmp_path / "mirror.sqlite"))
+
+
+def test_mirror_rows_are_parsed_once_and_indexed(server, tmp_path):
+    client = _client(server, tmp_path)
+    client.refresh_sync_state()
+
+    db = sqlite3.connect(tmp_path / "mirror.sqlite")
+    row = db.execute("SELECT uid, dtstart, dtend, summary, content_hash FROM events WHERE uid = 'event3'").fetchone()
+    plan = " ".join(str(r) for r in db.execute(
+        "EXPLAIN QUERY PLAN SELECT href FROM events WHERE dtend > 0 AND dtstart < 1"))
+
+    assert row[:4] == ("event3", int(datetime(2030, 1, 3, 10, tzinfo=timezone.utc).timestamp()),
+                       int(datetime(2030, 1, 3, 11, tzinfo=timezone.utc).timestamp()), "Event 3")
+    assert len(row[4]) == 40
+    assert "USING INDEX" in plan
+
+
+def test_unchanged_ctag_means_no_listing_or_downloads(server, tmp_path):
+    _client(server, tmp_path).refresh_sync_state()
+    server.reset_log()
+
+    client = _client(server, tmp_path)
+    assert client.refresh_sync_state() == "ctag"
+    assert server.count() == 1 and server.count("PROPFIND") == 1
+    assert server.bodies_served == 0
+
+
+def test_range_query_returns_parsed_future_events(server, tmp_path):
+    client = _client(server, tmp_path)
+
+    events = client.get_events_in_range(NOW)
+
+    assert sorted(e.uid for e in events.values()) == ["event5", "event6", "event7", "event8", "event9"]
+    event = events[client.event_url("event5")]
+    assert isinstance(event, MirroredEvent) and "SUMMARY:Event 5" in event.data
+    assert client.etags[event.url] == event.etag
+
+
+def test_reconciler_reads_mirror_columns_without_parsing(server, tmp_path, monkeypatch):
+    events = _client(server, tmp_path).get_events_in_range(NOW)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ICS body parsed")
+    monkeypatch.setattr("src.services.reconciliation.get_event_fields", fail)
+    remotes = [RemoteEvent.from_event(href, event) for href, event in events.items()]
+
+    assert sorted(r.key for r in remotes)[0] == ("event 5", "2030-01-05T10:00", "2030-01-05T11:00")
+
+
+def test_own_writes_are_not_downloaded_again(server, tmp_path):
+    client = _client(server, tmp_path)
+    client.refresh_sync_state()
+    client.put_event("new", make_ics("new", "20300120T100000Z", "20300120T110000Z", "New"))
+    client.delete_event(client.event_url("event1"))
+    server.reset_log()
+
+    next_run = _client(server, tmp_path)
+    assert next_run.refresh_sync_state() == "sync-token"
+    assert server.bodies_served == 0
+    assert len(next_run.sync_state) == 9
+    assert next_run.sync_state.etag(client.event_url("new")) == server.etag(server.calendar_path + "new.ics")
+
+
+def test_mirror_for_another_calendar_is_emptied(server, tmp_path):
+    path = str(tmp_path / "mirror.sqlite")
+    _client(server, tmp_path).refresh_sync_state()
+
+    mirror = CalendarMirror(path, "https://elsewhere.invalid/cal/")
+
+    assert len(mirror) == 0 and mirror.ctag is None
@@ -29,12 +29,13 @@ def cleanup_test_files():
         if os.path.exists(f):
             os.remove(f)
 
-def create_test_config(caldav_url, username, password, calendar_name):
+def create_test_config(caldav_url, username, password, calendar_name, sync_state_filepath=None):
     config_data = {
         "caldav_url": caldav_url,
         "caldav_username": username,
         "caldav_password": password,
-        "outlook_calendar_name": calendar_name
+        "outlook_calendar_name": calendar_name,
+        "sync_state_filepath": sync_state_filepath
     }
     with open(TEST_CONFIG_FILE, 'w') as f:
         json.dump(config_data, f)
@@ -51,10 +52,11 @@ def create_dummy_screenshot(filepath: str, text_content: str):
     d.text((10,10), text_content, fill=(0,0,0), font=fnt)
     img.save(filepath)
 
-def test_sync_outlook_to_caldav_integration_success(mocker):
+def test_sync_outlook_to_caldav_integration_success(mocker, tmp_path):
     # Mock external dependencies
     mocker.patch('src.sync_tool.launch_outlook', return_value=True)
     mocker.patch('src.sync_tool.navigate_to_calendar', return_value=True)
+    mocker.patch('src.sync_tool.wait_for_outlook_calendar', return_value=True)
     mocker.patch('src.sync_tool.capture_screenshot', return_value=True)
     mocker.patch('src.sync_tool.process_image_with_ocr', return_value=[ParsedEvent(
         start_datetime="2025-09-23T10:00:00",
@@ -90,19 +92,20 @@ END:VCALENDAR
 </D:multistatus>
 ''', status_code=207)
 
-    create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar")
-    # Patch CalDAVClient.get_events to avoid real HTTP requests
-    mocker.patch('src.caldav_client.CalDAVClient.get_events', return_value={})
+    create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar", str(tmp_path / "sync_state.sqlite"))
+    # Patch CalDAVClient.get_events_in_range to avoid real HTTP requests
+    mocker.patch('src.caldav_client.CalDAVClient.get_events_in_range', return_value={})
     # Patch CalDAVClient.put_event to return a mock response with status_code=201
     mock_response = mocker.Mock()
     mock_response.status_code = 201
     mocker.patch('src.caldav_client.CalDAVClient.put_event', return_value=mock_response)
-    result = sync_outlook_to_caldav(TEST_CONFIG_FILE, "2025-09-23")
+    result = sync_outlook_to_caldav(TEST_CONFIG_FILE)
     assert result is True
 
-def test_sync_outlook_to_caldav_integration_no_event(mocker):
+def test_sync_outlook_to_caldav_integration_no_event(mocker, tmp_path):
     mocker.patch('src.sync_tool.launch_outlook', return_value=True)
     mocker.patch('src.sync_tool.navigate_to_calendar', return_value=True)
+    mocker.patch('src.sync_tool.wait_for_outlook_calendar', return_value=True)
     mocker.patch('src.sync_tool.capture_screenshot', return_value=True)
     mocker.patch('src.sync_tool.process_image_with_ocr', return_value="")
     mocker.patch('src.sync_tool.parse_outlook_event_from_ocr', return_value=None)
@@ -121,23 +124,24 @@ END:VCALENDAR
 </D:multistatus>
 ''', status_code=207)
 
-    create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar")
+    create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar", str(tmp_path / "sync_state.sqlite"))
     create_dummy_screenshot(TEST_SCREENSHOT_FILE, "")
-    # Patch CalDAVClient.get_events to avoid real HTTP requests
-    mocker.patch('src.caldav_client.CalDAVClient.get_events', return_value={})
-    result = sync_outlook_to_caldav(TEST_CONFIG_FILE, "2025-09-23")
+    # Patch CalDAVClient.get_events_in_range to avoid real HTTP requests
+    mocker.patch('src.caldav_client.CalDAVClient.get_events_in_range', return_value={})
+    result = sync_outlook_to_caldav(TEST_CONFIG_FILE)
     assert result is True
 
-def test_sync_outlook_to_caldav_integration_outlook_launch_failure(mocker):
+def test_sync_outlook_to_caldav_integration_outlook_launch_failure(mocker, tmp_path):
     mocker.patch('src.sync_tool.launch_outlook', return_value=False)
 
-    create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar")
-    result = sync_outlook_to_caldav(TEST_CONFIG_FILE, "2025-09-23")
+    create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar", str(tmp_path / "sync_state.sqlite"))
+    result = sync_outlook_to_caldav(TEST_CONFIG_FILE)
     assert result is False
 
-def test_sync_outlook_to_caldav_integration_caldav_put_failure(mocker):
+def test_sync_outlook_to_caldav_integration_caldav_put_failure(mocker, tmp_path):
     mocker.patch('src.sync_tool.launch_outlook', return_value=True)
     mocker.patch('src.sync_tool.navigate_to_calendar', return_value=True)
+    mocker.patch('src.sync_tool.wait_for_outlook_calendar', return_value=True)
     mocker.patch('src.sync_tool.capture_screenshot', return_value=True)
     mocker.patch('src.sync_tool.process_image_with_ocr', return_value="10:00 AM - 11:00 AM Test Event")
     mocker.patch('src.sync_tool.parse_outlook_event_from_ocr', return_value=ParsedEvent(
@@ -158,9 +162,9 @@ PRODID:-//Example Corp//Calendar Sync//EN
 END:VCALENDAR
 ''', status_code=200)
 
-        create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar")
+        create_test_config(MOCK_CALDAV_URL, "testuser", "testpass", "Calendar", str(tmp_path / "sync_state.sqlite"))
         create_dummy_screenshot(TEST_SCREENSHOT_FILE, "Dummy text for OCR")
 
-        result = sync_outlook_to_caldav(TEST_CONFIG_FILE, "2025-09-23")
+        result = sync_outlook_to_caldav(TEST_CONFIG_FILE)
 
         assert result is False
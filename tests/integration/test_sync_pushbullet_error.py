@@ -39,7 +39,7 @@ def test_sync_triggers_pushbullet_error(patch_pushbullet_notify):
     monkeypatch = pytest.MonkeyPatch()
     monkeypatch.setattr(src.caldav_client.CalDAVClient, "delete_event", always_fail_delete_event)
     try:
-        sync_outlook_to_caldav(config_filepath="config.json", current_date="2025-09-23", notification_func=patch_pushbullet_notify.send)
+        sync_outlook_to_caldav(config_filepath="config.json", notification_func=patch_pushbullet_notify.send)
     except Exception:
         pass
     monkeypatch.undo()
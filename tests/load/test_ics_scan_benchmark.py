@@ -0,0 +1,92 @@
+"""
+Benchmark of the one-pass ICS scanner against full icalendar parsing.
+
+Reads the times and text fields of a calendar mixing UTC, TZID, all-day
+and DURATION events with the scanner and with icalendar, and checks both
+agree and that each body is parsed once. The timed 10k-event comparison
+is opt-in, as wall-clock ratios are unreliable on a loaded machine:
+
+    ICS_SCAN_BENCHMARK=1 python -m pytest -q -s tests/load/test_ics_scan_benchmark.py
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import time
+
+import pytest
+from src.utils.ical_times import _parse_fields, clear_fields_cache, get_event_fields
+from src.utils.ics_scanner import scan_event
+from src.utils.metrics import metrics
+
+EVENTS = 10_000
+# Events per calendar in the tests that always run
+SAMPLE = 400
+BENCHMARK = os.environ.get("ICS_SCAN_BENCHMARK") == "1"
+
+
+class FakeEvent:
+    def __init__(self, url, data, etag):
+        self.url = url
+        self.data = data
+        self.etag = etag
+
+
+def _calendar(count):
+    shapes = [
+        ("DTSTART:20300107T{h:02d}0000Z", "DTEND:20300107T{h:02d}3000Z"),
+        ("DTSTART;TZID=Europe/London:20300107T{h:02d}0000", "DTEND;TZID=Europe/London:20300107T{h:02d}4500"),
+        ("DTSTART;VALUE=DATE:20300107", "DTEND;VALUE=DATE:20300108"),
+        ("DTSTART:20300107T{h:02d}0000", "DURATION:PT1H"),
+    ]
+    events = []
+    for i in range(count):
+        start, end = shapes[i % len(shapes)]
+        events.append("\r\n".join([
+            "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//bench//EN", "BEGIN:VEVENT",
+            f"UID:bench-{i}", "DTSTAMP:20250101T000000Z", start.format(h=i % 24), end.format(h=i % 24),
+            f"SUMMARY:Meeting {i}", "LOCATION:Room 4\\, Building B", "DESCRIPTION:Agenda\\nNotes",
+            "END:VEVENT", "END:VCALENDAR", "",
+        ]))
+    return events
+
+
+def _timed(func, items):
+    began = time.perf_counter()
+    results = [func(item) for item in items]
+    return results, time.perf_counter() - began
+
+
+def test_scanner_agrees_with_full_parsing():
+    calendar = _calendar(SAMPLE)
+
+    assert [scan_event(ics) for ics in calendar] == [_parse_fields(ics) for ics in calendar]
+
+
+@pytest.mark.skipif(not BENCHMARK, reason="set ICS_SCAN_BENCHMARK=1 to run")
+def test_scanner_beats_full_parsing_on_10k_events():
+    calendar = _calendar(EVENTS)
+
+    scanned, scan_seconds = _timed(scan_event, calendar)
+    parsed, parse_seconds = _timed(_parse_fields, calendar)
+
+    print(f"\n{EVENTS} events: scanner {scan_seconds:.3f}s, icalendar {parse_seconds:.3f}s "
+          f"({parse_seconds / scan_seconds:.1f}x)")
+    assert scanned == parsed
+    assert scan_seconds * 5 < parse_seconds
+
+
+def test_unchanged_events_are_read_once():
+    clear_fields_cache()
+    metrics.reset()
+    count = EVENTS if BENCHMARK else SAMPLE
+    events = [FakeEvent(f"/cal/bench-{i}.ics", ics, f'"{i}"') for i, ics in enumerate(_calendar(count))]
+
+    first, first_seconds = _timed(get_event_fields, events)
+    for event in events:
+        event.data = None  # a cache hit must not read the body again
+    cached, cached_seconds = _timed(get_event_fields, events)
+
+    print(f"\n{count} events: first read {first_seconds:.3f}s, cached {cached_seconds:.3f}s")
+    assert metrics.count("ics.full_parses") == 0
+    assert all(a is b for a, b in zip(first, cached))
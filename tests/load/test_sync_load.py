@@ -0,0 +1,187 @@
+"""
+Sync load tests against the in-process CalDAV stub.
+
+Runs CalendarSyncOrchestrator (the part of sync_outlook_to_caldav after
+screen capture) against calendars of growing size and reports, per run,
+the requests sent by method, the bytes on the wire and the wall time.
+Read traffic must not grow with the number of writes, which catches
+paths that re-list the calendar per event.
+
+Only the 100-event calendar runs by default. Larger ones are opt-in:
+
+    SYNC_LOAD_SIZES=100,10000,100000 python -m pytest -q -s tests/load
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pytest
+from src.caldav_client import CalDAVClient, map_parsed_event_to_ical
+from src.caldav_http import close_sessions
+from src.caldav_write_pool import CalDAVWritePool
+from src.interfaces.event_extractor import IEventExtractor
+from src.interfaces.notification_service import INotificationService
+from src.models.calendar_data import ParsedEvent
+from src.services.reconciliation import ReconciliationService
+from src.services.sync_service import CalendarSyncOrchestrator
+from tests.caldav_stub import CalDAVStubServer
+
+ENABLED_SIZES = {int(size) for size in os.environ.get("SYNC_LOAD_SIZES", "100").split(",") if size.strip()}
+# Requests a sync may send besides its writes (the range listing, plus slack for discovery)
+READ_OVERHEAD = 3
+
+
+class StaticExtractor(IEventExtractor):
+    def __init__(self, events):
+        self.events = events
+
+    def extract_events(self, image_path):
+        return list(self.events)
+
+
+class RecordingNotifier(INotificationService):
+    def __init__(self):
+        self.messages = []
+
+    def send_notification(self, message, title):
+        self.messages.append(message)
+        return True
+
+
+@dataclass
+class LoadReport:
+    size: int
+    requests: Counter
+    bytes_sent: int
+    bytes_received: int
+    seconds: float
+
+    @property
+    def writes(self) -> int:
+        return self.requests["PUT"] + self.requests["DELETE"]
+
+    @property
+    def reads(self) -> int:
+        return sum(self.requests.values()) - self.writes
+
+    def __str__(self):
+        by_method = ", ".join(f"{method} {count}" for method, count in sorted(self.requests.items()))
+        return (f"{self.size} events: {sum(self.requests.values())} requests ({by_method}), "
+                f"{self.bytes_received} B up, {self.bytes_sent} B down, {self.seconds:.2f}s")
+
+
+def _events(count, start=datetime(2030, 1, 7, 9, 0)):
+    """One hour-long event per hour from `start`."""
+    events = []
+    for i in range(count):
+        begin = start + timedelta(hours=i)
+        events.append(ParsedEvent(
+            start_datetime=begin.isoformat(),
+            end_datetime=(begin + timedelta(hours=1)).isoformat(),
+            title=f"Meeting {i}",
+            location="Room 1",
+        ))
+    return events
+
+
+def _seed(server, events):
+    for event in events:
+        ical_data, uid = map_parsed_event_to_ical(event)
+        server.add_event(uid, ical_data)
+
+
+def _outlook_view(events, churn):
+    """The calendar as Outlook shows it next: `churn` events dropped, moved rooms and added each."""
+    kept = events[:-churn]
+    for event in kept[:churn]:
+        event.location = "Room 2"
+    return kept + _events(churn, start=datetime(2035, 1, 1, 9, 0))
+
+
+def _sync(server, events, write_concurrency=4):
+    notifier = RecordingNotifier()
+    pool = CalDAVWritePool(max_concurrency=write_concurrency) if write_concurrency > 1 else None
+    client = CalDAVClient(server.url, "testuser", "testpass", pool_size=write_concurrency)
+    orchestrator = CalendarSyncOrchestrator(
+        StaticExtractor(events), ReconciliationService(client, write_pool=pool), notifier
+    )
+    size = len(server.resources)
+    server.reset_log()
+    started = time.monotonic()
+    try:
+        ok = orchestrator.sync("screenshot.png")
+    finally:
+        if pool:
+            pool.shutdown()
+    report = LoadReport(
+        size=size,
+        requests=Counter(method for method, _, _ in server.requests),
+        bytes_sent=server.bytes_sent,
+        bytes_received=server.bytes_received,
+        seconds=time.monotonic() - started,
+    )
+    print(f"\n[load] {report}")
+    return ok, report, notifier
+
+
+@pytest.fixture
+def server():
+    stub = CalDAVStubServer().start()
+    yield stub
+    close_sessions()
+    stub.stop()
+
+
+@pytest.mark.parametrize("size", [100, 10_000, 100_000])
+def test_sync_cost_scales_with_changes_not_calendar_size(server, size):
+    if size not in ENABLED_SIZES:
+        pytest.skip(f"set SYNC_LOAD_SIZES to include {size} to run")
+    churn = max(1, size // 100)
+    events = _events(size)
+    _seed(server, events)
+
+    ok, report, notifier = _sync(server, _outlook_view(events, churn))
+
+    assert ok
+    assert f"{churn} created, {churn} updated, {churn} deleted" in notifier.messages[-1]
+    assert report.requests["PUT"] == 2 * churn and report.requests["DELETE"] == churn
+    assert report.reads <= READ_OVERHEAD
+
+
+def test_unchanged_calendar_costs_only_reads(server):
+    events = _events(100)
+    _seed(server, events)
+
+    ok, report, _ = _sync(server, events)
+
+    assert ok
+    assert report.writes == 0
+    assert report.reads <= READ_OVERHEAD
+
+
+def test_writes_overlap_on_a_slow_server(server):
+    events = _events(100)
+    _seed(server, events)
+    server.latency = 0.02
+
+    ok, report, _ = _sync(server, _outlook_view(events, 20))
+
+    assert ok
+    assert server.max_in_flight > 1
+
+
+def test_injected_write_failures_are_reported(server):
+    events = _events(100)
+    _seed(server, events)
+    server.fail("PUT", 500, times=2)
+
+    ok, report, notifier = _sync(server, _outlook_view(events, 5), write_concurrency=1)
+
+    assert not ok
+    assert "2 failed" in notifier.messages[-1]
+    assert report.requests["PUT"] == 10
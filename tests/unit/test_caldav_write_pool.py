@@ -0,0 +1,75 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import threading
+import time
+
+import pytest
+
+from src.caldav_client import PutResult
+from src.caldav_write_pool import AdaptiveLimit, CalDAVWritePool
+
+
+def test_limit_grows_additively_up_to_the_ceiling():
+    limit = AdaptiveLimit(maximum=3, initial=1)
+    for _ in range(20):
+        limit.release(limit.acquire(), latency=0.01)
+    assert limit.limit == 3
+
+
+def test_throttling_halves_the_limit_once_per_round():
+    limit = AdaptiveLimit(maximum=8, initial=8)
+    epochs = [limit.acquire() for _ in range(8)]
+    # Every in-flight write comes back throttled: only the first one counts
+    for epoch in epochs:
+        limit.release(epoch, latency=0.01, throttled=True)
+    assert limit.limit == 4
+    limit.release(limit.acquire(), latency=0.01, throttled=True)
+    assert limit.limit == 2
+
+
+def test_slow_writes_count_as_congestion():
+    limit = AdaptiveLimit(maximum=4, initial=4, min_latency_threshold=0.1)
+    limit.release(limit.acquire(), latency=0.05)
+    limit.release(limit.acquire(), latency=1.0)
+    assert limit.limit == 2
+
+
+def test_ceiling_must_be_positive():
+    with pytest.raises(ValueError):
+        AdaptiveLimit(maximum=0)
+
+
+def test_pool_respects_limit_and_collects_outcomes_in_order():
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def write(i):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.02)
+        with lock:
+            state["in_flight"] -= 1
+        if i == 3:
+            raise OSError("connection reset")
+        return i != 5
+
+    with CalDAVWritePool(max_concurrency=3, initial_concurrency=3) as pool:
+        for i in range(12):
+            pool.submit(i, lambda i=i: write(i))
+        outcomes = pool.wait()
+
+    assert [o.label for o in outcomes] == list(range(12))
+    assert [o.label for o in outcomes if not o.ok] == [3, 5]
+    assert isinstance(outcomes[3].error, OSError)
+    assert 1 < state["peak"] <= 3
+
+
+def test_pool_backs_off_on_503():
+    with CalDAVWritePool(max_concurrency=4, initial_concurrency=4) as pool:
+        pool.submit("busy", lambda: PutResult(False, "/cal/busy.ics", status=503))
+        pool.wait()
+        assert pool.limit.limit == 2
@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from PIL import Image, ImageDraw
+from src.gemini_cache import GeminiResponseCache
+import src.gemini_extractor as gemini_extractor
+from src.utils.image_hash import dhash
+
+EVENTS = [{"title": "Standup", "date": "2025-10-27", "start_time": "09:00", "end_time": "09:15"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeModel:
+    calls = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    def generate_content(self, parts, **kwargs):
+        FakeModel.calls += 1
+        return type("Response", (), {"text": '```json\n[{"title": "Standup", "date": "2025-10-27", '
+                                             '"start_time": "09:00", "end_time": "09:15"}]\n```'})()
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    FakeModel.calls = 0
+    monkeypatch.setattr(gemini_extractor, "_sessions", {})
+    monkeypatch.setattr(gemini_extractor.genai, "configure", lambda api_key: None)
+    monkeypatch.setattr(gemini_extractor.genai, "GenerativeModel", FakeModel)
+    return FakeModel
+
+
+def _screenshot(path, text="09:00 - 09:15 Standup"):
+    img = Image.new('RGB', (200, 60), color=(255, 255, 255))
+    ImageDraw.Draw(img).text((5, 20), text, fill=(0, 0, 0))
+    img.save(path)
+    return str(path)
+
+
+def test_cache_roundtrip_and_stats(tmp_path):
+    cache = GeminiResponseCache(str(tmp_path))
+    key = GeminiResponseCache.make_key("abc", "1", "model", "2025-10-27")
+    assert cache.get(key) is None
+    cache.put(key, EVENTS)
+    assert cache.get(key) == EVENTS
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_cache_key_depends_on_every_component():
+    keys = {
+        GeminiResponseCache.make_key("abc", "1", "model", "2025-10-27"),
+        GeminiResponseCache.make_key("abd", "1", "model", "2025-10-27"),
+        GeminiResponseCache.make_key("abc", "2", "model", "2025-10-27"),
+        GeminiResponseCache.make_key("abc", "1", "other", "2025-10-27"),
+        GeminiResponseCache.make_key("abc", "1", "model", "2025-10-28"),
+    }
+    assert len(keys) == 5
+
+
+def test_cache_ttl(tmp_path):
+    clock = FakeClock()
+    cache = GeminiResponseCache(str(tmp_path), ttl_seconds=60, clock=clock)
+    cache.put("k", EVENTS)
+    clock.now += 61
+    assert cache.get("k") is None
+    assert not os.path.exists(tmp_path / "k.json")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = GeminiResponseCache(str(tmp_path), max_entries=2)
+    cache.put("a", EVENTS)
+    os.utime(tmp_path / "a.json", (1, 1))
+    cache.put("b", EVENTS)
+    os.utime(tmp_path / "b.json", (2, 2))
+    cache.put("c", EVENTS)
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
+    assert cache.evictions == 1
+
+
+def test_cache_evicts_by_size(tmp_path):
+    cache = GeminiResponseCache(str(tmp_path), max_bytes=1)
+    cache.put("a", EVENTS)
+    assert os.listdir(tmp_path) == []
+
+
+def test_extract_uses_cache_for_identical_screenshot(tmp_path, fake_gemini):
+    cache = GeminiResponseCache(str(tmp_path / "cache"))
+    first = gemini_extractor.extract_events_with_gemini(_screenshot(tmp_path / "a.png"), "key", cache=cache)
+    second = gemini_extractor.extract_events_with_gemini(_screenshot(tmp_path / "b.png"), "key", cache=cache)
+    assert fake_gemini.calls == 1
+    assert first == second
+    assert second[0].start_datetime == "2025-10-27T09:00:00"
+
+
+def test_extract_bypass_cache(tmp_path, fake_gemini):
+    cache = GeminiResponseCache(str(tmp_path / "cache"))
+    path = _screenshot(tmp_path / "a.png")
+    gemini_extractor.extract_events_with_gemini(path, "key", cache=cache)
+    gemini_extractor.extract_events_with_gemini(path, "key", cache=cache, bypass_cache=True)
+    assert fake_gemini.calls == 2
+
+
+def test_extract_misses_for_changed_screenshot(tmp_path, fake_gemini):
+    cache = GeminiResponseCache(str(tmp_path / "cache"))
+    gemini_extractor.extract_events_with_gemini(_screenshot(tmp_path / "a.png"), "key", cache=cache)
+    gemini_extractor.extract_events_with_gemini(
+        _screenshot(tmp_path / "b.png", "14:00 - 15:30 Quarterly planning review"), "key", cache=cache
+    )
+    assert fake_gemini.calls == 2
+
+
+def test_one_changed_time_string_is_a_cache_miss(tmp_path, fake_gemini):
+    def capture(path, times):
+        img = Image.new('RGB', (2400, 1600), color=(255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for row in range(20):
+            text = times if row == 7 else f"{9 + row % 8}:00 AM - {10 + row % 8}:00 AM  Meeting {row}"
+            draw.text((40, 40 + row * 70), text, fill=(0, 0, 0))
+        img.save(path)
+        return str(path)
+
+    cache = GeminiResponseCache(str(tmp_path / "cache"))
+    before = capture(tmp_path / "a.png", "10:05 AM - 11:00 AM  Design review")
+    after = capture(tmp_path / "b.png", "10:35 AM - 11:30 AM  Design review")
+    # Too small a change for a perceptual hash to notice
+    assert dhash(Image.open(before)) == dhash(Image.open(after))
+
+    gemini_extractor.extract_events_with_gemini(before, "key", cache=cache)
+    gemini_extractor.extract_events_with_gemini(after, "key", cache=cache)
+
+    assert fake_gemini.calls == 2
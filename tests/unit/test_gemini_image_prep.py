@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import io
+from PIL import Image, ImageDraw, ImageFont
+from src.gemini_image_prep import (
+    estimate_text_height,
+    find_content_box,
+    prepare_image_for_upload,
+    remove_columns,
+)
+
+
+def _calendar_screenshot(rows=6, font_size=28):
+    """Large colourful screenshot with a few text rows in the top-left area"""
+    img = Image.new('RGB', (2500, 1830), color=(255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default(size=font_size)
+    for i in range(rows):
+        y = 40 + i * 60
+        draw.text((30, y), f"Monday, October {20 + i}", fill=(20, 20, 20), font=font)
+        draw.text((400, y), f"{9 + i:02d}:00 - {9 + i:02d}:30 Meeting {i}", fill=(0, 0, 0), font=font)
+        draw.rectangle((790, y, 860, y + 30), fill=(246, 100, 12))  # icon column
+    return img
+
+
+def test_remove_columns_joins_halves():
+    img = Image.new('L', (100, 10), color=0)
+    img.paste(255, (40, 0, 60, 10))
+    out = remove_columns(img, (40, 60))
+    assert out.size == (80, 10)
+    assert out.getextrema() == (0, 0)
+    assert remove_columns(img, (200, 300)).size == (100, 10)
+
+
+def test_find_content_box():
+    img = Image.new('L', (200, 100), color=255)
+    img.paste(0, (50, 20, 80, 40))
+    assert find_content_box(img, margin=2) == (48, 18, 82, 42)
+    assert find_content_box(Image.new('L', (10, 10), color=255)) == (0, 0, 10, 10)
+
+
+def test_estimate_text_height():
+    img = Image.new('L', (100, 100), color=255)
+    for top in (10, 40, 70):
+        img.paste(0, (5, top, 60, top + 12))
+    img.paste(0, (0, 95, 100, 96))  # 1px separator is ignored
+    assert estimate_text_height(img) == 12
+    assert estimate_text_height(Image.new('L', (10, 10), color=255)) is None
+
+
+def test_prepare_image_shrinks_payload_and_keeps_text_size():
+    screenshot = _calendar_screenshot()
+    prepared = prepare_image_for_upload(screenshot, min_text_height=14)
+
+    assert prepared.original_size == (2500, 1830)
+    assert prepared.mime_type == "image/png"
+    assert len(prepared.data) < prepared.original_bytes / 5
+    assert prepared.size[0] < 1500 and prepared.size[1] < 600
+
+    decoded = Image.open(io.BytesIO(prepared.data))
+    assert decoded.mode in ("L", "P")
+    assert 10 <= estimate_text_height(decoded.convert('L')) <= 18
+    assert prepared.as_part() == {"mime_type": "image/png", "data": prepared.data}
+
+
+def test_prepare_image_does_not_upscale_small_text():
+    screenshot = _calendar_screenshot(rows=2, font_size=10)
+    prepared = prepare_image_for_upload(screenshot, min_text_height=14)
+    content = find_content_box(remove_columns(screenshot.convert('L'), (775, 880)))
+    assert prepared.size == (content[2] - content[0], content[3] - content[1])
+
+
+def test_original_bytes_is_the_source_file_size(tmp_path):
+    path = tmp_path / "cropped.png"
+    _calendar_screenshot().save(path)
+
+    with Image.open(path) as screenshot:
+        prepared = prepare_image_for_upload(screenshot)
+
+    assert prepared.original_bytes == os.path.getsize(path)
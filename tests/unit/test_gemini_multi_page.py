@@ -0,0 +1,86 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import json
+from PIL import Image, ImageDraw
+from src.gemini_cache import GeminiResponseCache
+from src.gemini_extractor import GeminiSession
+from src.gemini_image_prep import prepare_image_for_upload
+from src.gemini_standin import LocalStandInModel
+
+
+def _page(label):
+    img = Image.new('RGB', (400, 120), color=(255, 255, 255))
+    ImageDraw.Draw(img).text((10, 40), f"09:00 - 10:00 {label}", fill=(0, 0, 0))
+    return img
+
+
+def _page_responder(contents):
+    """Answer with one event per page, tagged with the page id from the request"""
+    page_ids = [c.split(": ")[1] for c in contents[1:] if isinstance(c, str)]
+    return json.dumps([
+        {"page_id": pid, "title": f"Event {pid}", "date": "2025-10-27", "start_time": "09:00", "end_time": "10:00"}
+        for pid in page_ids
+    ])
+
+
+def _pages():
+    labels = ["Standup", "Quarterly planning review with finance", "1:1"]
+    return {f"week{i}": _page(label) for i, label in enumerate(labels)}
+
+
+def test_pages_are_packed_into_one_request():
+    model = LocalStandInModel(responder=_page_responder)
+    results = GeminiSession(model=model).extract_pages(_pages())
+    assert model.calls == 1
+    assert list(results) == ["week0", "week1", "week2"]
+    assert [[e.title for e in events] for events in results.values()] == [["Event p1"], ["Event p2"], ["Event p3"]]
+    prompt = model.requests[0][0]
+    assert '"page_id"' in prompt and "p1, p2, p3" in prompt
+    assert sum(isinstance(c, dict) for c in model.requests[0]) == 3
+
+
+def test_requests_split_at_payload_limit():
+    pages = _pages()
+    sizes = [len(prepare_image_for_upload(img).data) for img in pages.values()]
+    model = LocalStandInModel(responder=_page_responder)
+    results = GeminiSession(model=model).extract_pages(pages, max_payload_bytes=sizes[0] + sizes[1])
+    assert model.calls == 2
+    assert [sum(isinstance(c, dict) for c in request) for request in model.requests] == [2, 1]
+    # Page ids restart per request but results still land on the right page
+    assert [len(events) for events in results.values()] == [1, 1, 1]
+
+
+def test_oversized_page_is_sent_alone():
+    model = LocalStandInModel(responder=_page_responder)
+    results = GeminiSession(model=model).extract_pages(_pages(), max_payload_bytes=1)
+    assert model.calls == 3
+    assert all(len(events) == 1 for events in results.values())
+
+
+def test_unknown_page_ids_are_dropped():
+    def responder(contents):
+        return json.dumps([
+            {"page_id": "p1", "title": "Kept", "date": "2025-10-27", "start_time": "09:00", "end_time": "10:00"},
+            {"page_id": "p9", "title": "Lost", "date": "2025-10-27", "start_time": "11:00", "end_time": "12:00"},
+        ])
+
+    results = GeminiSession(model=LocalStandInModel(responder=responder)).extract_pages(_pages())
+    assert [e.title for e in results["week0"]] == ["Kept"]
+    assert results["week1"] == [] and results["week2"] == []
+
+
+def test_pages_are_cached_individually(tmp_path):
+    cache = GeminiResponseCache(str(tmp_path))
+    model = LocalStandInModel(responder=_page_responder)
+    session = GeminiSession(model=model, cache=cache)
+    pages = _pages()
+    session.extract_pages(pages)
+    assert model.calls == 1
+    # A single-image extraction of one of the pages is served from the cache
+    assert [e.title for e in session.extract(pages["week1"])] == ["Event p2"]
+    pages["week3"] = _page("All hands offsite and team dinner downtown")
+    session.extract_pages(pages)
+    assert model.calls == 2
+    assert sum(isinstance(c, dict) for c in model.requests[-1]) == 1
@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import json
+import pytest
+from PIL import Image
+from src.gemini_extractor import GeminiSession
+from src.gemini_schema import (
+    decode_event_array,
+    normalize_date,
+    normalize_time,
+    parse_event_response,
+    repair_event,
+    response_generation_config,
+)
+from src.gemini_standin import LocalStandInModel
+from src.utils.metrics import metrics
+
+EVENT = {"title": "Standup", "date": "2025-10-27", "start_time": "09:00", "end_time": "09:15"}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("09:00", "09:00"), ("9:00", "09:00"), ("09:00:00", "09:00"), ("9:30 PM", "21:30"),
+    ("12:15 am", "00:15"), ("2pm", "14:00"), ("14.30", "14:30"), ("25:00", None), ("noon", None), (None, None),
+])
+def test_normalize_time(value, expected):
+    assert normalize_time(value) == expected
+
+
+def test_normalize_date():
+    assert normalize_date("2025-10-27") == "2025-10-27"
+    assert normalize_date("2025/10/27") == "2025-10-27"
+    assert normalize_date("2025-10-27T09:00:00") == "2025-10-27"
+    assert normalize_date("October 27") is None
+
+
+def test_repair_event():
+    assert repair_event(EVENT) == (EVENT, False)
+    assert repair_event({**EVENT, "location": None}) == (EVENT, False)
+    clean, changed = repair_event({**EVENT, "title": " Standup ", "start_time": "9:00 AM"})
+    assert clean == EVENT and changed
+    assert repair_event({**EVENT, "end_time": "later"}) == (None, True)
+    assert repair_event({**EVENT, "title": ""}) == (None, True)
+    assert repair_event("not an object") == (None, True)
+    # Day tiles do not need a date
+    no_date = {k: v for k, v in EVENT.items() if k != "date"}
+    assert repair_event(no_date, require_date=False) == (no_date, False)
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n[' + json.dumps(EVENT) + ']\n```',
+    '[' + json.dumps(EVENT) + ',]',
+    '{"events": [' + json.dumps(EVENT) + ']}',
+    json.dumps(EVENT),
+    'Here are the events: [' + json.dumps(EVENT) + '] Let me know!',
+])
+def test_decode_repairs_envelope(text):
+    items, repaired = decode_event_array(text)
+    assert items == [EVENT]
+    assert repaired
+
+
+def test_decode_unrecoverable_raises():
+    with pytest.raises(json.JSONDecodeError):
+        decode_event_array("I could not find any events.")
+
+
+def test_truncated_array_is_unusable():
+    with pytest.raises(json.JSONDecodeError):
+        parse_event_response('[' + json.dumps(EVENT) + ', {"title": "Cut of')
+    assert metrics.count("gemini.responses_unusable") == 1
+
+
+def test_parse_event_response_tracks_invalid_rate():
+    parse_event_response(json.dumps([EVENT]))
+    parse_event_response(json.dumps([{**EVENT, "start_time": "9am"}]))
+    with pytest.raises(json.JSONDecodeError):
+        parse_event_response("nothing")
+    assert metrics.count("gemini.responses") == 3
+    assert metrics.count("gemini.responses_invalid") == 2
+    assert metrics.count("gemini.responses_unusable") == 1
+
+
+def test_session_requests_schema_and_repairs_locally():
+    model = LocalStandInModel(responder=lambda contents: '```json\n[{"title": "Standup", "date": "2025/10/27", '
+                                                         '"start_time": "9:00", "end_time": "9:15 AM"},]\n```')
+    events = GeminiSession(model=model).extract(Image.new('RGB', (100, 40), color=(255, 255, 255)))
+    assert model.calls == 1
+    assert events[0].start_datetime == "2025-10-27T09:00:00"
+    assert events[0].end_datetime == "2025-10-27T09:15:00"
+    assert model.generation_configs == [response_generation_config()]
+    assert model.generation_configs[0]["response_mime_type"] == "application/json"
+    assert metrics.count("gemini.responses_invalid") == 1
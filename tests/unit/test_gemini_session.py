@@ -0,0 +1,119 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import asyncio
+import pytest
+from PIL import Image, ImageDraw
+from google.api_core.exceptions import InvalidArgument
+from src.gemini_extractor import GeminiSession, _retry_after_seconds
+from src.gemini_standin import LocalStandInModel
+from src.interfaces.event_extractor import GeminiEventExtractor
+import src.gemini_extractor as gemini_extractor
+
+EVENTS = [
+    {"title": "Standup", "date": "2025-10-27", "start_time": "09:00", "end_time": "09:15"},
+    {"title": "Review", "date": "2025-10-27", "start_time": "14:00", "end_time": "15:00"},
+]
+
+
+def _image(label="Standup"):
+    img = Image.new('RGB', (300, 80), color=(255, 255, 255))
+    ImageDraw.Draw(img).text((10, 30), label, fill=(0, 0, 0))
+    return img
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+
+    async def fake_async_sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(gemini_extractor.asyncio, "sleep", fake_async_sleep)
+    monkeypatch.setattr(gemini_extractor.time, "sleep", delays.append)
+    return delays
+
+
+def test_session_configures_model_once(monkeypatch):
+    configured = []
+    monkeypatch.setattr(gemini_extractor.genai, "configure", lambda api_key: configured.append(api_key))
+    monkeypatch.setattr(gemini_extractor.genai, "GenerativeModel", lambda name: LocalStandInModel(EVENTS))
+    session = GeminiSession("key")
+    session.extract(_image())
+    session.extract(_image())
+    assert configured == ["key"]
+    assert session.model.calls == 2
+
+
+def test_extract_with_standin_model():
+    session = GeminiSession(model=LocalStandInModel(EVENTS))
+    events = session.extract(_image())
+    assert [e.title for e in events] == ["Standup", "Review"]
+    prompt, part = session.model.requests[0]
+    assert "JSON array" in prompt
+    assert part["mime_type"] == "image/png"
+
+
+def test_batch_respects_concurrency_limit():
+    model = LocalStandInModel(EVENTS, latency=0.02)
+    session = GeminiSession(model=model, max_concurrency=3)
+    results = session.extract_batch_sync([_image(f"crop {i}") for i in range(10)])
+    assert len(results) == 10
+    assert all(len(r) == 2 for r in results)
+    assert model.calls == 10
+    assert 1 < model.max_in_flight <= 3
+
+
+def test_batch_retries_rate_limits_honouring_retry_after(no_sleep):
+    model = LocalStandInModel(EVENTS, rate_limit_failures=2, retry_after=7)
+    session = GeminiSession(model=model, max_concurrency=1)
+    results = session.extract_batch_sync([_image()])
+    assert len(results[0]) == 2
+    assert no_sleep == [7, 7]
+
+
+def test_rate_limit_backoff_is_exponential_without_retry_after(no_sleep):
+    model = LocalStandInModel(EVENTS, rate_limit_failures=3)
+    session = GeminiSession(model=model, backoff_base=0.5)
+    session.extract(_image())
+    assert no_sleep == [0.5, 1.0, 2.0]
+
+
+def test_rate_limit_gives_up_after_max_retries(no_sleep):
+    model = LocalStandInModel(EVENTS, rate_limit_failures=5)
+    session = GeminiSession(model=model, max_retries=2)
+    results = session.extract_batch_sync([_image()], return_exceptions=True)
+    assert isinstance(results[0], Exception)
+    assert model.calls == 3
+
+
+def test_non_rate_limit_errors_are_not_retried(no_sleep):
+    class BrokenModel(LocalStandInModel):
+        async def generate_content_async(self, contents, **kwargs):
+            self.calls += 1
+            raise InvalidArgument("bad image")
+
+    model = BrokenModel()
+    session = GeminiSession(model=model)
+    with pytest.raises(InvalidArgument):
+        asyncio.run(session.extract_async(_image()))
+    assert model.calls == 1
+    assert no_sleep == []
+
+
+def test_retry_after_from_response_header():
+    error = Exception("429")
+    error.response = type("Response", (), {"headers": {"Retry-After": "3"}})()
+    assert _retry_after_seconds(error) == 3.0
+    assert _retry_after_seconds(Exception("no hint")) is None
+
+
+def test_gemini_event_extractor_uses_session(tmp_path):
+    path = str(tmp_path / "shot.png")
+    _image().save(path)
+    session = GeminiSession(model=LocalStandInModel(EVENTS))
+    extractor = GeminiEventExtractor(session=session)
+    assert len(extractor.extract_events(path)) == 2
+    assert [len(r) for r in extractor.extract_events_batch([path, path])] == [2, 2]
+    assert session.model.calls == 3
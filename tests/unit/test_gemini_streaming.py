@@ -0,0 +1,158 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from PIL import Image
+from src.gemini_cache import GeminiResponseCache
+from src.gemini_extractor import GeminiSession, extract_events_with_gemini
+from src.gemini_standin import LocalStandInModel
+from src.interfaces.calendar_repository import ICalendarRepository
+from src.interfaces.event_extractor import (
+    FallbackEventExtractor,
+    GeminiEventExtractor,
+    IEventExtractor,
+    IncompleteExtractionError,
+)
+from src.interfaces.notification_service import NoOpNotificationService
+from src.models.calendar_data import ParsedEvent
+from src.services.reconciliation import ReconciliationService
+from src.services.sync_service import CalendarSyncOrchestrator
+from tests.caldav_stub import make_ics
+
+EVENTS = [
+    {"title": f"Meeting {i}", "date": "2025-10-27", "start_time": f"{9 + i:02d}:00", "end_time": f"{9 + i:02d}:30"}
+    for i in range(5)
+]
+
+
+def _image():
+    return Image.new('RGB', (100, 40), color=(255, 255, 255))
+
+
+class RecordingRepository(ICalendarRepository):
+    def __init__(self, log):
+        self.log = log
+
+    def get_events(self):
+        return {}
+
+    def put_event(self, uid, ical_data):
+        summary = [line for line in ical_data.splitlines() if line.startswith("SUMMARY:")][0]
+        self.log.append(("put", summary[len("SUMMARY:"):]))
+        return True
+
+    def delete_event(self, event_id):
+        return True
+
+
+class LoggingStreamExtractor(IEventExtractor):
+    def __init__(self, log, events):
+        self.log = log
+        self.events = events
+
+    def extract_events(self, image_path):
+        return list(self.events)
+
+    def iter_events(self, image_path):
+        for event in self.events:
+            self.log.append(("parsed", event.title))
+            yield event
+
+
+def test_iter_events_streams_all_events():
+    session = GeminiSession(model=LocalStandInModel(EVENTS, chunk_size=16))
+    titles = [e.title for e in session.iter_events(_image())]
+    assert titles == [e["title"] for e in EVENTS]
+
+
+def test_interrupted_stream_yields_completed_events_then_raises(tmp_path):
+    model = LocalStandInModel(EVENTS, chunk_size=50, fail_after_chunks=4)
+    cache = GeminiResponseCache(str(tmp_path))
+    session = GeminiSession(model=model, cache=cache)
+    events = []
+    with pytest.raises(IncompleteExtractionError):
+        for event in session.iter_events(_image()):
+            events.append(event)
+    assert 0 < len(events) < len(EVENTS)
+    assert events[0].title == "Meeting 0"
+    # A partial response must not be cached
+    assert os.listdir(tmp_path) == []
+
+
+def test_truncated_stream_keeps_completed_events_on_the_error(tmp_path, monkeypatch):
+    path = str(tmp_path / "shot.png")
+    _image().save(path)
+    session = GeminiSession(model=LocalStandInModel(EVENTS, chunk_size=50, fail_after_chunks=4))
+    monkeypatch.setattr("src.gemini_extractor.get_gemini_session", lambda api_key: session)
+
+    with pytest.raises(IncompleteExtractionError) as raised:
+        extract_events_with_gemini(path, "test-key", stream=True)
+
+    assert 0 < len(raised.value.events) < len(EVENTS)
+    assert raised.value.events[0].title == "Meeting 0"
+
+
+def test_stream_failing_before_any_event_raises():
+    model = LocalStandInModel(EVENTS, fail_after_chunks=0)
+    session = GeminiSession(model=model)
+    with pytest.raises(ConnectionError):
+        list(session.iter_events(_image()))
+
+
+def test_complete_stream_is_cached(tmp_path):
+    cache = GeminiResponseCache(str(tmp_path))
+    model = LocalStandInModel(EVENTS, chunk_size=8)
+    session = GeminiSession(model=model, cache=cache)
+    list(session.iter_events(_image()))
+    assert len(list(session.iter_events(_image()))) == len(EVENTS)
+    assert model.calls == 1
+
+
+def test_fallback_extractor_streams_and_falls_back(tmp_path):
+    path = str(tmp_path / "shot.png")
+    _image().save(path)
+    broken = GeminiEventExtractor(session=GeminiSession(model=LocalStandInModel(EVENTS, fail_after_chunks=0)))
+    backup = LoggingStreamExtractor([], [ParsedEvent("2025-10-27T08:00:00", "2025-10-27T08:30:00", "OCR event")])
+    events = list(FallbackEventExtractor(broken, backup).iter_events(path))
+    assert [e.title for e in events] == ["OCR event"]
+
+
+def test_orchestrator_uploads_events_while_stream_is_in_progress():
+    log = []
+    events = [ParsedEvent(f"2030-01-07T{9 + i:02d}:00:00", f"2030-01-07T{9 + i:02d}:30:00", f"E{i}") for i in range(3)]
+    repo = RecordingRepository(log)
+    orchestrator = CalendarSyncOrchestrator(
+        LoggingStreamExtractor(log, events),
+        ReconciliationService(repo),
+        NoOpNotificationService(),
+    )
+    assert orchestrator.sync("unused.png")
+    assert log == [
+        ("parsed", "E0"), ("put", "E0"),
+        ("parsed", "E1"), ("put", "E1"),
+        ("parsed", "E2"), ("put", "E2"),
+    ]
+
+
+def test_truncated_stream_deletes_nothing(tmp_path):
+    path = str(tmp_path / "shot.png")
+    _image().save(path)
+    future = [dict(event, date="2030-01-07") for event in EVENTS]
+    existing = {f"/cal/old{i}.ics": make_ics(f"old{i}", f"2030010{i + 1}T100000Z", f"2030010{i + 1}T110000Z", f"Old {i}")
+                for i in range(4)}
+    log = []
+
+    class ExistingRepository(RecordingRepository):
+        def get_events(self):
+            return dict(existing)
+
+        def delete_event(self, event_id):
+            self.log.append(("delete", event_id))
+            return True
+
+    extractor = GeminiEventExtractor(session=GeminiSession(model=LocalStandInModel(future, chunk_size=50, fail_after_chunks=4)))
+    orchestrator = CalendarSyncOrchestrator(extractor, ReconciliationService(ExistingRepository(log)), NoOpNotificationService())
+
+    assert orchestrator.sync(path) is False
+    assert log and all(action == "put" for action, _ in log)
@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import json
+import re
+from PIL import Image, ImageDraw
+from src.gemini_extractor import GeminiSession
+from src.gemini_standin import LocalStandInModel
+from src.gemini_tiling import DateHeader, find_date_headers, split_into_day_tiles
+
+DAYS = [("Monday, October 27", 40), ("Tuesday, October 28", 400), ("Wednesday, October 29", 900)]
+
+
+def _capture():
+    img = Image.new('RGB', (1200, 1300), color=(255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    for i, (label, top) in enumerate(DAYS):
+        draw.text((100, top), label, fill=(0, 0, 0))
+        draw.text((100, top + 60), f"{9 + i:02d}:00 - {10 + i:02d}:00 Meeting {i}", fill=(0, 0, 0))
+    return img
+
+
+def _read_lines(img):
+    lines = [(top, [(10, str(27 + i)), (100, label.split()[0]), (180, label.split()[1]), (260, label.split()[2])])
+             for i, (label, top) in enumerate(DAYS)]
+    lines += [(top + 60, [(100, "09:00"), (160, "-"), (180, "10:00"), (260, "Meeting")]) for _, top in DAYS]
+    return lines
+
+
+def _find_headers(img, year):
+    return find_date_headers(img, year, read_lines=_read_lines)
+
+
+def _day_responder(contents):
+    prompt = contents[0]
+    day = re.search(r"\((\w+day, \w+ \d+, \d{4})\)", prompt).group(1)
+    return json.dumps([{"title": f"Meeting on {day}", "start_time": "09:00", "end_time": "10:00"}])
+
+
+def test_find_date_headers_ignores_date_column_and_event_rows():
+    headers = find_date_headers(_capture(), 2025, read_lines=_read_lines)
+    assert headers == [
+        DateHeader("2025-10-27", 40), DateHeader("2025-10-28", 400), DateHeader("2025-10-29", 900)
+    ]
+
+
+def test_split_into_day_tiles_covers_image():
+    img = _capture()
+    tiles = split_into_day_tiles(img, _find_headers(img, 2025), margin=4)
+    assert [t.box for t in tiles] == [(0, 0, 1200, 396), (0, 396, 1200, 896), (0, 896, 1200, 1300)]
+    assert tiles[1].image.size == (1200, 500)
+    assert [t.date for t in tiles] == ["2025-10-27", "2025-10-28", "2025-10-29"]
+
+
+def test_extract_tiled_sends_concurrent_day_requests():
+    model = LocalStandInModel(responder=_day_responder, latency=0.02)
+    session = GeminiSession(model=model, max_concurrency=4)
+    events = session.extract_tiled(_capture(), find_headers=_find_headers)
+
+    assert model.calls == 3
+    assert model.max_in_flight > 1
+    year = events[0].start_datetime[:4]
+    assert [e.start_datetime for e in events] == [
+        f"{year}-10-27T09:00:00", f"{year}-10-28T09:00:00", f"{year}-10-29T09:00:00"
+    ]
+    # The model is only asked for times; dates come from the tile headers
+    assert "October 28" in events[1].title
+    assert all("date: Date in YYYY-MM-DD" not in request[0] for request in model.requests)
+
+
+def test_extract_tiled_falls_back_to_whole_image_without_headers():
+    events = [{"title": "Standup", "date": "2025-10-27", "start_time": "09:00", "end_time": "09:15"}]
+    model = LocalStandInModel(events)
+    session = GeminiSession(model=model)
+    assert len(session.extract_tiled(_capture(), find_headers=lambda img, year: [])) == 1
+
+    def broken(img, year):
+        raise RuntimeError("tesseract is not installed")
+
+    assert len(session.extract_tiled(_capture(), find_headers=broken)) == 1
+    assert model.calls == 2
+    assert all("JSON array" in request[0] and "YYYY-MM-DD" in request[0] for request in model.requests)
@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import threading
+import time
+import pytest
+from src.interfaces.event_extractor import HedgedEventExtractor, IEventExtractor, events_look_valid
+from src.models.calendar_data import ParsedEvent
+
+
+def _events(title, count=1):
+    return [ParsedEvent(f"2025-10-27T{9 + i:02d}:00:00", f"2025-10-27T{9 + i:02d}:30:00", title) for i in range(count)]
+
+
+class SlowExtractor(IEventExtractor):
+    def __init__(self, result, delay=0.0, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.started = threading.Event()
+
+    def extract_events(self, image_path):
+        self.started.set()
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_primary_within_budget_wins():
+    primary = SlowExtractor(_events("gemini"), delay=0.01)
+    fallback = SlowExtractor(_events("ocr"), delay=0.5)
+    hedged = HedgedEventExtractor(primary, fallback, budget_seconds=1)
+    started = time.monotonic()
+    events = hedged.extract_events("shot.png")
+    assert events[0].title == "gemini"
+    assert time.monotonic() - started < 0.4
+    assert hedged.last_report.winner == "gemini"
+    assert hedged.last_report.primary_seconds is not None
+    assert hedged.last_report.fallback_seconds is None
+    assert fallback.started.is_set()  # Both were started at once
+
+
+def test_fallback_used_when_primary_misses_budget():
+    primary = SlowExtractor(_events("gemini"), delay=0.5)
+    fallback = SlowExtractor(_events("ocr"), delay=0.05)
+    hedged = HedgedEventExtractor(primary, fallback, budget_seconds=0.1)
+    started = time.monotonic()
+    events = hedged.extract_events("shot.png")
+    assert events[0].title == "ocr"
+    # Total time is max(budget, OCR), not Gemini + OCR
+    assert time.monotonic() - started < 0.4
+    assert hedged.last_report.winner == "ocr"
+    assert "budget" in hedged.last_report.primary_error
+
+
+def test_fallback_used_when_primary_fails():
+    primary = SlowExtractor(None, error=RuntimeError("quota exceeded"))
+    fallback = SlowExtractor(_events("ocr"), delay=0.05)
+    hedged = HedgedEventExtractor(primary, fallback, budget_seconds=1)
+    assert hedged.extract_events("shot.png")[0].title == "ocr"
+    assert hedged.last_report.primary_error == "quota exceeded"
+
+
+def test_fallback_used_when_primary_result_is_invalid():
+    bad = [ParsedEvent("2025-10-27T10:00:00", "2025-10-27T09:00:00", "backwards")]
+    hedged = HedgedEventExtractor(SlowExtractor(bad), SlowExtractor(_events("ocr")), budget_seconds=1)
+    assert hedged.extract_events("shot.png")[0].title == "ocr"
+    assert hedged.last_report.primary_error == "result failed validation"
+
+
+def test_late_primary_used_when_fallback_fails():
+    primary = SlowExtractor(_events("gemini"), delay=0.2)
+    fallback = SlowExtractor(None, error=FileNotFoundError("no tesseract"))
+    hedged = HedgedEventExtractor(primary, fallback, budget_seconds=0.05)
+    assert hedged.extract_events("shot.png")[0].title == "gemini"
+    assert hedged.last_report.winner == "gemini"
+
+
+def test_both_failing_raises_fallback_error():
+    primary = SlowExtractor(None, error=RuntimeError("gemini down"))
+    fallback = SlowExtractor(None, error=FileNotFoundError("no tesseract"))
+    with pytest.raises(FileNotFoundError):
+        HedgedEventExtractor(primary, fallback, budget_seconds=1).extract_events("shot.png")
+
+
+def test_events_look_valid():
+    assert events_look_valid(_events("ok", 2))
+    assert not events_look_valid([])
+    assert not events_look_valid([ParsedEvent("bad", "2025-10-27T10:00:00", "x")])
+    assert not events_look_valid([ParsedEvent("2025-10-27T09:00:00", "2025-10-27T10:00:00", "")])
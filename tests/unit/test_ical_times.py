@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from datetime import datetime, timezone
+from src.utils.ical_times import (
+    event_in_range,
+    filter_events_in_range,
+    get_event_end_time,
+    get_event_start_time,
+)
+
+
+def _ics(*lines):
+    return "\r\n".join(["BEGIN:VCALENDAR", "VERSION:2.0", "BEGIN:VEVENT", "UID:x", *lines, "END:VEVENT", "END:VCALENDAR"])
+
+
+class FakeEvent:
+    def __init__(self, data):
+        self.data = data
+
+
+def test_end_from_dtend_with_timezone():
+    ics = _ics("DTSTART;TZID=America/New_York:20251027T090000", "DTEND;TZID=America/New_York:20251027T100000")
+    assert get_event_end_time(FakeEvent(ics)) == datetime(2025, 10, 27, 14, 0, tzinfo=timezone.utc)
+    assert get_event_start_time(ics) == datetime(2025, 10, 27, 13, 0, tzinfo=timezone.utc)
+
+
+def test_end_from_duration_and_naive_times():
+    ics = _ics("DTSTART:20251027T090000", "DURATION:PT30M")
+    assert get_event_end_time(ics) == datetime(2025, 10, 27, 9, 30, tzinfo=timezone.utc)
+
+
+def test_all_day_event_ends_at_end_of_day():
+    ics = _ics("DTSTART;VALUE=DATE:20251027")
+    end = get_event_end_time(ics)
+    assert end.date() == datetime(2025, 10, 27).date() and end.hour == 23
+    assert get_event_start_time(ics) == datetime(2025, 10, 27, tzinfo=timezone.utc)
+
+
+def test_event_in_range():
+    ics = _ics("DTSTART:20251027T090000Z", "DTEND:20251027T100000Z")
+    assert event_in_range(ics, datetime(2025, 10, 27, 9, 30, tzinfo=timezone.utc))
+    assert not event_in_range(ics, datetime(2025, 10, 27, 10, 0, tzinfo=timezone.utc))
+    assert not event_in_range(ics, None, datetime(2025, 10, 27, 9, 0, tzinfo=timezone.utc))
+    # Unparseable events are kept so cleanup errs on the side of including them
+    assert event_in_range("not ics", datetime(2025, 10, 27, tzinfo=timezone.utc))
+
+
+def test_filter_events_in_range():
+    events = {
+        "past": _ics("DTSTART:20240101T090000Z", "DTEND:20240101T100000Z"),
+        "future": _ics("DTSTART:20300101T090000Z", "DTEND:20300101T100000Z"),
+    }
+    assert list(filter_events_in_range(events, datetime(2025, 1, 1, tzinfo=timezone.utc))) == ["future"]
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from datetime import datetime, timezone
+
+import pytest
+from src.utils.ical_times import _parse_fields, clear_fields_cache, get_event_fields
+from src.utils.ics_scanner import scan_event
+from src.utils.metrics import metrics
+
+
+def _ics(*lines, newline="\r\n"):
+    return newline.join(["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//test//EN", "BEGIN:VEVENT",
+                         "DTSTAMP:20250101T000000Z", *lines, "END:VEVENT", "END:VCALENDAR", ""])
+
+
+class FakeEvent:
+    def __init__(self, url, data, etag):
+        self.url = url
+        self.data = data
+        self.props = {"{DAV:}getetag": etag}
+
+
+def setup_function():
+    clear_fields_cache()
+    metrics.reset()
+
+
+@pytest.mark.parametrize("ics", [
+    _ics("UID:utc", "DTSTART:20300101T100000Z", "DTEND:20300101T110000Z", "SUMMARY:Standup"),
+    _ics("UID:tz", "DTSTART;TZID=America/New_York:20301103T013000",
+         "DTEND;TZID=America/New_York:20301103T023000", "SUMMARY:Fall back"),
+    _ics("UID:floating", "DTSTART:20300101T090000", "DURATION:PT1H30M", "SUMMARY:Floating"),
+    _ics("UID:allday", "DTSTART;VALUE=DATE:20300101", "DTEND;VALUE=DATE:20300102", "SUMMARY:Holiday"),
+    _ics("UID:dayduration", "DTSTART;VALUE=DATE:20300101", "DURATION:P2D"),
+    _ics("UID:noend", "DTSTART:20300101T090000Z", "SUMMARY:Reminder"),
+    _ics("UID:weeks", "DTSTART:20300101T090000Z", "DURATION:-P1W"),
+    _ics("UID:escaped", "DTSTART:20300101T090000Z", "DTEND:20300101T100000Z",
+         "SUMMARY:Lunch\\, then 1\\;1", "LOCATION:Room 4\\nBuilding B", "DESCRIPTION:C:\\\\temp\\N"),
+    _ics("UID:folded", "DTSTART:20300101T090000Z", "DTEND:20300101T100000Z",
+         "DESCRIPTION:A long description that the server", " folded over two lines"),
+    _ics("UID:alarm", "DTSTART:20300101T090000Z", "DTEND:20300101T100000Z", "SUMMARY:Event",
+         "BEGIN:VALARM", "ACTION:DISPLAY", "DESCRIPTION:Alarm text", "TRIGGER:-PT15M", "END:VALARM"),
+    _ics("UID:lf", "DTSTART:20300101T090000Z", "DTEND:20300101T100000Z", newline="\n"),
+    _ics("UID:lang", "DTSTART:20300101T090000Z", "DTEND:20300101T100000Z", "SUMMARY;LANGUAGE=en:Hello"),
+])
+def test_scanner_matches_the_full_parser(ics):
+    scanned = scan_event(ics)
+    assert scanned is not None
+    assert scanned == _parse_fields(ics)
+
+
+@pytest.mark.parametrize("ics", [
+    _ics("UID:quoted", "DTSTART:20300101T090000Z", 'LOCATION;ALTREP="cid:room@example.com":Room'),
+    _ics("UID:unknown-tz", "DTSTART;TZID=Customized Time Zone:20300101T090000"),
+    _ics("UID:odd", "DTSTART:2030-01-01T09:00:00Z"),
+    _ics("UID:twice", "DTSTART:20300101T090000Z", "DTSTART:20300102T090000Z"),
+    "BEGIN:VCALENDAR\r\nBEGIN:VTODO\r\nUID:todo\r\nEND:VTODO\r\nEND:VCALENDAR\r\n",
+])
+def test_exotic_input_is_left_to_the_full_parser(ics):
+    assert scan_event(ics) is None
+
+
+def test_fallback_reads_what_the_scanner_rejects():
+    ics = _ics("UID:quoted", "DTSTART:20300101T090000Z", "DTEND:20300101T100000Z",
+               'LOCATION;ALTREP="cid:room@example.com":Room 4')
+
+    fields = get_event_fields(ics)
+
+    assert fields.location == "Room 4"
+    assert fields.end == datetime(2030, 1, 1, 10, tzinfo=timezone.utc)
+    assert metrics.count("ics.full_parses") == 1
+
+
+def test_results_are_cached_by_href_and_etag():
+    ics = _ics("UID:cached", "DTSTART:20300101T090000Z", "SUMMARY:First")
+    changed = ics.replace("SUMMARY:First", "SUMMARY:Second")
+
+    first = get_event_fields(FakeEvent("/cal/a.ics", ics, '"1"'))
+    again = get_event_fields(FakeEvent("/cal/a.ics", changed, '"1"'))
+    new_etag = get_event_fields(FakeEvent("/cal/a.ics", changed, '"2"'))
+
+    assert first is again and first.summary == "First"
+    assert new_etag.summary == "Second"
+
+
+def test_unparseable_events_still_raise():
+    with pytest.raises(ValueError):
+        get_event_fields("BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nDTSTART:garbage\r\nEND:VCALENDAR\r\n")
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import json
+import pytest
+from src.utils.json_stream import IncrementalJSONArrayParser
+
+EVENTS = [
+    {"title": "Standup {daily}", "date": "2025-10-27", "start_time": "09:00", "end_time": "09:15"},
+    {"title": "Say \"hi\" ]", "date": "2025-10-27", "start_time": "10:00", "end_time": "10:30",
+     "meta": {"nested": [1, 2]}},
+    {"title": "Back\\slash", "date": "2025-10-28", "start_time": "11:00", "end_time": "12:00"},
+]
+
+
+def _feed_in_chunks(text, size):
+    parser = IncrementalJSONArrayParser()
+    seen = []
+    for i in range(0, len(text), size):
+        seen.extend(parser.feed(text[i:i + size]))
+    return parser, seen
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 50, 10000])
+def test_parser_yields_every_object_regardless_of_chunking(chunk_size):
+    text = "```json\n" + json.dumps(EVENTS, indent=2) + "\n```"
+    parser, seen = _feed_in_chunks(text, chunk_size)
+    assert seen == EVENTS
+    assert parser.finished
+    assert parser.objects_parsed == 3
+
+
+def test_parser_yields_objects_before_array_is_complete():
+    parser = IncrementalJSONArrayParser()
+    text = json.dumps(EVENTS)
+    first_end = len("[") + len(json.dumps(EVENTS[0]))
+    assert parser.feed(text[:first_end - 1]) == []
+    assert parser.feed(text[first_end - 1:first_end]) == [EVENTS[0]]
+    assert not parser.finished
+
+
+def test_truncated_stream_keeps_completed_objects():
+    text = json.dumps(EVENTS)
+    cut = text.index("Back")
+    parser, seen = _feed_in_chunks(text[:cut], 5)
+    assert seen == EVENTS[:2]
+    assert not parser.finished
+
+
+def test_parser_ignores_text_after_array():
+    parser = IncrementalJSONArrayParser()
+    assert parser.feed('[{"a": 1}] trailing {"b": 2}') == [{"a": 1}]
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_parser_handles_empty_array():
+    parser = IncrementalJSONArrayParser()
+    assert parser.feed("[]") == []
+    assert parser.finished
@@ -0,0 +1,123 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.models.calendar_data import ParsedEvent
+from src.multi_week import (
+    cropped_screenshot_path,
+    extract_events_over_horizon,
+    merge_week_events,
+    week_screenshot_path,
+)
+from src.utils.metrics import metrics
+
+
+def _event(start, title):
+    return ParsedEvent(start_datetime=start, end_datetime=start[:-5] + "59:00", title=title)
+
+
+def extract_from_path(path):
+    # Module-level so it can be pickled into worker processes
+    week = os.path.basename(path).split("_")[-2]
+    return [_event(f"2025-10-2{len(week)}T10:00:00", f"Meeting {week}")]
+
+
+def extract_and_count(path):
+    metrics.incr("test.weeks_extracted")
+    metrics.observe("test.extract_seconds", 0.5)
+    return extract_from_path(path)
+
+
+class FakeOutlook:
+    def __init__(self, fail_capture_at=None):
+        self.actions = []
+        self.fail_capture_at = fail_capture_at
+
+    def capture(self, path):
+        self.actions.append(("capture", path))
+        return path != self.fail_capture_at
+
+    def advance(self):
+        self.actions.append(("advance",))
+        return True
+
+    def rewind(self):
+        self.actions.append(("rewind",))
+        return True
+
+
+def test_week_screenshot_paths():
+    assert week_screenshot_path("shot.png", 0) == "shot.png"
+    assert week_screenshot_path("shot.png", 2) == "shot_w2.png"
+    assert cropped_screenshot_path("shot_w2.png") == "shot_w2_cropped.png"
+
+
+def test_merge_week_events_dedupes_and_sorts():
+    a = _event("2025-10-28T10:00:00", "A")
+    b = _event("2025-10-27T09:00:00", "B")
+    merged = merge_week_events([[a, b], [ParsedEvent(a.start_datetime, a.end_datetime, "A")]])
+    assert [e.title for e in merged] == ["B", "A"]
+
+
+def test_single_week_runs_inline():
+    outlook = FakeOutlook()
+    events = extract_events_over_horizon(
+        1, outlook.capture, outlook.advance, lambda path: [_event("2025-10-27T10:00:00", path)],
+        screenshot_path="shot.png", rewind_week=outlook.rewind,
+    )
+    assert outlook.actions == [("capture", "shot.png")]
+    assert events[0].title == "shot_cropped.png"
+
+
+def test_horizon_captures_serially_and_restores_view():
+    outlook = FakeOutlook()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        events = extract_events_over_horizon(
+            3, outlook.capture, outlook.advance, extract_from_path,
+            screenshot_path="shot.png", rewind_week=outlook.rewind, executor=executor,
+        )
+    assert outlook.actions == [
+        ("capture", "shot.png"),
+        ("advance",), ("capture", "shot_w1.png"),
+        ("advance",), ("capture", "shot_w2.png"),
+        ("rewind",), ("rewind",),
+    ]
+    assert len(events) == 3
+
+
+def test_horizon_with_process_pool():
+    outlook = FakeOutlook()
+    events = extract_events_over_horizon(
+        2, outlook.capture, outlook.advance, extract_from_path,
+        screenshot_path="shot.png", max_workers=2,
+    )
+    assert sorted(e.title for e in events) == ["Meeting shot", "Meeting w1"]
+
+
+def test_worker_metrics_are_merged_into_the_parent():
+    metrics.reset()
+    outlook = FakeOutlook()
+    extract_events_over_horizon(
+        3, outlook.capture, outlook.advance, extract_and_count,
+        screenshot_path="shot.png", max_workers=2,
+    )
+    assert metrics.count("test.weeks_extracted") == 3
+    assert metrics.total("test.extract_seconds") == 1.5
+
+
+def test_horizon_capture_failure_raises_and_rewinds():
+    outlook = FakeOutlook(fail_capture_at="shot_w1.png")
+    with pytest.raises(RuntimeError, match="week 2"):
+        extract_events_over_horizon(
+            3, outlook.capture, outlook.advance, extract_from_path,
+            screenshot_path="shot.png", rewind_week=outlook.rewind,
+            executor=ThreadPoolExecutor(max_workers=1),
+        )
+    assert outlook.actions[-1] == ("rewind",)
+
+
+def test_horizon_rejects_zero_weeks():
+    with pytest.raises(ValueError):
+        extract_events_over_horizon(0, None, None, None)
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from PIL import Image
+from src.readiness import (
+    FrameStabilityProbe,
+    frame_difference,
+    wait_for_calendar_ready,
+    wait_for_stable_frame,
+    wait_until,
+)
+
+
+class FakeClock:
+    """Clock whose time only advances when sleep() is called"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _frame(shade):
+    return Image.new('L', (16, 8), color=shade)
+
+
+def _frames(*shades):
+    frames = iter([_frame(s) for s in shades])
+    return lambda: next(frames)
+
+
+def test_wait_until_returns_immediately_when_ready():
+    clock = FakeClock()
+    assert wait_until(lambda: True, timeout=5, clock=clock, sleep=clock.sleep)
+    assert clock.sleeps == []
+
+
+def test_wait_until_polls_until_probe_passes():
+    clock = FakeClock()
+    answers = iter([False, False, True])
+    assert wait_until(lambda: next(answers), timeout=5, interval=0.25, clock=clock, sleep=clock.sleep)
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_wait_until_times_out():
+    clock = FakeClock()
+    assert not wait_until(lambda: False, timeout=1, interval=0.3, clock=clock, sleep=clock.sleep)
+    assert clock.now == 1.0
+
+
+def test_wait_until_treats_probe_errors_as_not_ready():
+    clock = FakeClock()
+    calls = iter([RuntimeError("osascript failed"), True])
+
+    def probe():
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert wait_until(probe, timeout=1, interval=0.1, clock=clock, sleep=clock.sleep)
+
+
+def test_frame_difference():
+    assert frame_difference(_frame(10), _frame(10)) == 0
+    assert frame_difference(_frame(10), _frame(30)) == 20
+    assert frame_difference(_frame(10), Image.new('L', (4, 4))) == 255
+
+
+def test_frame_stability_probe_needs_two_matching_frames():
+    probe = FrameStabilityProbe(_frames(0, 200, 100, 100))
+    assert [probe(), probe(), probe(), probe()] == [False, False, False, True]
+
+
+def test_wait_for_stable_frame_while_screen_is_redrawing():
+    clock = FakeClock()
+    assert wait_for_stable_frame(_frames(0, 50, 120, 120), interval=0.1, clock=clock, sleep=clock.sleep)
+    assert len(clock.sleeps) == 3
+
+
+def test_wait_for_calendar_ready_already_ready():
+    clock = FakeClock()
+    ready = wait_for_calendar_ready(
+        lambda: True, _frames(7, 7), lambda: True, clock=clock, sleep=clock.sleep
+    )
+    assert ready
+    assert sum(clock.sleeps) < 0.5
+
+
+def test_wait_for_calendar_ready_shares_deadline():
+    clock = FakeClock()
+    frontmost = iter([False] * 5 + [True])
+    ready = wait_for_calendar_ready(
+        lambda: next(frontmost), _frames(*range(0, 255, 5)), lambda: True,
+        timeout=2, interval=0.2, clock=clock, sleep=clock.sleep,
+    )
+    assert not ready
+    assert clock.now <= 2.0 + 1e-9
+
+
+def test_wait_for_calendar_ready_when_title_never_matches():
+    clock = FakeClock()
+    ready = wait_for_calendar_ready(
+        lambda: True, _frames(*[7] * 20), lambda: False,
+        timeout=10, interval=0.2, anchor_timeout=1.0, clock=clock, sleep=clock.sleep,
+    )
+    assert ready
+    assert clock.now < 1.5
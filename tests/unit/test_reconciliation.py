@@ -0,0 +1,175 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from datetime import datetime, timezone
+
+from src.interfaces.calendar_repository import ICalendarRepository
+from src.interfaces.event_extractor import IncompleteExtractionError
+from src.models.calendar_data import ParsedEvent
+from src.caldav_write_pool import CalDAVWritePool
+from src.caldav_client import map_parsed_event_to_ical
+from src.event_identity import parsed_event_key
+from src.retry_policy import RetryPolicy, TransientError, call_with_retry
+from src.services.reconciliation import ReconciliationService, build_plan
+from src.utils.metrics import metrics
+from tests.caldav_stub import make_ics
+
+NOW = datetime(2025, 10, 27, 0, 0, tzinfo=timezone.utc)
+
+
+class MemoryRepository(ICalendarRepository):
+    def __init__(self, events=None):
+        self.events = dict(events or {})
+        self.calls = []
+
+    def get_events(self):
+        return dict(self.events)
+
+    def put_event(self, uid, ical_data):
+        self.calls.append(("put", uid))
+        self.events[f"/cal/{uid}.ics"] = ical_data
+        return True
+
+    def delete_event(self, event_id):
+        self.calls.append(("delete", event_id))
+        return self.events.pop(event_id, None) is not None
+
+
+def _parsed(title, start="2025-10-27T09:00:00", end="2025-10-27T10:00:00", **kwargs):
+    return ParsedEvent(start, end, title, **kwargs)
+
+
+def _remote(uid, title, start="20251027T130000Z", end="20251027T140000Z", location=None):
+    ics = make_ics(uid, start, end, title)
+    if location:
+        ics = ics.replace("END:VEVENT", f"LOCATION:{location}\r\nEND:VEVENT")
+    return ics
+
+
+def test_key_normalizes_title_and_converts_to_utc():
+    assert parsed_event_key(_parsed("  Team   SYNC ")) == ("team sync", "2025-10-27T13:00", "2025-10-27T14:00")
+
+
+def test_repeated_hour_key_matches_the_uploaded_event():
+    # 01:00 happens twice when DST ends; both sides must pick the same one
+    event = _parsed("Late call", "2025-11-02T00:00:00", "2025-11-02T01:00:00")
+    ical_data, uid = map_parsed_event_to_ical(event)
+    plan = build_plan([event], {f"/cal/{uid}.ics": ical_data})
+    assert plan.summary() == "0 to create, 0 to update, 0 to delete, 1 unchanged"
+
+
+def test_plan_matches_existing_events_by_identity():
+    existing = {
+        "/cal/a.ics": _remote("a", "Team sync"),
+        "/cal/b.ics": _remote("b", "Cancelled", "20251027T150000Z", "20251027T160000Z"),
+        "/cal/c.ics": _remote("c", "Lunch", "20251027T160000Z", "20251027T170000Z", location="Cafe"),
+    }
+    parsed = [
+        _parsed("team sync"),
+        _parsed("Lunch", "2025-10-27T12:00:00", "2025-10-27T13:00:00", location="Canteen"),
+        _parsed("New meeting", "2025-10-28T09:00:00", "2025-10-28T10:00:00"),
+    ]
+    plan = build_plan(parsed, existing)
+    assert [e.title for e in plan.creates] == ["New meeting"]
+    assert [(r.href, e.location) for r, e in plan.updates] == [("/cal/c.ics", "Canteen")]
+    assert [r.href for r in plan.deletes] == ["/cal/b.ics"]
+    assert [r.href for r in plan.unchanged] == ["/cal/a.ics"]
+    assert plan.summary() == "1 to create, 1 to update, 1 to delete, 1 unchanged"
+
+
+def test_duplicates_are_collapsed():
+    existing = {"/cal/a.ics": _remote("a", "Standup"), "/cal/a2.ics": _remote("a2", "Standup")}
+    plan = build_plan([_parsed("Standup"), _parsed("Standup")], existing)
+    assert plan.creates == [] and len(plan.unchanged) == 1
+    assert [r.href for r in plan.deletes] == ["/cal/a2.ics"]
+
+
+def test_unchanged_calendar_is_not_written():
+    repo = MemoryRepository({"/cal/a.ics": _remote("a", "Standup")})
+    result = ReconciliationService(repo).reconcile([_parsed("Standup")], now=NOW)
+    assert repo.calls == []
+    assert result.success and result.summary() == "0 created, 0 updated, 0 deleted"
+
+
+def test_unchanged_calendar_with_a_past_event_is_not_written():
+    # The listing only has events that have not ended; the capture still shows the earlier ones
+    repo = MemoryRepository({"/cal/a.ics": _remote("a", "Standup")})
+    parsed = [_parsed("Yesterday's review", "2025-10-24T09:00:00", "2025-10-24T10:00:00"), _parsed("Standup")]
+
+    result = ReconciliationService(repo).reconcile(parsed, now=NOW)
+
+    assert repo.calls == []
+    assert result.plan.summary() == "0 to create, 0 to update, 0 to delete, 1 unchanged"
+
+
+def test_reconcile_applies_only_the_difference():
+    repo = MemoryRepository({
+        "/cal/a.ics": _remote("a", "Standup", location="Room 1"),
+        "/cal/b.ics": _remote("b", "Gone", "20251027T150000Z", "20251027T160000Z"),
+        "/cal/old.ics": _remote("old", "Past", "20251020T130000Z", "20251020T140000Z"),
+    })
+    result = ReconciliationService(repo).reconcile(
+        [_parsed("Standup", location="Room 2"), _parsed("Fresh", "2025-10-28T09:00:00", "2025-10-28T10:00:00")],
+        now=NOW,
+    )
+    assert result.summary() == "1 created, 1 updated, 1 deleted"
+    assert ("put", "a") in repo.calls  # updated in place under the same UID
+    assert ("delete", "/cal/b.ics") in repo.calls
+    assert "/cal/old.ics" in repo.events  # past events are never touched
+    assert "LOCATION:Room 2" in repo.events["/cal/a.ics"]
+
+
+def test_dry_run_logs_plan_without_writing(caplog):
+    repo = MemoryRepository({"/cal/b.ics": _remote("b", "Gone")})
+    with caplog.at_level("INFO", logger="src.services.reconciliation"):
+        result = ReconciliationService(repo).reconcile([_parsed("New")], dry_run=True, now=NOW)
+    assert repo.calls == []
+    assert result.plan.summary() == "1 to create, 0 to update, 1 to delete, 0 unchanged"
+    assert "[DRY RUN]   - delete /cal/b.ics" in caplog.text
+
+
+def test_reconcile_with_write_pool_tallies_all_writes():
+    repo = MemoryRepository({f"/cal/old{i}.ics": _remote(f"old{i}", f"Old {i}") for i in range(5)})
+    parsed = [_parsed(f"New {i}", f"2025-10-28T{9 + i:02d}:00:00", f"2025-10-28T{9 + i:02d}:30:00") for i in range(5)]
+    with CalDAVWritePool(max_concurrency=3) as pool:
+        result = ReconciliationService(repo, write_pool=pool).reconcile(parsed, now=NOW)
+    assert result.success and result.summary() == "5 created, 0 updated, 5 deleted"
+    assert len(repo.events) == 5
+
+
+def test_write_pool_sees_throttling_on_the_first_attempt():
+    class ThrottlingRepository(MemoryRepository):
+        def put_event(self, uid, ical_data):
+            if not self.calls:
+                self.calls.append(("throttled", uid))
+                raise TransientError("PUT returned HTTP 503", status=503)
+            return super().put_event(uid, ical_data)
+
+    metrics.reset()
+    repo = ThrottlingRepository()
+    policy = RetryPolicy("test_write", max_attempts=2, base_delay=0.0)
+    with CalDAVWritePool(max_concurrency=4, initial_concurrency=2) as pool:
+        slots_held_during_backoff = []
+        call = lambda fn: call_with_retry(fn, policy, sleep=lambda s: slots_held_during_backoff.append(pool.limit._in_flight))
+        result = ReconciliationService(repo, call=call, write_pool=pool).reconcile([_parsed("New")], now=NOW)
+
+    assert result.created == 1
+    assert metrics.count("caldav.writes_throttled") == 1
+    assert slots_held_during_backoff == [0]
+
+
+def test_incomplete_extraction_deletes_nothing():
+    repo = MemoryRepository({f"/cal/e{i}.ics": _remote(f"e{i}", f"Meeting {i}", f"20251027T{13 + i}0000Z",
+                                                       f"20251027T{13 + i}3000Z") for i in range(5)})
+
+    def truncated():
+        yield _parsed("Meeting 0", "2025-10-27T09:00:00", "2025-10-27T09:30:00")
+        raise IncompleteExtractionError("stream cut after 1 event")
+
+    result = ReconciliationService(repo).reconcile(truncated(), now=NOW)
+
+    assert repo.calls == [] and len(repo.events) == 5
+    assert result.incomplete and not result.success
+    assert result.summary() == "0 created, 0 updated, 0 deleted (extraction incomplete, deletes skipped)"
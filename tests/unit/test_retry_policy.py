@@ -0,0 +1,144 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import random
+
+import pytest
+from src.retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy, TransientError, call_with_retry
+from src.utils.metrics import metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _flaky(failures, error=TransientError("busy", status=503)):
+    calls = {"count": 0}
+
+    def func():
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise error
+        return "ok"
+    return func, calls
+
+
+def setup_function():
+    metrics.reset()
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    policy = RetryPolicy("op", base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=False)
+    assert [policy.backoff(i) for i in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_jitter_stays_under_the_ceiling():
+    policy = RetryPolicy("op", base_delay=1.0, max_delay=8.0)
+    rng = random.Random(7)
+    waits = [policy.backoff(3, rng) for _ in range(50)]
+    assert all(0 <= wait <= 8.0 for wait in waits)
+    assert len(set(waits)) > 1
+
+
+def test_transient_failures_are_retried_and_counted():
+    clock = FakeClock()
+    func, calls = _flaky(2)
+    policy = RetryPolicy("caldav_write", max_attempts=3, jitter=False)
+
+    assert call_with_retry(func, policy, sleep=clock.sleep, clock=clock) == "ok"
+    assert calls["count"] == 3
+    assert metrics.count("retry.caldav_write.retries") == 2
+    assert metrics.total("retry.caldav_write.wait_seconds") == clock.now == 3.0
+
+
+def test_deterministic_failures_are_not_retried():
+    func, calls = _flaky(1, ValueError("bad request"))
+    with pytest.raises(ValueError):
+        call_with_retry(func, RetryPolicy("op"), sleep=lambda seconds: None)
+    assert calls["count"] == 1
+
+
+def test_last_error_is_raised_when_attempts_run_out():
+    func, calls = _flaky(5)
+    with pytest.raises(TransientError):
+        call_with_retry(func, RetryPolicy("op", max_attempts=3), sleep=lambda seconds: None)
+    assert calls["count"] == 3
+    assert metrics.count("retry.op.gave_up") == 1
+
+
+def test_false_results_can_be_retried():
+    results = iter([False, False, True])
+    policy = RetryPolicy("launch", retry_on_result=lambda ok: not ok, jitter=False)
+    assert call_with_retry(lambda: next(results), policy, sleep=lambda seconds: None) is True
+
+
+def test_time_budget_stops_retrying():
+    clock = FakeClock()
+    func, calls = _flaky(10)
+    policy = RetryPolicy("op", max_attempts=10, base_delay=4.0, jitter=False, budget_seconds=10.0)
+    with pytest.raises(TransientError):
+        call_with_retry(func, policy, sleep=clock.sleep, clock=clock)
+    # Waits of 4s then 8s would end past the 10s budget
+    assert calls["count"] == 2 and clock.now == 4.0
+
+
+def test_retry_after_is_honoured():
+    clock = FakeClock()
+    func, _ = _flaky(1, TransientError("throttled", status=429, retry_after=7.0))
+    call_with_retry(func, RetryPolicy("op", base_delay=1.0, jitter=False), sleep=clock.sleep, clock=clock)
+    assert clock.now == 7.0
+
+
+def test_breaker_opens_after_repeated_failures_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker("caldav", failure_threshold=3, reset_timeout=30.0, clock=clock)
+    policy = RetryPolicy("op", max_attempts=2)
+    func, calls = _flaky(100)
+
+    with pytest.raises(TransientError):
+        call_with_retry(func, policy, breaker, sleep=lambda seconds: None)
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(func, policy, breaker, sleep=lambda seconds: None)
+
+    assert calls["count"] == 3
+    assert breaker.state == CircuitBreaker.OPEN
+    assert metrics.count("circuit.caldav.opened") == 1
+
+
+def test_non_retryable_errors_leave_the_breaker_alone():
+    clock = FakeClock()
+    breaker = CircuitBreaker("caldav", failure_threshold=2, reset_timeout=30.0, clock=clock)
+    policy = RetryPolicy("op", max_attempts=1)
+    breaker.record_failure()
+
+    with pytest.raises(ValueError):
+        call_with_retry(lambda: int("not a number"), policy, breaker)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_probe_closes_the_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("caldav", failure_threshold=1, reset_timeout=30.0, clock=clock)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 31.0
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # others wait for the probe's answer
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
@@ -0,0 +1,114 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from PIL import Image, ImageDraw
+from src.interfaces.frame_source import SequenceFrameSource
+from src.utils.image_hash import band_hashes, changed_bands, dhash
+from src.watcher import CalendarChangeWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def calendar_frame(event_rows=()):
+    """Synthetic 64x64 'calendar' with a dark bar for each event row"""
+    img = Image.new('L', (64, 64), color=255)
+    draw = ImageDraw.Draw(img)
+    for row in event_rows:
+        draw.rectangle((4, row * 8 + 1, 60, row * 8 + 6), fill=0)
+    return img
+
+
+def make_watcher(frames, **kwargs):
+    clock = FakeClock()
+    syncs = []
+    result = kwargs.pop("result", True)
+
+    def on_change():
+        syncs.append(clock.now)
+        return result
+
+    watcher = CalendarChangeWatcher(
+        SequenceFrameSource(frames), on_change,
+        poll_interval=1, settle_seconds=3, min_sync_interval=10,
+        clock=clock, sleep=clock.sleep, **kwargs
+    )
+    return watcher, syncs
+
+
+def test_band_hashes_locate_change():
+    before = band_hashes(calendar_frame([1]))
+    after = band_hashes(calendar_frame([1, 5]))
+    assert changed_bands(before, after) == [5]
+    assert changed_bands(before, band_hashes(calendar_frame([1]))) == []
+
+
+def test_band_hashes_ignore_small_noise():
+    noisy = calendar_frame([1]).point(lambda v: max(v - 3, 0))
+    assert band_hashes(calendar_frame([1])) == band_hashes(noisy)
+
+
+def test_dhash_stable_for_identical_content():
+    assert dhash(calendar_frame([2])) == dhash(calendar_frame([2]).copy())
+    assert dhash(calendar_frame([2])) != dhash(calendar_frame([6]))
+
+
+def test_sequence_frame_source_repeats_last_frame():
+    a, b = calendar_frame([1]), calendar_frame([2])
+    source = SequenceFrameSource([a, b])
+    assert [source.grab_frame() for _ in range(3)] == [a, b, b]
+    with pytest.raises(RuntimeError):
+        SequenceFrameSource([]).grab_frame()
+
+
+def test_no_sync_without_change():
+    watcher, syncs = make_watcher([calendar_frame([1])], sync_on_start=False)
+    watcher.run(max_polls=30)
+    assert syncs == []
+
+
+def test_sync_on_start_then_idle():
+    watcher, syncs = make_watcher([calendar_frame([1])])
+    watcher.run(max_polls=30)
+    assert syncs == [0]
+
+
+def test_change_is_debounced_until_settled():
+    frames = [calendar_frame([1])] * 2 + [calendar_frame([1, 2]), calendar_frame([1, 2, 3])]
+    frames += [calendar_frame([1, 2, 3])] * 10
+    watcher, syncs = make_watcher(frames, sync_on_start=False)
+    watcher.run(max_polls=14)
+    # Last change seen at t=3, sync once it has been quiet for 3s
+    assert syncs == [6]
+
+
+def test_min_interval_between_syncs():
+    frames = [calendar_frame([1]), calendar_frame([2])] + [calendar_frame([2])] * 20
+    watcher, syncs = make_watcher(frames)
+    watcher.run(max_polls=22)
+    # Start-up sync at t=0; next change settles at t=4 but waits for the 10s spacing
+    assert syncs == [0, 10]
+
+
+def test_transient_change_reverting_does_not_sync():
+    frames = [calendar_frame([1]), calendar_frame([1, 4]), calendar_frame([1])]
+    frames += [calendar_frame([1])] * 10
+    watcher, syncs = make_watcher(frames)
+    watcher.run(max_polls=13)
+    assert syncs == [0]
+
+
+def test_failed_sync_is_retried():
+    watcher, syncs = make_watcher([calendar_frame([1])], result=False)
+    watcher.run(max_polls=25)
+    assert syncs == [0, 10, 20]